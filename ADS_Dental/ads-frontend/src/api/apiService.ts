@@ -1,4 +1,4 @@
-import type { Patient, Dentist, Surgery, Appointment, Address } from '../types';
+import type { Patient, Dentist, Surgery, Appointment, Address, Page } from '../types';
 
 const API_URL = import.meta.env.LIVE_API_URL;
 
@@ -13,6 +13,23 @@ class ApiService {
     return headers;
   }
 
+  // List endpoints are cursor-paginated; follow next_cursor until exhausted.
+  private async getAllPages<T>(url: string, token: string, errorMessage: string): Promise<T[]> {
+    const items: T[] = [];
+    let cursor: string | null = null;
+    do {
+      const pageUrl: string = cursor ? `${url}?after=${encodeURIComponent(cursor)}` : url;
+      const response = await fetch(pageUrl, {
+        headers: this.getHeaders(token),
+      });
+      if (!response.ok) throw new Error(errorMessage);
+      const page: Page<T> = await response.json();
+      items.push(...page.items);
+      cursor = page.next_cursor;
+    } while (cursor);
+    return items;
+  }
+
 async login(email: string, password: string) {
   const response = await fetch(`${API_URL}/api/v1/login`, {
     method: 'POST',
@@ -37,11 +54,7 @@ async login(email: string, password: string) {
 
   // Patients
   async getPatients(token: string): Promise<Patient[]> {
-    const response = await fetch(`${API_URL}/patients`, {
-      headers: this.getHeaders(token),
-    });
-    if (!response.ok) throw new Error('Failed to fetch patients');
-    return response.json();
+    return this.getAllPages<Patient>(`${API_URL}/patients`, token, 'Failed to fetch patients');
   }
 
   async createPatient(token: string, data: Patient): Promise<Patient> {
@@ -83,20 +96,12 @@ async login(email: string, password: string) {
 
   // Surgeries
   async getSurgeries(token: string): Promise<Surgery[]> {
-    const response = await fetch(`${API_URL}/surgeries`, {
-      headers: this.getHeaders(token),
-    });
-    if (!response.ok) throw new Error('Failed to fetch surgeries');
-    return response.json();
+    return this.getAllPages<Surgery>(`${API_URL}/surgeries`, token, 'Failed to fetch surgeries');
   }
 
   // Appointments
   async getAppointments(token: string): Promise<Appointment[]> {
-    const response = await fetch(`${API_URL}/adsweb/api/v1/appointments`, {
-      headers: this.getHeaders(token),
-    });
-    if (!response.ok) throw new Error('Failed to fetch appointments');
-    return response.json();
+    return this.getAllPages<Appointment>(`${API_URL}/adsweb/api/v1/appointments`, token, 'Failed to fetch appointments');
   }
 
   async createAppointment(token: string, data: Appointment): Promise<Appointment> {
@@ -129,11 +134,7 @@ async login(email: string, password: string) {
 
   // Addresses
   async getAddresses(token: string): Promise<Address[]> {
-    const response = await fetch(`${API_URL}/addresses`, {
-      headers: this.getHeaders(token),
-    });
-    if (!response.ok) throw new Error('Failed to fetch addresses');
-    return response.json();
+    return this.getAllPages<Address>(`${API_URL}/addresses`, token, 'Failed to fetch addresses');
   }
 }
 
@@ -47,6 +47,11 @@ export interface Appointment {
   surgery_id?: number;
 }
 
+export interface Page<T> {
+  items: T[];
+  next_cursor: string | null;
+}
+
 export interface User {
   id?: number;
   username: string;
@@ -0,0 +1,28 @@
+# app/api/conditional.py
+# Conditional GET helpers: compare a precomputed ETag with If-None-Match and
+# answer 304 without building (or serializing) the response body.
+from typing import Optional
+
+from fastapi import Request, Response, status
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    header: Optional[str] = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # Weak comparison, as RFC 9110 requires for If-None-Match
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return etag.removeprefix("W/") in candidates
+
+
+def not_modified(etag: str, cache_control: str) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag, "Cache-Control": cache_control})
+
+
+def cached_json(request: Request, etag: str, body: bytes, cache_control: str) -> Response:
+    """A pre-serialized JSON body with its validators, or 304 when the client has it."""
+    if etag_matches(request, etag):
+        return not_modified(etag, cache_control)
+    return Response(content=body, media_type="application/json", headers={"ETag": etag, "Cache-Control": cache_control})
@@ -1,27 +1,34 @@
 from fastapi import Depends, HTTPException, status
-from jose import jwt, JWTError
 from typing import List
-from app.core.config import SECRET_KEY, ALGORITHM
-from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from app.core.principal import Principal
+from app.core.security import get_claims, get_current_user
+
+
+def _check_role(claims: dict, roles: List[str]):
+    user_role = claims.get("role")
+    if not user_role or user_role not in roles:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You do not have permission to access this resource."
+        )
 
-# Create the HTTP Bearer security scheme
-security = HTTPBearer()
 
 def require_role(roles: List[str]):
-    async def role_checker(credentials: HTTPAuthorizationCredentials = Depends(security)):
-        token = credentials.credentials
-        try:
-            payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-            user_role = payload.get("role")
-            if not user_role or user_role not in roles:
-                raise HTTPException(
-                    status_code=status.HTTP_403_FORBIDDEN,
-                    detail="You do not have permission to access this resource."
-                )
-        except JWTError:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Could not validate credentials."
-            )
-        return payload  # You can return the decoded payload if needed
-    return role_checker
\ No newline at end of file
+    async def role_checker(claims: dict = Depends(get_claims)):
+        _check_role(claims, roles)
+        return claims  # You can return the decoded payload if needed
+    return role_checker
+
+
+def require_user(roles: List[str]):
+    """
+    Role check and principal lookup in one dependency. The token is decoded
+    once (via get_claims) and the handler receives the cached Principal.
+    """
+    async def user_checker(
+        claims: dict = Depends(get_claims),
+        current_user: Principal = Depends(get_current_user),
+    ) -> Principal:
+        _check_role(claims, roles)
+        return current_user
+    return user_checker
@@ -1,31 +1,104 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.future import select
-from app.db.session import get_database
-from app.schemas.appointment_dto import AppointmentCreateDTO, AppointmentDTO
-from app.services.appointment_service import create_appointment_service, list_appointments_service
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from app.db.session import get_database, get_session_factory
+from app.api.streaming import accepts, wants_ndjson, ndjson_response
+from app.api.serialization import json_response, page_response, sparse_response
+from app.db.fieldsets import parse_fieldset
+from app.api.dependencies.rbac import require_role
+from app.schemas.appointment_dto import (
+    AppointmentCompoundPageDTO, AppointmentCreateDTO, AppointmentDTO, BulkAppointmentResponseDTO,
+)
+from app.schemas.common import Page
+from app.db.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.services.appointment_service import (
+    bulk_create_appointments_service,
+    create_appointment_service,
+    get_visible_appointment_service,
+    list_appointment_history_service,
+    list_appointments_compound_service,
+    list_appointments_service,
+    stream_appointments_service,
+)
 from app.core.security import require_patient, get_current_user
-from app.db.models import Patient, Appointment, Dentist
 
 router = APIRouter(prefix="/adsweb/api/v1/appointments", tags=["Appointments"])
 
+# Sparse fieldsets (app/db/fieldsets.py); either one switches the response to the pruned shape
+FIELDS_QUERY = Query(None, description="Attributes to return, dotted for related objects: id,appointment_date,patient.last_name")
+INCLUDE_QUERY = Query(None, description="Related objects to embed whole: patient,dentist,surgery,surgery.dentists,...")
+
+# Opt-in compound document for the lists: appointments carry patient/dentist/surgery
+# ids and every related entity is sent once, in "included"
+COMPOUND_MEDIA_TYPE = "application/vnd.ads.compound+json"
+
+async def _compound_page(db: AsyncSession, current_user, limit, after, fieldset, archived: bool):
+    if fieldset is not None:
+        raise HTTPException(status_code=400, detail="fields and include cannot be combined with the compound format")
+    page = await list_appointments_compound_service(db, current_user, limit, after, archived)
+    return json_response(AppointmentCompoundPageDTO, page, media_type=COMPOUND_MEDIA_TYPE)
+
 @router.post("/", response_model=AppointmentDTO)
 async def create_appointment(
     payload: AppointmentCreateDTO,
     current_user = Depends(require_patient),
     db: AsyncSession = Depends(get_database)
 ):
-    result = await db.execute(select(Patient).where(Patient.user_id == int(current_user.id)))
-    patient = result.scalar_one_or_none()
-    if not patient:
+    if current_user.patient_id is None:
         raise HTTPException(status_code=404, detail="Patient profile not found")
 
-    return await create_appointment_service(db, payload, patient.id)
+    return await create_appointment_service(db, payload, current_user.patient_id)
 
-@router.get("/", response_model=List[AppointmentDTO])
+@router.post("/bulk", response_model=BulkAppointmentResponseDTO, dependencies=[Depends(require_role(["ADMIN"]))])
+async def bulk_create_appointments(
+    payload: List[AppointmentCreateDTO],
+    db: AsyncSession = Depends(get_database)
+):
+    return await bulk_create_appointments_service(db, payload)
+
+@router.get("/", response_model=Page[AppointmentDTO])
 async def list_appointments(
+    request: Request,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    fields: Optional[str] = FIELDS_QUERY,
+    include: Optional[str] = INCLUDE_QUERY,
     current_user = Depends(get_current_user),
-    db: AsyncSession = Depends(get_database)
+    db: AsyncSession = Depends(get_database),
+    session_factory: async_sessionmaker = Depends(get_session_factory),
+):
+    if wants_ndjson(request):
+        return ndjson_response(session_factory, stream_appointments_service(current_user))
+    fieldset = parse_fieldset(fields, include)
+    if accepts(request, COMPOUND_MEDIA_TYPE):
+        return await _compound_page(db, current_user, limit, after, fieldset, archived=False)
+    page = await list_appointments_service(db, current_user, limit, after, fieldset)
+    return page_response(AppointmentDTO, page) if fieldset is None else sparse_response(page)
+
+@router.get("/history", response_model=Page[AppointmentDTO])
+async def list_appointment_history(
+    request: Request,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    fields: Optional[str] = FIELDS_QUERY,
+    include: Optional[str] = INCLUDE_QUERY,
+    current_user = Depends(get_current_user),
+    db: AsyncSession = Depends(get_database),
+):
+    fieldset = parse_fieldset(fields, include)
+    if accepts(request, COMPOUND_MEDIA_TYPE):
+        return await _compound_page(db, current_user, limit, after, fieldset, archived=True)
+    page = await list_appointment_history_service(db, current_user, limit, after, fieldset)
+    return page_response(AppointmentDTO, page) if fieldset is None else sparse_response(page)
+
+@router.get("/{appointment_id}", response_model=AppointmentDTO)
+async def get_appointment(
+    appointment_id: int,
+    fields: Optional[str] = FIELDS_QUERY,
+    include: Optional[str] = INCLUDE_QUERY,
+    current_user = Depends(get_current_user),
+    db: AsyncSession = Depends(get_database),
 ):
-    return await list_appointments_service(db, current_user)
\ No newline at end of file
+    fieldset = parse_fieldset(fields, include)
+    appointment = await get_visible_appointment_service(db, current_user, appointment_id, fieldset)
+    return json_response(AppointmentDTO, appointment) if fieldset is None else sparse_response(appointment)
@@ -1,11 +1,15 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.db.session import get_database
-from app.schemas.auth_dto import LoginDTO, TokenDTO
-from app.services.auth_service import login_service
+from app.schemas.auth_dto import InviteAcceptDTO, LoginDTO, TokenDTO
+from app.services.auth_service import accept_invite_service, login_service
 
 router = APIRouter(prefix="/api/v1", tags=["Auth"])
 
 @router.post("/login")
 async def login(payload: LoginDTO, db: AsyncSession = Depends(get_database)):
     return await login_service(db, str(payload.email), payload.password)
+
+@router.post("/invites/accept", status_code=status.HTTP_204_NO_CONTENT)
+async def accept_invite(payload: InviteAcceptDTO, db: AsyncSession = Depends(get_database)):
+    await accept_invite_service(db, payload.token, payload.password)
@@ -1,8 +1,22 @@
-from fastapi import APIRouter, Depends, status
+from datetime import date
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.api.conditional import etag_matches, not_modified
+from app.api.dependencies.rbac import require_role, require_user
+from app.core.principal import Principal
 from app.db.session import get_database
+from app.schemas.availability_dto import DentistAvailabilityDTO
+from app.schemas.calendar_dto import DentistCalendarDTO
 from app.schemas.dentist_dto import DentistCreateDTO, DentistResponseDTO
 from app.db.models import Dentist
+from app.services.availability_service import dentist_availability_service, resolve_window
+from app.services.calendar_service import (
+    DEFAULT_CALENDAR_DAYS,
+    calendar_etag,
+    dentist_calendar_service,
+    dentist_calendar_version_service,
+)
 from app.services.dentist_service import register_dentist_service
 
 router = APIRouter(prefix="/adsweb/api/v1", tags=["Dentists"])
@@ -10,3 +24,41 @@ router = APIRouter(prefix="/adsweb/api/v1", tags=["Dentists"])
 @router.post("/dentists/register", response_model=DentistResponseDTO, status_code=status.HTTP_201_CREATED)
 async def register_dentist(payload: DentistCreateDTO, db: AsyncSession = Depends(get_database)):
     return await register_dentist_service(db, payload)
+
+@router.get(
+    "/dentists/{dentist_id}/availability",
+    response_model=DentistAvailabilityDTO,
+    dependencies=[Depends(require_role(["PATIENT", "DENTIST", "ADMIN"]))],
+)
+async def dentist_availability(
+    dentist_id: int,
+    start: Optional[date] = Query(None, alias="from"),
+    end: Optional[date] = Query(None, alias="to"),
+    db: AsyncSession = Depends(get_database),
+):
+    return await dentist_availability_service(db, dentist_id, start, end)
+
+# Calendars may be cached by the browser but must be revalidated on every use
+CALENDAR_CACHE_CONTROL = "private, no-cache"
+
+@router.get("/dentists/{dentist_id}/calendar", response_model=DentistCalendarDTO)
+async def dentist_calendar(
+    dentist_id: int,
+    request: Request,
+    response: Response,
+    start: Optional[date] = Query(None, alias="from"),
+    end: Optional[date] = Query(None, alias="to"),
+    current_user: Principal = Depends(require_user(["DENTIST", "ADMIN"])),
+    db: AsyncSession = Depends(get_database),
+):
+    if not current_user.has_role("ADMIN") and current_user.dentist_id != dentist_id:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Dentists can only view their own calendar")
+    start, end = resolve_window(start, end, DEFAULT_CALENDAR_DAYS)
+
+    version = await dentist_calendar_version_service(db, dentist_id)
+    etag = calendar_etag(dentist_id, version, start, end)
+    if etag_matches(request, etag):
+        return not_modified(etag, CALENDAR_CACHE_CONTROL)
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CALENDAR_CACHE_CONTROL
+    return await dentist_calendar_service(db, dentist_id, version, start, end)
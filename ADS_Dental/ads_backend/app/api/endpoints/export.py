@@ -0,0 +1,46 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.api.dependencies.rbac import require_role
+from app.db.session import get_session_factory
+from app.services.export_service import (
+    EXPORT_FORMATS, appointment_export_query, export_chunks, patient_export_query,
+)
+
+router = APIRouter(prefix="/adsweb/api/v1/export", tags=["Export"], dependencies=[Depends(require_role(["ADMIN"]))])
+
+# format -> (media type, file extension)
+MEDIA_TYPES = {
+    "csv": ("text/csv; charset=utf-8", "csv"),
+    "ndjson": ("application/gzip", "ndjson.gz"),
+}
+
+
+def _export(session_factory: async_sessionmaker, stmt, fmt: str, name: str) -> StreamingResponse:
+    if fmt not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"format must be one of {', '.join(EXPORT_FORMATS)}")
+    media_type, extension = MEDIA_TYPES[fmt]
+    return StreamingResponse(
+        export_chunks(session_factory, stmt, fmt)(),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{name}.{extension}"'},
+    )
+
+
+@router.get("/patients")
+async def export_patients(
+    format: str = Query("csv"),
+    session_factory: async_sessionmaker = Depends(get_session_factory),
+):
+    return _export(session_factory, patient_export_query(), format, "patients")
+
+
+@router.get("/appointments")
+async def export_appointments(
+    format: str = Query("csv"),
+    archived: bool = False,
+    session_factory: async_sessionmaker = Depends(get_session_factory),
+):
+    name = "appointments_archive" if archived else "appointments"
+    return _export(session_factory, appointment_export_query(archived), format, name)
@@ -1,17 +1,24 @@
-from fastapi import APIRouter, Depends, status
-from sqlalchemy.ext.asyncio import AsyncSession
-from app.db.session import get_database
-from app.schemas.patient_dto import PatientDTO, PatientCreateDTO
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from app.db.session import get_database, get_session_factory
+from app.api.streaming import NDJSON_MEDIA_TYPE, wants_ndjson, ndjson_response
+from app.api.serialization import json_response, page_response
+from app.schemas.patient_dto import PatientDTO, PatientCreateDTO, PatientImportResponseDTO
 from app.schemas.address_dto import AddressDTO
-from typing import List
+from app.schemas.common import Page
+from app.db.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.core.config import SEARCH_RESULT_LIMIT
+from typing import List, Optional
 from app.services.patient_service import (
     update_patient_service,
     delete_patient_service,
     search_patient_service,
     list_patients_service,
+    stream_patients_service,
     list_addresses_service,
-    register_patient_service, get_patient_by_id_service
+    register_patient_service, cached_patient_service
 )
+from app.services.patient_import_service import import_patients_service
 from app.api.dependencies.rbac import require_role
 
 router = APIRouter(prefix="/adsweb/api/v1", tags=["Patients"])
@@ -20,26 +27,50 @@ router = APIRouter(prefix="/adsweb/api/v1", tags=["Patients"])
 async def register_patient(payload: PatientCreateDTO, db: AsyncSession = Depends(get_database)):
     return await register_patient_service(db, payload)
 
+@router.post("/patients/import", response_model=PatientImportResponseDTO, dependencies=[Depends(require_role(["ADMIN"]))])
+async def import_patients(request: Request, invite: bool = False, db: AsyncSession = Depends(get_database)):
+    # The body is consumed as a stream (CSV with a header row, or NDJSON), never buffered whole
+    media_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    if media_type not in ("text/csv", NDJSON_MEDIA_TYPE):
+        raise HTTPException(status_code=415, detail=f"Send text/csv or {NDJSON_MEDIA_TYPE}")
+    return await import_patients_service(db, request.stream(), media_type == "text/csv", invite)
+
 @router.put("/patient/{patient_id}", response_model=PatientDTO, dependencies=[Depends(require_role(["ADMIN", "PATIENT"]))])
 async def update_patient(patient_id: int, payload: PatientDTO, db: AsyncSession = Depends(get_database)):
-    return await update_patient_service(db, patient_id, payload)
+    return json_response(PatientDTO, await update_patient_service(db, patient_id, payload))
 
 @router.delete("/patient/{patient_id}", status_code=status.HTTP_204_NO_CONTENT, dependencies=[Depends(require_role(["ADMIN"]))])
 async def delete_patient(patient_id: int, db: AsyncSession = Depends(get_database)):
     await delete_patient_service(db, patient_id)
 
 @router.get("/patient/search/{searchString}", response_model=List[PatientDTO], dependencies=[Depends(require_role(["ADMIN", "DENTIST"]))])
-async def search_patient(searchString: str, db: AsyncSession = Depends(get_database)):
-    return await search_patient_service(db, searchString)
+async def search_patient(
+    searchString: str,
+    limit: int = Query(SEARCH_RESULT_LIMIT, ge=1, le=100),
+    db: AsyncSession = Depends(get_database),
+):
+    return json_response(List[PatientDTO], await search_patient_service(db, searchString, limit))
 
-@router.get("/patients", response_model=List[PatientDTO], dependencies=[Depends(require_role(["ADMIN", "DENTIST"]))])
-async def list_patients(db: AsyncSession = Depends(get_database)):
-    return await list_patients_service(db)
+@router.get("/patients", response_model=Page[PatientDTO], dependencies=[Depends(require_role(["ADMIN", "DENTIST"]))])
+async def list_patients(
+    request: Request,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    db: AsyncSession = Depends(get_database),
+    session_factory: async_sessionmaker = Depends(get_session_factory),
+):
+    if wants_ndjson(request):
+        return ndjson_response(session_factory, stream_patients_service)
+    return page_response(PatientDTO, await list_patients_service(db, limit, after))
 
 @router.get("/patient/{patient_id}", response_model=PatientDTO, dependencies=[Depends(require_role(["ADMIN", "DENTIST"]))])
 async def get_patient(patient_id: int, db: AsyncSession = Depends(get_database)):
-    return await get_patient_by_id_service(db, patient_id)
+    return Response(content=await cached_patient_service(db, patient_id), media_type="application/json")
 
-@router.get("/addresses", response_model=List[AddressDTO], dependencies=[Depends(require_role(["ADMIN"]))])
-async def list_addresses(db: AsyncSession = Depends(get_database)):
-    return await list_addresses_service(db)
+@router.get("/addresses", response_model=Page[AddressDTO], dependencies=[Depends(require_role(["ADMIN"]))])
+async def list_addresses(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    db: AsyncSession = Depends(get_database),
+):
+    return await list_addresses_service(db, limit, after)
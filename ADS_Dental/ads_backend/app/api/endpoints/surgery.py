@@ -1,14 +1,53 @@
-from fastapi import APIRouter, Depends
+from datetime import date
+from fastapi import APIRouter, Depends, Query, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.conditional import cached_json
 from app.api.dependencies.rbac import require_role
+from app.core.config import REFERENCE_MAX_AGE_SECONDS
 from app.db.session import get_database
+from app.schemas.availability_dto import SurgeryAvailabilityDTO
+from app.schemas.dentist_dto import DentistResponseDTO
 from app.schemas.surgery_dto import SurgeryDTO
-from app.services.surgery_service import list_surgeries_service
-from typing import List
+from app.schemas.common import Page
+from app.db.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.services.availability_service import surgery_availability_service
+from app.services.surgery_service import cached_surgeries_service, cached_surgery_dentists_service
+from typing import List, Optional
 
 router = APIRouter(prefix="/adsweb/api/v1", tags=["Surgeries"])
 
-@router.get("/surgeries", response_model=List[SurgeryDTO], dependencies=[Depends(require_role(["PATIENT", "ADMIN"]))])
-async def list_surgeries(db : AsyncSession = Depends(get_database)):
-    return await list_surgeries_service(db)
\ No newline at end of file
+# Reference data: reusable for a while, then revalidated with the ETag
+REFERENCE_CACHE_CONTROL = f"private, max-age={REFERENCE_MAX_AGE_SECONDS}"
+
+@router.get("/surgeries", response_model=Page[SurgeryDTO], dependencies=[Depends(require_role(["PATIENT", "ADMIN"]))])
+async def list_surgeries(
+    request: Request,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    db : AsyncSession = Depends(get_database),
+):
+    cached = await cached_surgeries_service(db, limit, after)
+    return cached_json(request, cached.etag, cached.body, REFERENCE_CACHE_CONTROL)
+
+@router.get(
+    "/surgeries/{surgery_id}/dentists",
+    response_model=List[DentistResponseDTO],
+    dependencies=[Depends(require_role(["PATIENT", "DENTIST", "ADMIN"]))],
+)
+async def list_surgery_dentists(surgery_id: int, request: Request, db: AsyncSession = Depends(get_database)):
+    cached = await cached_surgery_dentists_service(db, surgery_id)
+    return cached_json(request, cached.etag, cached.body, REFERENCE_CACHE_CONTROL)
+
+@router.get(
+    "/surgeries/{surgery_id}/availability",
+    response_model=SurgeryAvailabilityDTO,
+    dependencies=[Depends(require_role(["PATIENT", "DENTIST", "ADMIN"]))],
+)
+async def surgery_availability(
+    surgery_id: int,
+    start: Optional[date] = Query(None, alias="from"),
+    end: Optional[date] = Query(None, alias="to"),
+    db: AsyncSession = Depends(get_database),
+):
+    return await surgery_availability_service(db, surgery_id, start, end)
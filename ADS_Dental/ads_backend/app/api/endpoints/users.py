@@ -1,14 +1,22 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from sqlalchemy.future import select
-from app.db.session import get_database
+from app.db.session import get_database, get_session_factory
+from app.api.streaming import wants_ndjson, ndjson_response
+from app.api.serialization import page_response
 from app.db.models import User, Role
+from app.db.load_plans import load_plan
+from app.core.principal import invalidate_principal
+from app.core.response_cache import USER, response_cache
 from app.schemas.user_dto import UserDTO, UserCreateDTO, UserUpdateDTO
-from typing import List
+from app.schemas.common import Page
+from app.db.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from typing import Optional
 from app.services.user_service import (
     create_user_service,
     list_users_service,
-    get_user_service,
+    stream_users_service,
+    cached_user_service,
     update_user_service,
     delete_user_service
 )
@@ -19,13 +27,21 @@ router = APIRouter(prefix="/adsweb/api/v1/users", tags=["Users"])
 async def create_user(payload: UserCreateDTO, db: AsyncSession = Depends(get_database)):
     return await create_user_service(db, payload)
 
-@router.get("/", response_model=List[UserDTO])
-async def list_users(db: AsyncSession = Depends(get_database)):
-    return await list_users_service(db)
+@router.get("/", response_model=Page[UserDTO])
+async def list_users(
+    request: Request,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    db: AsyncSession = Depends(get_database),
+    session_factory: async_sessionmaker = Depends(get_session_factory),
+):
+    if wants_ndjson(request):
+        return ndjson_response(session_factory, stream_users_service)
+    return page_response(UserDTO, await list_users_service(db, limit, after))
 
 @router.get("/{user_id}", response_model=UserDTO)
 async def get_user(user_id: int, db: AsyncSession = Depends(get_database)):
-    return await get_user_service(db, user_id)
+    return Response(content=await cached_user_service(db, user_id), media_type="application/json")
 
 @router.put("/{user_id}", response_model=UserDTO)
 async def update_user(user_id: int, payload: UserUpdateDTO, db: AsyncSession = Depends(get_database)):
@@ -37,7 +53,7 @@ async def delete_user(user_id: int, db: AsyncSession = Depends(get_database)):
 
 @router.put("/{user_id}/roles", response_model=dict)
 async def update_user_roles(user_id: int, roles: list[str], db: AsyncSession = Depends(get_database)):
-    result = await db.execute(select(User).where(User.id == user_id))
+    result = await db.execute(select(User).options(*load_plan("user_with_roles")).where(User.id == user_id))
     user = result.scalar_one_or_none()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
@@ -47,7 +63,8 @@ async def update_user_roles(user_id: int, roles: list[str], db: AsyncSession = D
         raise HTTPException(status_code=400, detail="No valid roles provided")
     user.roles = role_objs
     await db.commit()
-    await db.refresh(user)
+    invalidate_principal(user.id)
+    await response_cache.invalidate((USER, user.id))
     return {
         "id": user.id,
         "username": user.username,
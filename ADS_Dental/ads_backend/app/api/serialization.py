@@ -0,0 +1,56 @@
+# app/api/serialization.py
+# Fast response path. A handler that returns a model lets FastAPI dump it,
+# validate the dump against response_model and dump it again before json.dumps
+# runs; for nested DTOs (AppointmentDTO -> SurgeryDTO -> dentists) that walk
+# dominates the request. Handlers whose DTOs are built from trusted data return
+# json_response(...) instead: one pass of a precompiled TypeAdapter straight to
+# bytes. response_model stays on the route for the OpenAPI schema.
+import json
+from functools import lru_cache
+from typing import Any, Mapping, Optional, Type, Union
+
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel, TypeAdapter
+
+from app.schemas.common import Page, trusted
+
+try:
+    import orjson  # pinned in requirements.txt
+except ImportError:  # safety net for partial installs: the stdlib encoder, slower
+    orjson = None
+
+
+class FastJSONResponse(JSONResponse):
+    """The default response class: orjson, or compact json.dumps if it is missing."""
+
+    def render(self, content: Any) -> bytes:
+        if orjson is not None:
+            return orjson.dumps(content)
+        return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+@lru_cache(maxsize=None)
+def adapter(tp) -> TypeAdapter:
+    """One compiled adapter per response type, built on first use."""
+    return TypeAdapter(tp)
+
+
+def json_response(
+    tp, value: Any, status_code: int = 200, headers: Optional[Mapping[str, str]] = None,
+    media_type: str = "application/json",
+) -> Response:
+    """Serialize ``value`` (already an instance of ``tp``) without revalidating it."""
+    return Response(content=adapter(tp).dump_json(value), status_code=status_code, media_type=media_type, headers=headers)
+
+
+def page_response(item_type: Type[BaseModel], page: Union[Page, Mapping[str, Any]]) -> Response:
+    """A Page of ``item_type``, from a Page or the services' {"items", "next_cursor"} dicts."""
+    page_type = Page[item_type]
+    if not isinstance(page, Page):
+        page = trusted(page_type, items=page["items"], next_cursor=page.get("next_cursor"))
+    return json_response(page_type, page)
+
+
+def sparse_response(value: Any) -> Response:
+    """Plain dicts (e.g. sparse fieldsets), serialized by value type."""
+    return json_response(Any, value)
@@ -0,0 +1,46 @@
+# app/api/streaming.py
+# NDJSON streaming for clients that want a whole collection. Rows are read via a
+# server-side cursor and written out one DTO per line as they arrive, so memory
+# stays flat and the first bytes go out as soon as the first batch is fetched.
+from typing import AsyncIterator, Callable
+
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import STREAM_BATCH_SIZE
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+def accepts(request: Request, media_type: str) -> bool:
+    """Whether the Accept header names ``media_type`` explicitly."""
+    accept = request.headers.get("accept", "")
+    return any(part.split(";")[0].strip().lower() == media_type for part in accept.split(","))
+
+
+def wants_ndjson(request: Request) -> bool:
+    return accepts(request, NDJSON_MEDIA_TYPE)
+
+
+def ndjson_response(
+    session_factory: async_sessionmaker,
+    produce: Callable[[AsyncSession], AsyncIterator[BaseModel]],
+) -> StreamingResponse:
+    """
+    Stream the DTOs yielded by ``produce`` as NDJSON. The request-scoped session
+    is closed before the body is sent, so the stream opens its own.
+    """
+    async def body():
+        async with session_factory() as session:
+            buffer = []
+            async for dto in produce(session):
+                buffer.append(dto.model_dump_json())
+                if len(buffer) >= STREAM_BATCH_SIZE:
+                    yield ("\n".join(buffer) + "\n").encode("utf-8")
+                    buffer.clear()
+            if buffer:
+                yield ("\n".join(buffer) + "\n").encode("utf-8")
+
+    return StreamingResponse(body(), media_type=NDJSON_MEDIA_TYPE)
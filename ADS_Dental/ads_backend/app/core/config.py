@@ -4,7 +4,102 @@ from dotenv import load_dotenv
 load_dotenv()
 
 DATABASE_URL = os.getenv("DATABASE_URL")
+# Read replicas, comma-separated URLs. Plain reads of GET requests go to a
+# healthy replica; writes, and reads by a caller who wrote within the last
+# REPLICA_STICKY_SECONDS, go to DATABASE_URL. Unset: everything uses DATABASE_URL.
+DATABASE_REPLICA_URLS = [u.strip() for u in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if u.strip()]
+REPLICA_STICKY_SECONDS = float(os.getenv("REPLICA_STICKY_SECONDS", "5"))
+REPLICA_HEALTH_CHECK_SECONDS = float(os.getenv("REPLICA_HEALTH_CHECK_SECONDS", "10"))
 LIVE_DB = os.getenv("LIVE_DB")
 SECRET_KEY = os.getenv("SECRET_KEY", "super-secret-key")
 ALGORITHM = "HS256"
-ACCESS_TOKEN_EXPIRE_MINUTES = 60
\ No newline at end of file
+ACCESS_TOKEN_EXPIRE_MINUTES = 60
+# Invite tokens let imported patients choose their own password
+INVITE_TOKEN_EXPIRE_HOURS = int(os.getenv("INVITE_TOKEN_EXPIRE_HOURS", "72"))
+
+# Rows fetched per round trip when streaming large collections
+STREAM_BATCH_SIZE = int(os.getenv("STREAM_BATCH_SIZE", "500"))
+# Rows per fetch and per written chunk for the /export dumps
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "5000"))
+
+# bcrypt runs on a dedicated pool so it never blocks the event loop. Requests
+# beyond workers + queue size are rejected with 503 instead of piling up.
+PASSWORD_HASH_EXECUTOR = os.getenv("PASSWORD_HASH_EXECUTOR", "thread")  # "thread" or "process"
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+PASSWORD_HASH_QUEUE_SIZE = int(os.getenv("PASSWORD_HASH_QUEUE_SIZE", "32"))
+
+# Authenticated principals are cached per token subject; writes to a user
+# invalidate its entry, the TTL bounds staleness across worker processes.
+PRINCIPAL_CACHE_TTL_SECONDS = float(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", "60"))
+PRINCIPAL_CACHE_MAX_ENTRIES = int(os.getenv("PRINCIPAL_CACHE_MAX_ENTRIES", "10000"))
+
+# Maximum number of patients returned by one search
+SEARCH_RESULT_LIMIT = int(os.getenv("SEARCH_RESULT_LIMIT", "20"))
+
+# Verified JWT claims are cached per token digest, never past the token's exp
+CLAIMS_CACHE_TTL_SECONDS = float(os.getenv("CLAIMS_CACHE_TTL_SECONDS", "300"))
+CLAIMS_CACHE_MAX_ENTRIES = int(os.getenv("CLAIMS_CACHE_MAX_ENTRIES", "10000"))
+
+# Bookable grid for availability: slots of APPOINTMENT_SLOT_MINUTES between the
+# working-day start and end, on the listed weekdays (0 = Monday)
+WORKING_DAY_START = os.getenv("WORKING_DAY_START", "09:00")
+WORKING_DAY_END = os.getenv("WORKING_DAY_END", "17:00")
+WORKING_WEEKDAYS = tuple(int(d) for d in os.getenv("WORKING_WEEKDAYS", "0,1,2,3,4").split(","))
+APPOINTMENT_SLOT_MINUTES = int(os.getenv("APPOINTMENT_SLOT_MINUTES", "30"))
+# Longest window one availability request may span
+AVAILABILITY_MAX_DAYS = int(os.getenv("AVAILABILITY_MAX_DAYS", "92"))
+# Per-dentist day bitmaps are kept up to date by this process's commits; the
+# TTL bounds staleness from writes made by other workers
+AVAILABILITY_CACHE_TTL_SECONDS = float(os.getenv("AVAILABILITY_CACHE_TTL_SECONDS", "300"))
+AVAILABILITY_CACHE_MAX_ENTRIES = int(os.getenv("AVAILABILITY_CACHE_MAX_ENTRIES", "200000"))
+
+# Surgeries, their dentists and role ids are served from memory. This process's
+# commits invalidate them; the TTL bounds staleness from other workers. Clients
+# may reuse a response for max-age seconds, then revalidate with its ETag.
+REFERENCE_CACHE_TTL_SECONDS = float(os.getenv("REFERENCE_CACHE_TTL_SECONDS", "300"))
+REFERENCE_CACHE_MAX_ENTRIES = int(os.getenv("REFERENCE_CACHE_MAX_ENTRIES", "1000"))
+REFERENCE_MAX_AGE_SECONDS = int(os.getenv("REFERENCE_MAX_AGE_SECONDS", "60"))
+
+# Cached single-entity GET responses. Empty: an in-process LRU per worker;
+# redis://host:port/db: shared by every worker through a Redis-protocol server.
+RESPONSE_CACHE_URL = os.getenv("RESPONSE_CACHE_URL", "")
+RESPONSE_CACHE_TTL_SECONDS = float(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "60"))
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "10000"))
+
+# Most live appointments a dentist may have in one (Monday-starting) week
+WEEKLY_APPOINTMENT_LIMIT = int(os.getenv("WEEKLY_APPOINTMENT_LIMIT", "5"))
+
+# Most rows accepted by one POST /appointments/bulk request
+BULK_APPOINTMENT_MAX_ROWS = int(os.getenv("BULK_APPOINTMENT_MAX_ROWS", "1000"))
+
+# Outgoing mail. The outbox worker only runs when SMTP_HOST is set; until
+# then messages stay queued in outbox_messages.
+SMTP_HOST = os.getenv("SMTP_HOST")
+SMTP_PORT = int(os.getenv("SMTP_PORT", "25"))
+SMTP_USERNAME = os.getenv("SMTP_USERNAME")
+SMTP_PASSWORD = os.getenv("SMTP_PASSWORD")
+SMTP_STARTTLS = os.getenv("SMTP_STARTTLS", "false").lower() == "true"
+SMTP_TIMEOUT_SECONDS = float(os.getenv("SMTP_TIMEOUT_SECONDS", "10"))
+MAIL_FROM = os.getenv("MAIL_FROM", "ADS Dental Surgeries <no-reply@ads.com>")
+# Messages sent per batch, how often to poll when idle, and the retry policy:
+# exponential backoff from the base delay, capped, up to the attempt limit
+OUTBOX_BATCH_SIZE = int(os.getenv("OUTBOX_BATCH_SIZE", "50"))
+OUTBOX_POLL_SECONDS = float(os.getenv("OUTBOX_POLL_SECONDS", "5"))
+OUTBOX_MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "8"))
+OUTBOX_BACKOFF_SECONDS = float(os.getenv("OUTBOX_BACKOFF_SECONDS", "30"))
+OUTBOX_BACKOFF_MAX_SECONDS = float(os.getenv("OUTBOX_BACKOFF_MAX_SECONDS", "3600"))
+# How long a claimed batch is hidden from other workers while it is being sent
+OUTBOX_LEASE_SECONDS = float(os.getenv("OUTBOX_LEASE_SECONDS", "120"))
+
+# Archival: COMPLETED and CANCELLED appointments older than this many days are
+# moved to appointments_archive, in transactions of at most ARCHIVE_BATCH_SIZE rows
+ARCHIVE_AFTER_DAYS = int(os.getenv("ARCHIVE_AFTER_DAYS", "365"))
+ARCHIVE_BATCH_SIZE = int(os.getenv("ARCHIVE_BATCH_SIZE", "5000"))
+
+# Patient numbers are reserved from number_sequences this many at a time per
+# process; a restart leaves at most one unused block as a gap
+PATIENT_NO_BLOCK_SIZE = int(os.getenv("PATIENT_NO_BLOCK_SIZE", "100"))
+
+# POST /patients/import validates and inserts rows in batches of this size,
+# one transaction per batch
+PATIENT_IMPORT_BATCH_SIZE = int(os.getenv("PATIENT_IMPORT_BATCH_SIZE", "1000"))
@@ -0,0 +1,76 @@
+# app/core/mailer.py
+# SMTP delivery over one long-lived connection. smtplib is blocking, so the
+# outbox worker calls send_many() from a thread; the connection is opened on
+# first use, reused for every later batch and reopened if the server drops it.
+import smtplib
+import threading
+from email.message import EmailMessage
+from typing import List, Optional, Sequence
+
+
+class SMTPMailer:
+    def __init__(
+        self,
+        host: str,
+        port: int = 25,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        starttls: bool = False,
+        timeout: float = 10,
+    ):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.starttls = starttls
+        self.timeout = timeout
+        self._smtp: Optional[smtplib.SMTP] = None
+        self._lock = threading.Lock()
+
+    def _connection(self) -> smtplib.SMTP:
+        if self._smtp is None:
+            smtp = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+            if self.starttls:
+                smtp.starttls()
+            if self.username:
+                smtp.login(self.username, self.password or "")
+            self._smtp = smtp
+        return self._smtp
+
+    def _send(self, message: EmailMessage) -> None:
+        try:
+            self._connection().send_message(message)
+        except smtplib.SMTPServerDisconnected:
+            # Idle connections get closed by the server; retry once on a fresh one
+            self._discard()
+            self._connection().send_message(message)
+
+    def send_many(self, messages: Sequence[EmailMessage]) -> List[Optional[Exception]]:
+        """Send each message; returns None or the failure for each, in order."""
+        results: List[Optional[Exception]] = []
+        with self._lock:
+            for message in messages:
+                try:
+                    self._send(message)
+                    results.append(None)
+                except (smtplib.SMTPException, OSError) as e:
+                    self._discard()
+                    results.append(e)
+        return results
+
+    def _discard(self) -> None:
+        smtp, self._smtp = self._smtp, None
+        if smtp is not None:
+            try:
+                smtp.close()
+            except OSError:
+                pass
+
+    def close(self) -> None:
+        with self._lock:
+            if self._smtp is not None:
+                try:
+                    self._smtp.quit()
+                except (smtplib.SMTPException, OSError):
+                    pass
+            self._discard()
@@ -0,0 +1,170 @@
+# app/core/outbox_worker.py
+# Background delivery for the transactional outbox. The worker claims a batch of
+# due messages (hiding them from other workers for a lease), renders them,
+# sends them over the mailer's pooled SMTP connection off the event loop, and
+# records each outcome: sent, or rescheduled with exponential backoff.
+import asyncio
+import logging
+import random
+from datetime import datetime, timedelta, timezone
+from email.message import EmailMessage
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import (
+    OUTBOX_BATCH_SIZE, OUTBOX_POLL_SECONDS, OUTBOX_MAX_ATTEMPTS,
+    OUTBOX_BACKOFF_SECONDS, OUTBOX_BACKOFF_MAX_SECONDS, OUTBOX_LEASE_SECONDS,
+)
+from app.db.models import OutboxMessage
+
+logger = logging.getLogger(__name__)
+
+Renderer = Callable[[AsyncSession, List[OutboxMessage]], Awaitable[Dict[int, Optional[EmailMessage]]]]
+
+_active_worker: Optional["OutboxWorker"] = None
+
+
+def utcnow() -> datetime:
+    # Outbox timestamps are naive UTC, compared in Python rather than by the database
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def notify_outbox() -> None:
+    """Wake the running worker (if any) after committing new messages."""
+    if _active_worker is not None:
+        _active_worker.notify()
+
+
+class OutboxWorker:
+    def __init__(
+        self,
+        mailer,
+        renderers: Dict[str, Renderer],
+        batch_size: int = OUTBOX_BATCH_SIZE,
+        poll_seconds: float = OUTBOX_POLL_SECONDS,
+        max_attempts: int = OUTBOX_MAX_ATTEMPTS,
+        backoff_seconds: float = OUTBOX_BACKOFF_SECONDS,
+        backoff_max_seconds: float = OUTBOX_BACKOFF_MAX_SECONDS,
+        lease_seconds: float = OUTBOX_LEASE_SECONDS,
+    ):
+        self.mailer = mailer
+        self.renderers = renderers
+        self.batch_size = batch_size
+        self.poll_seconds = poll_seconds
+        self.max_attempts = max_attempts
+        self.backoff_seconds = backoff_seconds
+        self.backoff_max_seconds = backoff_max_seconds
+        self.lease_seconds = lease_seconds
+        self._session_factory: Optional[async_sessionmaker] = None
+        self._task: Optional[asyncio.Task] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def backoff(self, attempts: int) -> timedelta:
+        delay = min(self.backoff_max_seconds, self.backoff_seconds * 2 ** (attempts - 1))
+        return timedelta(seconds=delay * random.uniform(0.5, 1.0))
+
+    def start(self, session_factory: async_sessionmaker) -> None:
+        global _active_worker
+        self._session_factory = session_factory
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        self._task = asyncio.create_task(self._run(), name="outbox-worker")
+        _active_worker = self
+
+    def notify(self) -> None:
+        if self._loop is not None and self._wake is not None:
+            self._loop.call_soon_threadsafe(self._wake.set)
+
+    async def stop(self) -> None:
+        global _active_worker
+        if _active_worker is self:
+            _active_worker = None
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await asyncio.to_thread(self.mailer.close)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                handled = await self.drain_once(self._session_factory)
+            except Exception:
+                logger.exception("Outbox batch failed")
+                handled = 0
+            if handled >= self.batch_size:
+                continue  # more may be due right now
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.poll_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+
+    async def _claim(self, db: AsyncSession) -> List[OutboxMessage]:
+        now = utcnow()
+        messages = (await db.execute(
+            select(OutboxMessage)
+            .where(
+                OutboxMessage.sent_at.is_(None),
+                OutboxMessage.attempts < self.max_attempts,
+                OutboxMessage.next_attempt_at <= now,
+            )
+            .order_by(OutboxMessage.next_attempt_at, OutboxMessage.id)
+            .limit(self.batch_size)
+            .with_for_update(skip_locked=True)
+        )).scalars().all()
+        for message in messages:
+            message.next_attempt_at = now + timedelta(seconds=self.lease_seconds)
+        return list(messages)
+
+    async def drain_once(self, session_factory: async_sessionmaker) -> int:
+        """Deliver one batch of due messages; returns how many were handled."""
+        async with session_factory() as db:
+            messages = await self._claim(db)
+            if not messages:
+                return 0
+            emails: Dict[int, Optional[EmailMessage]] = {}
+            by_kind: Dict[str, List[OutboxMessage]] = {}
+            for message in messages:
+                by_kind.setdefault(message.kind, []).append(message)
+            for kind, batch in by_kind.items():
+                renderer = self.renderers.get(kind)
+                if renderer is None:
+                    emails.update({m.id: None for m in batch})
+                else:
+                    emails.update(await renderer(db, batch))
+            attempts = {m.id: m.attempts for m in messages}
+            await db.commit()
+
+        to_send = [(message_id, email) for message_id, email in emails.items() if email is not None]
+        results = await asyncio.to_thread(self.mailer.send_many, [email for _, email in to_send])
+
+        now = utcnow()
+        outcomes = [
+            # Nothing to send (unknown kind or the subject was deleted): retire it
+            {"id": message_id, "sent_at": now, "last_error": "nothing to send"}
+            for message_id, email in emails.items() if email is None
+        ]
+        for (message_id, _), error in zip(to_send, results):
+            if error is None:
+                outcomes.append({"id": message_id, "sent_at": now, "last_error": None})
+            else:
+                tries = attempts[message_id] + 1
+                outcomes.append({
+                    "id": message_id,
+                    "attempts": tries,
+                    "next_attempt_at": now + self.backoff(tries),
+                    "last_error": str(error)[:1000],
+                })
+                logger.warning("Outbox message %s failed (attempt %s): %s", message_id, tries, error)
+        async with session_factory() as db:
+            for keys in {tuple(sorted(o)) for o in outcomes}:
+                await db.execute(update(OutboxMessage), [o for o in outcomes if tuple(sorted(o)) == keys])
+            await db.commit()
+        return len(messages)
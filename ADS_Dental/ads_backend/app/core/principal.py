@@ -0,0 +1,69 @@
+# app/core/principal.py
+# The authenticated principal: the handful of user fields request handlers
+# need, cached per token subject so authenticated requests don't reload the
+# user, its roles and its patient/dentist profile on every call.
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import TTLCache
+from app.core.config import PRINCIPAL_CACHE_TTL_SECONDS, PRINCIPAL_CACHE_MAX_ENTRIES
+from app.db.models import User, Role, Patient, Dentist, user_roles
+from app.db.routing import read_from_primary
+
+
+@dataclass(frozen=True)
+class Principal:
+    id: int
+    email: str
+    roles: Tuple[str, ...]
+    patient_id: Optional[int] = None
+    dentist_id: Optional[int] = None
+
+    def has_role(self, role: str) -> bool:
+        return role.upper() in self.roles
+
+
+principal_cache = TTLCache(PRINCIPAL_CACHE_MAX_ENTRIES, PRINCIPAL_CACHE_TTL_SECONDS)
+
+
+async def load_principal(db: AsyncSession, email: str) -> Optional[Principal]:
+    row = (await db.execute(
+        select(User.id, User.email, Patient.id.label("patient_id"), Dentist.id.label("dentist_id"))
+        .outerjoin(Patient, Patient.user_id == User.id)
+        .outerjoin(Dentist, Dentist.user_id == User.id)
+        .where(User.email == email)
+        .limit(1)
+    )).first()
+    if row is None:
+        return None
+    roles = (await db.execute(
+        select(Role.name)
+        .join(user_roles, user_roles.c.role_id == Role.id)
+        .where(user_roles.c.user_id == row.id)
+        .order_by(Role.id)
+    )).scalars().all()
+    return Principal(
+        id=row.id,
+        email=row.email,
+        roles=tuple(r.upper() for r in roles),
+        patient_id=row.patient_id,
+        dentist_id=row.dentist_id,
+    )
+
+
+async def get_principal(db: AsyncSession, email: str) -> Optional[Principal]:
+    principal = principal_cache.get(email)
+    if principal is None:
+        read_from_primary(db)
+        principal = await load_principal(db, email)
+        if principal is not None:
+            principal_cache.set(email, principal)
+    return principal
+
+
+def invalidate_principal(user_id: int) -> None:
+    """Call after any change to a user's email, roles or profiles, or its deletion."""
+    principal_cache.discard_if(lambda p: p.id == user_id)
@@ -0,0 +1,221 @@
+# app/core/response_cache.py
+# Serialized single-entity GET responses (patient, user), keyed "entity:id".
+# The backend is pluggable: an in-process LRU by default, or any server that
+# speaks the Redis protocol (RESPONSE_CACHE_URL=redis://host:port/db), so all
+# workers share entries. Services that change an entity invalidate its key
+# after committing; the TTL bounds anything they miss.
+#
+# Misses are single-flight per key: the first coroutine loads and stores the
+# body, concurrent requests for the same key await its result instead of all
+# querying the database at once. Backend failures degrade to a plain load.
+import asyncio
+import logging
+from collections import Counter
+from typing import Awaitable, Callable, Dict, List, Optional, Protocol, Tuple
+from urllib.parse import unquote, urlparse
+
+from app.core.cache import TTLCache
+from app.core.config import RESPONSE_CACHE_MAX_ENTRIES, RESPONSE_CACHE_TTL_SECONDS, RESPONSE_CACHE_URL
+
+logger = logging.getLogger(__name__)
+
+PATIENT = "patient"
+USER = "user"
+
+
+class CacheBackendError(Exception):
+    """An error reply from the cache server."""
+
+
+class CacheBackend(Protocol):
+    async def get(self, key: str) -> Optional[bytes]: ...
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None: ...
+
+    async def delete(self, *keys: str) -> None: ...
+
+
+class MemoryBackend:
+    def __init__(self, maxsize: int = RESPONSE_CACHE_MAX_ENTRIES, ttl: float = RESPONSE_CACHE_TTL_SECONDS):
+        self._cache = TTLCache(maxsize, ttl)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return self._cache.get(key)
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        self._cache.set(key, value, ttl)
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            self._cache.pop(key)
+
+
+def _encode_command(args: Tuple) -> bytes:
+    parts = [b"*%d\r\n" % len(args)]
+    for arg in args:
+        if not isinstance(arg, bytes):
+            arg = str(arg).encode("utf-8")
+        parts.append(b"$%d\r\n%s\r\n" % (len(arg), arg))
+    return b"".join(parts)
+
+
+async def _read_reply(reader: asyncio.StreamReader):
+    line = (await reader.readuntil(b"\r\n"))[:-2]
+    kind, rest = line[:1], line[1:]
+    if kind == b"+":
+        return rest.decode("utf-8")
+    if kind == b"-":
+        raise CacheBackendError(rest.decode("utf-8"))
+    if kind == b":":
+        return int(rest)
+    if kind == b"$":
+        length = int(rest)
+        if length < 0:
+            return None
+        return (await reader.readexactly(length + 2))[:-2]
+    if kind == b"*":
+        length = int(rest)
+        return None if length < 0 else [await _read_reply(reader) for _ in range(length)]
+    raise CacheBackendError(f"Unexpected reply: {line[:40]!r}")
+
+
+class RedisBackend:
+    """
+    Minimal RESP2 client: GET, SET .. PX and DEL over one connection per event
+    loop. Commands are short and pipelined one at a time under a lock.
+    """
+
+    def __init__(self, url: str, timeout: float = 1.0):
+        parsed = urlparse(url)
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or 6379
+        self.password = unquote(parsed.password) if parsed.password else None
+        self.db = int(parsed.path.lstrip("/") or 0)
+        self.timeout = timeout
+        self._connection: Optional[Tuple[asyncio.StreamReader, asyncio.StreamWriter]] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock: Optional[asyncio.Lock] = None
+
+    async def _connect(self) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        self._connection = reader, writer
+        if self.password:
+            await self._send(("AUTH", self.password))
+        if self.db:
+            await self._send(("SELECT", self.db))
+        return reader, writer
+
+    async def _send(self, args: Tuple):
+        reader, writer = self._connection
+        writer.write(_encode_command(args))
+        await writer.drain()
+        return await _read_reply(reader)
+
+    def _close(self) -> None:
+        if self._connection is not None:
+            self._connection[1].close()
+            self._connection = None
+
+    async def command(self, *args):
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Streams and locks belong to the loop that created them
+            self._connection, self._loop, self._lock = None, loop, asyncio.Lock()
+        async with self._lock:
+            for attempt in range(2):
+                try:
+                    if self._connection is None:
+                        await asyncio.wait_for(self._connect(), self.timeout)
+                    return await asyncio.wait_for(self._send(args), self.timeout)
+                except (OSError, EOFError, asyncio.IncompleteReadError, asyncio.TimeoutError):
+                    # A dropped connection is retried once on a fresh one
+                    self._close()
+                    if attempt:
+                        raise
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self.command("GET", key)
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        await self.command("SET", key, value, "PX", max(1, int(ttl * 1000)))
+
+    async def delete(self, *keys: str) -> None:
+        if keys:
+            await self.command("DEL", *keys)
+
+
+def backend_from_url(url: str) -> CacheBackend:
+    if url.startswith(("redis://", "rediss://")):
+        return RedisBackend(url)
+    return MemoryBackend()
+
+
+BACKEND_ERRORS = (OSError, EOFError, asyncio.IncompleteReadError, asyncio.TimeoutError, CacheBackendError)
+
+
+class ResponseCache:
+    def __init__(self, backend: CacheBackend, ttl: float = RESPONSE_CACHE_TTL_SECONDS):
+        self.ttl = ttl
+        self.use(backend)
+
+    def use(self, backend: CacheBackend) -> None:
+        """Switch backends (e.g. a local stand-in in tests); counters start over."""
+        self.backend = backend
+        self.hits: Counter = Counter()
+        self.misses: Counter = Counter()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        # Bumped by every invalidation, so a load that raced with one is not stored
+        self._generation = 0
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        return {"hits": dict(self.hits), "misses": dict(self.misses)}
+
+    async def get_or_load(self, entity: str, entity_id, load: Callable[[], Awaitable[bytes]]) -> bytes:
+        key = f"{entity}:{entity_id}"
+        try:
+            body = await self.backend.get(key)
+        except BACKEND_ERRORS as e:
+            logger.warning("Response cache read failed for %s: %s", key, e)
+            body = None
+        if body is not None:
+            self.hits[entity] += 1
+            return body
+        self.misses[entity] += 1
+
+        pending = self._inflight.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        generation = self._generation
+        try:
+            body = await load()
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # retrieved: waiters re-raise it, nobody else has to
+            raise
+        else:
+            future.set_result(body)
+            if self._generation == generation:
+                try:
+                    await self.backend.set(key, body, self.ttl)
+                except BACKEND_ERRORS as e:
+                    logger.warning("Response cache write failed for %s: %s", key, e)
+            return body
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+    async def invalidate(self, *entries: Tuple[str, object]) -> None:
+        """Drop ``(entity, id)`` entries; call after the change has committed."""
+        self._generation += 1
+        keys: List[str] = [f"{entity}:{entity_id}" for entity, entity_id in entries]
+        for key in keys:
+            self._inflight.pop(key, None)
+        try:
+            await self.backend.delete(*keys)
+        except BACKEND_ERRORS as e:
+            logger.warning("Response cache invalidation failed for %s: %s", keys, e)
+
+
+response_cache = ResponseCache(backend_from_url(RESPONSE_CACHE_URL))
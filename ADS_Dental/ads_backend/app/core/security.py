@@ -1,29 +1,91 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from jose import jwt, JWTError
 from passlib.context import CryptContext
 from fastapi import HTTPException, Depends, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from app.db.models import User
 from app.db.session import get_database
-from app.core.config import SECRET_KEY, ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES
+from app.core.cache import TTLCache
+from app.core.principal import Principal, get_principal
+from app.core.config import (
+    SECRET_KEY, ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES, INVITE_TOKEN_EXPIRE_HOURS,
+    PASSWORD_HASH_EXECUTOR, PASSWORD_HASH_WORKERS, PASSWORD_HASH_QUEUE_SIZE,
+    CLAIMS_CACHE_TTL_SECONDS, CLAIMS_CACHE_MAX_ENTRIES,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.future import select
 import hashlib
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 security = HTTPBearer()
 
-def hash_password(password: str):
+def _password_bytes(password):
     if isinstance(password, str):
         password_bytes = password.encode('utf-8')
     else:
         password_bytes = password
     if len(password_bytes) > 72:
         password_bytes = hashlib.sha256(password_bytes).hexdigest().encode('utf-8')
-    return pwd_context.hash(password_bytes)
+    return password_bytes
+
+def hash_password(password: str):
+    return pwd_context.hash(_password_bytes(password))
 
 def verify_password(plain: str, hashed: str):
-    return pwd_context.verify(plain, hashed)
+    return pwd_context.verify(_password_bytes(plain), hashed)
+
+class PasswordHasher:
+    """
+    Runs bcrypt on a bounded worker pool. At most ``workers + queue_size``
+    calls may be in flight; further calls fail fast with 503 so a login burst
+    cannot starve the event loop or queue unboundedly.
+    """
+
+    def __init__(self, kind: str, workers: int, queue_size: int):
+        self.kind = kind
+        self.workers = workers
+        self.capacity = workers + queue_size
+        self._executor: Executor | None = None
+        self._in_flight = 0
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="password-hash")
+        return self._executor
+
+    async def run(self, fn, *args):
+        with self._lock:
+            if self._in_flight >= self.capacity:
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Too many concurrent authentication requests, please retry",
+                    headers={"Retry-After": "1"},
+                )
+            self._in_flight += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._get_executor(), fn, *args)
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+password_hasher = PasswordHasher(PASSWORD_HASH_EXECUTOR, PASSWORD_HASH_WORKERS, PASSWORD_HASH_QUEUE_SIZE)
+
+async def hash_password_async(password: str) -> str:
+    return await password_hasher.run(hash_password, password)
+
+async def verify_password_async(plain: str, hashed: str) -> bool:
+    return await password_hasher.run(verify_password, plain, hashed)
 
 def create_access_token(data: dict, expires_delta: timedelta | None = None):
     to_encode = data.copy()
@@ -31,35 +93,69 @@ def create_access_token(data: dict, expires_delta: timedelta | None = None):
     to_encode.update({"exp": expire})
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
-async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security), db: AsyncSession = Depends(get_database)) -> User:
-    token = credentials.credentials
+# Invite tokens carry this audience, which decode_token (no audience given)
+# rejects, so an invite can never be used as a bearer token
+INVITE_AUDIENCE = "invite"
+# Stored for accounts awaiting an invite: not a hash, so no password verifies
+INVITE_PENDING_PASSWORD = "!invite"
+
+def create_invite_token(email: str) -> str:
+    return create_access_token({"sub": email, "aud": INVITE_AUDIENCE}, timedelta(hours=INVITE_TOKEN_EXPIRE_HOURS))
+
+def decode_invite_token(token: str) -> str:
+    """Email the invite was issued to; raises JWTError if invalid or expired."""
+    claims = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM], audience=INVITE_AUDIENCE)
+    if not claims.get("sub"):
+        raise JWTError("Invite token has no subject")
+    return claims["sub"]
+
+claims_cache = TTLCache(CLAIMS_CACHE_MAX_ENTRIES, CLAIMS_CACHE_TTL_SECONDS)
+
+def decode_token(token: str) -> dict:
+    """
+    Verify ``token`` and return its claims. Verified claims are cached by token
+    digest until the token's ``exp``, so repeat requests skip the HMAC check and
+    claims validation. Raises JWTError for invalid or expired tokens.
+    """
+    key = hashlib.sha256(token.encode("utf-8")).digest()
+    claims = claims_cache.get(key)
+    if claims is not None and claims.get("exp", float("inf")) > time.time():
+        return dict(claims)
+    claims = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    ttl = CLAIMS_CACHE_TTL_SECONDS
+    if "exp" in claims:
+        ttl = min(ttl, claims["exp"] - time.time())
+    claims_cache.set(key, claims, ttl=ttl)
+    return dict(claims)
+
+async def get_claims(credentials: HTTPAuthorizationCredentials = Depends(security)) -> dict:
+    # FastAPI caches dependency results per request, so every auth dependency
+    # built on this one shares a single decode.
+    try:
+        return decode_token(credentials.credentials)
+    except JWTError:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+async def get_current_user(claims: dict = Depends(get_claims), db: AsyncSession = Depends(get_database)) -> Principal:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        email: str = payload.get("sub")
-        if email is None:
-            raise credentials_exception
-    except JWTError:
+    email = claims.get("sub")
+    if email is None:
         raise credentials_exception
 
-    result = await db.execute(select(User).where(User.email == str(email)))
-    user = result.scalar_one_or_none()
-    if not user:
+    principal = await get_principal(db, str(email))
+    if not principal:
         raise credentials_exception
-    return user
-
-async def require_patient(current_user: User = Depends(get_current_user)):
-    if hasattr(current_user, "role") and isinstance(current_user.role, str):
-        if current_user.role.lower() != "patient":
-            raise HTTPException(status_code=403, detail="Only patients can access this resource")
-    elif hasattr(current_user, "roles"):
-        role_names = [r.name.lower() for r in current_user.roles]
-        if "patient" not in role_names:
-            raise HTTPException(status_code=403, detail="Only patients can access this resource")
-    else:
+    return principal
+
+async def require_patient(current_user: Principal = Depends(get_current_user)):
+    if not current_user.has_role("PATIENT"):
         raise HTTPException(status_code=403, detail="Only patients can access this resource")
     return current_user
\ No newline at end of file
@@ -0,0 +1,79 @@
+# app/db/archival.py
+# Moves finished history out of the hot appointments table. Each batch copies
+# up to ``batch_size`` COMPLETED/CANCELLED rows older than the cutoff into
+# appointments_archive and deletes them from appointments in one short
+# transaction, so the job can run against a live database and be resumed.
+#
+#   python -m app.db.archival [--before 2024-01-01] [--batch-size 5000]
+import argparse
+import asyncio
+from datetime import date, timedelta
+from typing import Optional
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.core.config import ARCHIVE_AFTER_DAYS, ARCHIVE_BATCH_SIZE
+from app.db.calendar_versions import bump_calendar_versions
+from app.db.models import Appointment, AppointmentArchive, AppointmentStatus
+
+ARCHIVED_STATUSES = (AppointmentStatus.COMPLETED, AppointmentStatus.CANCELLED)
+COLUMNS = ("id", "appointment_date", "appointment_time", "status", "patient_id", "dentist_id", "surgery_id")
+
+_hot = Appointment.__table__
+_archive = AppointmentArchive.__table__
+
+
+def archive_cutoff(today: Optional[date] = None) -> date:
+    return (today or date.today()) - timedelta(days=ARCHIVE_AFTER_DAYS)
+
+
+async def archive_appointments(
+    session_factory: async_sessionmaker, before: Optional[date] = None, batch_size: int = ARCHIVE_BATCH_SIZE
+) -> int:
+    """Archive every finished appointment dated before ``before``; returns how many were moved."""
+    before = before or archive_cutoff()
+    due = (
+        select(_hot.c.id, _hot.c.dentist_id)
+        .where(_hot.c.status.in_(ARCHIVED_STATUSES), _hot.c.appointment_date < before)
+        .order_by(_hot.c.id)
+        .limit(batch_size)
+    )
+    moved = 0
+    while True:
+        async with session_factory() as db:
+            rows = (await db.execute(due)).all()
+            if not rows:
+                return moved
+            ids = [r.id for r in rows]
+            await db.execute(insert(_archive).from_select(
+                COLUMNS, select(*(_hot.c[c] for c in COLUMNS)).where(_hot.c.id.in_(ids))
+            ))
+            # Core DELETE: the rows are past and finished, so there is no
+            # availability or weekly-limit state to release, only the calendars
+            # that listed them
+            await db.execute(delete(_hot).where(_hot.c.id.in_(ids)))
+            await db.run_sync(lambda session: bump_calendar_versions(session.connection(), {r.dentist_id for r in rows}))
+            await db.commit()
+        moved += len(ids)
+
+
+def main():
+    from app.db.session import AsyncSessionLocal, engine
+
+    parser = argparse.ArgumentParser(description="Move finished appointments to appointments_archive")
+    parser.add_argument("--before", type=date.fromisoformat, default=None,
+                        help=f"archive appointments dated before this day (default: {ARCHIVE_AFTER_DAYS} days ago)")
+    parser.add_argument("--batch-size", type=int, default=ARCHIVE_BATCH_SIZE)
+    args = parser.parse_args()
+
+    async def run():
+        moved = await archive_appointments(AsyncSessionLocal, args.before, args.batch_size)
+        await engine.dispose()
+        print(f"archived {moved} appointments")
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
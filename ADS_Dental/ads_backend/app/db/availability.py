@@ -0,0 +1,200 @@
+# app/db/availability.py
+# Dentist availability as one bitmap per (dentist, day): bit i is set when slot
+# i of the working day is booked. Bitmaps for a window are built from a single
+# range query over uq_dentist_slot, then kept current by ORM listeners that
+# apply every committed booking, reschedule, cancellation and delete, so the
+# availability screen rarely needs the database at all.
+from collections import Counter
+from datetime import date, datetime, time, timedelta
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import event, inspect, select
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, object_session
+
+from app.core.cache import TTLCache
+from app.core.config import (
+    APPOINTMENT_SLOT_MINUTES, WORKING_DAY_START, WORKING_DAY_END, WORKING_WEEKDAYS,
+    AVAILABILITY_CACHE_TTL_SECONDS, AVAILABILITY_CACHE_MAX_ENTRIES,
+)
+from app.db.models import Appointment, AppointmentStatus, Patient
+from app.db.routing import read_from_primary
+
+
+def _minutes(t: time) -> int:
+    return t.hour * 60 + t.minute
+
+
+DAY_START = _minutes(time.fromisoformat(WORKING_DAY_START))
+SLOTS_PER_DAY = (_minutes(time.fromisoformat(WORKING_DAY_END)) - DAY_START) // APPOINTMENT_SLOT_MINUTES
+SLOT_TIMES = tuple(
+    time(*divmod(DAY_START + i * APPOINTMENT_SLOT_MINUTES, 60)) for i in range(SLOTS_PER_DAY)
+)
+
+availability_cache = TTLCache(AVAILABILITY_CACHE_MAX_ENTRIES, AVAILABILITY_CACHE_TTL_SECONDS)
+
+# Bumped per dentist by every committed change, so a load that raced with a
+# booking's commit (whose update skipped the not yet cached day) is not stored
+_generations: Counter = Counter()
+
+
+def slot_index(at: time) -> Optional[int]:
+    """Index of the slot containing ``at``, or None outside working hours."""
+    offset = _minutes(at) - DAY_START
+    if offset < 0 or offset >= SLOTS_PER_DAY * APPOINTMENT_SLOT_MINUTES:
+        return None
+    return offset // APPOINTMENT_SLOT_MINUTES
+
+
+def working_days(start: date, end: date) -> List[date]:
+    return [
+        start + timedelta(days=i)
+        for i in range((end - start).days + 1)
+        if (start + timedelta(days=i)).weekday() in WORKING_WEEKDAYS
+    ]
+
+
+@lru_cache(maxsize=4096)
+def free_slots(bitmap: int) -> Tuple[time, ...]:
+    return tuple(t for i, t in enumerate(SLOT_TIMES) if not bitmap >> i & 1)
+
+
+async def booked_bitmaps(
+    db: AsyncSession, dentist_ids: Iterable[int], start: date, end: date
+) -> Dict[int, Dict[date, int]]:
+    """
+    Booked-slot bitmaps for each dentist and working day in [start, end]. Days
+    missing from the cache are loaded for all dentists in one range query.
+    """
+    dentist_ids = list(dentist_ids)
+    days = working_days(start, end)
+    bitmaps: Dict[int, Dict[date, int]] = {dentist_id: {} for dentist_id in dentist_ids}
+    missing_dentists, missing_days = set(), set()
+    for dentist_id in dentist_ids:
+        for day in days:
+            bitmap = availability_cache.get((dentist_id, day))
+            if bitmap is None:
+                missing_dentists.add(dentist_id)
+                missing_days.add(day)
+            else:
+                bitmaps[dentist_id][day] = bitmap
+
+    if missing_dentists:
+        first, last = min(missing_days), max(missing_days)
+        loaded = {(d, day): 0 for d in missing_dentists for day in days if first <= day <= last}
+        generations = {d: _generations[d] for d in missing_dentists}
+        read_from_primary(db)  # the bitmaps are cached
+        rows = await db.execute(
+            select(Appointment.dentist_id, Appointment.appointment_date, Appointment.appointment_time)
+            .where(
+                Appointment.dentist_id.in_(missing_dentists),
+                Appointment.appointment_date.between(first, last),
+                Appointment.status != AppointmentStatus.CANCELLED,
+            )
+        )
+        for dentist_id, day, at in rows:
+            index = slot_index(at)
+            if (dentist_id, day) in loaded and index is not None:
+                loaded[(dentist_id, day)] |= 1 << index
+        for (dentist_id, day), bitmap in loaded.items():
+            if _generations[dentist_id] == generations[dentist_id]:
+                availability_cache.set((dentist_id, day), bitmap)
+            bitmaps[dentist_id][day] = bitmap
+    return bitmaps
+
+
+# --- Incremental maintenance ---
+# Flushed changes are queued on the session and applied only once it commits.
+# Only cached days are touched. Appointments removed by a database cascade
+# (deleting a patient or its user) are not seen row by row: the bitmaps of the
+# dentists they were booked with are dropped instead.
+def queue_change(session: Session, booked: bool, dentist_id: int, day, at: time, status=None) -> None:
+    """
+    Queue a booking change for ``session``'s next commit. The listeners below
+    cover ORM writes; Core inserts/updates of appointments must call this.
+    """
+    if status == AppointmentStatus.CANCELLED or status == AppointmentStatus.CANCELLED.value:
+        return
+    if isinstance(day, datetime):
+        day = day.date()
+    session.info.setdefault("availability_changes", []).append((booked, dentist_id, day, at))
+
+
+def queue_patient_removal(session: Session, connection: Connection, patient_ids: Iterable[int]) -> None:
+    """
+    Drop, at ``session``'s next commit, the bitmaps of every dentist the
+    patients are booked with. Call before deleting patients outside their ORM
+    listeners (e.g. by cascade from their user).
+    """
+    patient_ids = list(patient_ids)
+    if not patient_ids:
+        return
+    dentist_ids = connection.execute(
+        select(Appointment.dentist_id)
+        .where(Appointment.patient_id.in_(patient_ids), Appointment.status != AppointmentStatus.CANCELLED)
+        .distinct()
+    ).scalars()
+    session.info.setdefault("availability_reloads", set()).update(dentist_ids)
+
+
+def _queue(target: Appointment, booked: bool, dentist_id, day, at, status) -> None:
+    session = object_session(target)
+    if session is not None:
+        queue_change(session, booked, dentist_id, day, at, status)
+
+
+def _old(state, attr: str):
+    history = state.attrs[attr].history
+    return history.deleted[0] if history.deleted else getattr(state.object, attr)
+
+
+@event.listens_for(Appointment, "after_insert")
+def _appointment_inserted(mapper, connection, target):
+    _queue(target, True, target.dentist_id, target.appointment_date, target.appointment_time, target.status)
+
+
+@event.listens_for(Appointment, "after_update")
+def _appointment_updated(mapper, connection, target):
+    state = inspect(target)
+    fields = ("dentist_id", "appointment_date", "appointment_time", "status")
+    if not any(state.attrs[f].history.has_changes() for f in fields):
+        return
+    _queue(target, False, *(_old(state, f) for f in fields))
+    _queue(target, True, target.dentist_id, target.appointment_date, target.appointment_time, target.status)
+
+
+@event.listens_for(Appointment, "after_delete")
+def _appointment_deleted(mapper, connection, target):
+    _queue(target, False, target.dentist_id, target.appointment_date, target.appointment_time, target.status)
+
+
+@event.listens_for(Patient, "before_delete")
+def _patient_deleted(mapper, connection, target):
+    # Before the DELETE, while the cascaded appointments still exist
+    session = object_session(target)
+    if session is not None:
+        queue_patient_removal(session, connection, [target.id])
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_committed_changes(session):
+    dentist_ids = session.info.pop("availability_reloads", None)
+    if dentist_ids:
+        for dentist_id in dentist_ids:
+            _generations[dentist_id] += 1
+        availability_cache.discard_keys(lambda key: key[0] in dentist_ids)
+    for booked, dentist_id, day, at in session.info.pop("availability_changes", ()):
+        _generations[dentist_id] += 1
+        index = slot_index(at)
+        if index is None:
+            continue
+        bit = 1 << index
+        availability_cache.update((dentist_id, day), (lambda b: b | bit) if booked else (lambda b: b & ~bit))
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back_changes(session):
+    session.info.pop("availability_changes", None)
+    session.info.pop("availability_reloads", None)
@@ -0,0 +1,95 @@
+# app/db/calendar_versions.py
+# Per-dentist calendar versions. Every write that changes what a dentist's
+# calendar shows (an appointment booked, moved, cancelled or deleted, or a
+# booked patient renamed or deleted) bumps the version inside the writing
+# transaction, so a version-derived ETag can never outlive the data it covers.
+from typing import Iterable, Optional
+
+from sqlalchemy import event, inspect, insert, select, update
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models import Appointment, DentistCalendarVersion, Patient
+from app.db.routing import read_from_primary
+from app.db.upserts import insert_if_absent
+
+# Patient fields shown on a calendar entry
+PATIENT_FIELDS = ("patient_no", "first_name", "last_name")
+
+_versions = DentistCalendarVersion.__table__
+
+
+def _increment(where):
+    return update(_versions).where(where).values(version=_versions.c.version + 1)
+
+
+def _create(connection: Connection, dentist_id: int) -> None:
+    create = insert_if_absent(connection.dialect.name, _versions, dentist_id=dentist_id, version=0)
+    connection.execute(create if create is not None else insert(_versions).values(dentist_id=dentist_id, version=0))
+
+
+def bump_calendar_versions(connection: Connection, dentist_ids: Iterable[int]) -> None:
+    for dentist_id in set(dentist_ids):
+        if connection.execute(_increment(_versions.c.dentist_id == dentist_id)).rowcount:
+            continue
+        _create(connection, dentist_id)
+        connection.execute(_increment(_versions.c.dentist_id == dentist_id))
+
+
+async def calendar_version(db: AsyncSession, dentist_id: int) -> Optional[int]:
+    return (await db.execute(
+        select(_versions.c.version).where(_versions.c.dentist_id == dentist_id)
+    )).scalar_one_or_none()
+
+
+async def ensure_calendar_version(db: AsyncSession, dentist_id: int) -> int:
+    """Version for ``dentist_id``, creating its row (version 0) on first use."""
+    # The row is created on the primary; a lagging replica would not have it yet
+    read_from_primary(db)
+    version = await calendar_version(db, dentist_id)
+    if version is None:
+        await db.run_sync(lambda session: _create(session.connection(), dentist_id))
+        await db.commit()
+        version = await calendar_version(db, dentist_id)
+    return version
+
+
+def bump_patient_calendars(connection: Connection, patient_ids: Iterable[int]) -> None:
+    """
+    Bump the calendars the patients are booked on. Deleting patients outside
+    their ORM listeners (e.g. by cascade from their user) must call this first.
+    """
+    patient_ids = list(patient_ids)
+    if not patient_ids:
+        return
+    booked_dentists = select(Appointment.dentist_id).where(Appointment.patient_id.in_(patient_ids)).distinct()
+    connection.execute(_increment(_versions.c.dentist_id.in_(booked_dentists)))
+
+
+@event.listens_for(Appointment, "after_insert")
+def _appointment_inserted(mapper, connection, target):
+    bump_calendar_versions(connection, [target.dentist_id])
+
+
+@event.listens_for(Appointment, "after_update")
+def _appointment_updated(mapper, connection, target):
+    history = inspect(target).attrs.dentist_id.history
+    bump_calendar_versions(connection, [target.dentist_id, *history.deleted])
+
+
+@event.listens_for(Appointment, "after_delete")
+def _appointment_deleted(mapper, connection, target):
+    bump_calendar_versions(connection, [target.dentist_id])
+
+
+@event.listens_for(Patient, "after_update")
+def _patient_updated(mapper, connection, target):
+    state = inspect(target)
+    if any(state.attrs[f].history.has_changes() for f in PATIENT_FIELDS):
+        bump_patient_calendars(connection, [target.id])
+
+
+@event.listens_for(Patient, "before_delete")
+def _patient_deleted(mapper, connection, target):
+    # Before the DELETE, while the cascaded appointments still exist
+    bump_patient_calendars(connection, [target.id])
@@ -0,0 +1,145 @@
+# app/db/fieldsets.py
+# Sparse fieldsets for appointments (?fields= / ?include=). The request picks
+# attributes per object; the projection then selects only those columns and
+# joins only the tables behind them, and the surgery dentists' IN query runs
+# only when they were asked for. Rows become plain dicts shaped like a pruned
+# AppointmentDTO.
+#
+#   fields   attributes, dotted for related objects: id,appointment_date,patient.last_name
+#   include  related objects to embed whole: patient,surgery,surgery.dentists
+#
+# A related object is embedded when it is included or any of its attributes
+# is named; with no attributes named it carries all of them. Nested objects
+# (addresses, surgery dentists) appear only when named. "id" is always kept.
+# Without either parameter the endpoints return the full AppointmentDTO.
+from collections import defaultdict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models import Appointment, Dentist, Patient, Surgery
+from app.db.projections import (
+    ADDRESS_FIELDS, DENTIST_FIELDS, PATIENT_FIELDS, SURGERY_FIELDS,
+    PatientAddress, SurgeryAddress, as_datetime, labelled, dentists_by_surgery,
+)
+from app.exceptions.http_exceptions import BadRequestException
+from app.schemas.appointment_dto import AppointmentStatus
+
+APPOINTMENT_FIELDS = ("id", "appointment_date", "appointment_time", "status")
+
+# Object path -> its attributes, in AppointmentDTO order (parents before children)
+OBJECTS: Dict[str, Tuple[str, ...]] = {
+    "": APPOINTMENT_FIELDS,
+    "patient": PATIENT_FIELDS,
+    "patient.address": ADDRESS_FIELDS,
+    "dentist": DENTIST_FIELDS,
+    "surgery": SURGERY_FIELDS,
+    "surgery.address": ADDRESS_FIELDS,
+    "surgery.dentists": DENTIST_FIELDS,
+}
+
+# Column label prefix of each object in the projection (as in appointment_projection)
+PREFIXES = {"patient": "patient", "patient.address": "address", "dentist": "dentist",
+            "surgery": "surgery", "surgery.address": "surgery_address"}
+
+# Fieldset: object path -> attributes to return; only embedded objects are keys
+Fieldset = Dict[str, Tuple[str, ...]]
+
+
+def _names(value: Optional[str]) -> List[str]:
+    return [n.strip() for n in (value or "").split(",") if n.strip()]
+
+
+def parse_fieldset(fields: Optional[str], include: Optional[str]) -> Optional[Fieldset]:
+    """The requested fieldset, or None for the full DTO."""
+    if not _names(fields) and not _names(include):
+        return None
+    embedded = {""}
+    named: Dict[str, set] = defaultdict(set)
+    for name in _names(include):
+        if name not in OBJECTS:
+            raise BadRequestException(f"Unknown include '{name}', expected one of: {', '.join(p for p in OBJECTS if p)}")
+        embedded.add(name)
+    for name in _names(fields):
+        if name in OBJECTS:
+            embedded.add(name)
+            continue
+        path, _, attribute = name.rpartition(".")
+        if path not in OBJECTS or attribute not in OBJECTS[path]:
+            raise BadRequestException(f"Unknown field '{name}'")
+        embedded.add(path)
+        named[path].add(attribute)
+    for path in list(embedded):
+        while path:  # an embedded object needs its parent
+            path = path.rpartition(".")[0]
+            embedded.add(path)
+    return {
+        path: tuple(a for a in attributes if a == "id" or not named[path] or a in named[path])
+        for path, attributes in OBJECTS.items()
+        if path in embedded
+    }
+
+
+def sparse_appointment_projection(fieldset: Fieldset, source=Appointment):
+    """Only the fieldset's columns and joins (plus the keyset order columns)."""
+    columns = [source.id, source.appointment_date, source.appointment_time]
+    if "status" in fieldset[""]:
+        columns.append(source.status)
+    for path, entity in (("patient", Patient), ("patient.address", PatientAddress), ("dentist", Dentist),
+                         ("surgery", Surgery), ("surgery.address", SurgeryAddress)):
+        if path in fieldset:
+            columns += labelled(entity, fieldset[path], PREFIXES[path])
+    if "surgery.dentists" in fieldset:
+        columns.append(source.surgery_id.label("dentists_surgery_id"))
+
+    stmt = select(*columns).select_from(source)
+    if "patient" in fieldset:
+        stmt = stmt.join(Patient, source.patient_id == Patient.id)
+    if "patient.address" in fieldset:
+        stmt = stmt.outerjoin(PatientAddress, Patient.address_id == PatientAddress.id)
+    if "dentist" in fieldset:
+        stmt = stmt.join(Dentist, source.dentist_id == Dentist.id)
+    if "surgery" in fieldset:
+        stmt = stmt.join(Surgery, source.surgery_id == Surgery.id)
+    if "surgery.address" in fieldset:
+        stmt = stmt.outerjoin(SurgeryAddress, Surgery.address_id == SurgeryAddress.id)
+    return stmt
+
+
+def _object(row: Row, fieldset: Fieldset, path: str) -> Optional[dict]:
+    prefix = PREFIXES[path]
+    if path.endswith(".address") and getattr(row, f"{prefix}_id") is None:
+        return None
+    return {a: getattr(row, f"{prefix}_{a}") for a in fieldset[path]}
+
+
+def _row_to_dict(row: Row, fieldset: Fieldset, surgery_dentists) -> dict:
+    item = {}
+    for attribute in fieldset[""]:
+        value = getattr(row, attribute)
+        if attribute == "appointment_date":
+            value = as_datetime(value)
+        elif attribute == "status":
+            value = AppointmentStatus(value)
+        item[attribute] = value
+    for path in ("patient", "dentist", "surgery"):
+        if path not in fieldset:
+            continue
+        obj = item[path] = _object(row, fieldset, path)
+        if f"{path}.address" in fieldset:
+            obj["address"] = _object(row, fieldset, f"{path}.address")
+    if "surgery.dentists" in fieldset:
+        attributes = fieldset["surgery.dentists"]
+        item["surgery"]["dentists"] = [
+            {a: getattr(d, a) for a in attributes} for d in surgery_dentists.get(row.dentists_surgery_id, [])
+        ]
+    return item
+
+
+async def rows_to_sparse_appointments(db: AsyncSession, rows: Sequence[Row], fieldset: Fieldset) -> List[dict]:
+    surgery_dentists = {}
+    if "surgery.dentists" in fieldset:
+        surgery_dentists = await dentists_by_surgery(db, (r.dentists_surgery_id for r in rows))
+    return [_row_to_dict(r, fieldset, surgery_dentists) for r in rows]
@@ -0,0 +1,45 @@
+# app/db/load_plans.py
+# Named eager-loading plans. Models default to lazy="raise_on_sql", so each
+# service picks the plan matching the DTO it returns and nothing more is loaded.
+from typing import Dict, Tuple
+from sqlalchemy.orm import joinedload, selectinload
+from sqlalchemy.orm.interfaces import LoaderOption
+
+from app.db.models import Surgery, Patient, Appointment, User
+
+LOAD_PLANS: Dict[str, Tuple[LoaderOption, ...]] = {
+    # PatientDTO: patient columns + address
+    "patient_summary": (
+        joinedload(Patient.address),
+    ),
+    # AddressDTO: address columns only
+    "address_summary": (),
+    # SurgeryDTO: surgery columns + address + dentists
+    "surgery_summary": (
+        joinedload(Surgery.address),
+        selectinload(Surgery.dentists),
+    ),
+    # DentistResponseDTO: dentist columns only
+    "dentist_summary": (),
+    # AppointmentDTO: patient (+address), dentist, surgery (+address, dentists)
+    "appointment_detail": (
+        joinedload(Appointment.patient).joinedload(Patient.address),
+        joinedload(Appointment.dentist),
+        joinedload(Appointment.surgery).options(
+            joinedload(Surgery.address),
+            selectinload(Surgery.dentists),
+        ),
+    ),
+    # UserDTO / login: user columns + roles
+    "user_with_roles": (
+        selectinload(User.roles),
+    ),
+}
+
+
+def load_plan(name: str) -> Tuple[LoaderOption, ...]:
+    """Return the loader options registered under ``name``."""
+    try:
+        return LOAD_PLANS[name]
+    except KeyError:
+        raise KeyError(f"Unknown load plan: {name}") from None
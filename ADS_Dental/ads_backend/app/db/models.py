@@ -2,13 +2,18 @@
 # app/db/models.py
 from enum import Enum as PyEnum
 from sqlalchemy import (
-    Column, Integer, String, Boolean, Date, Time, DateTime,
-    ForeignKey, Table, UniqueConstraint, Enum, func
+    Column, Integer, BigInteger, String, Boolean, Date, Time, DateTime,
+    ForeignKey, Table, UniqueConstraint, Index, Enum, Text, func
 )
+from sqlalchemy.dialects import mysql
 from sqlalchemy.orm import relationship, declarative_base
 
 Base = declarative_base()
 
+# Relationships never load implicitly: every query states what it needs through
+# a named plan in app/db/load_plans.py, and anything else raises instead of
+# silently cascading into N extra SELECTs.
+
 # --- Many-to-many: User ↔ Role
 user_roles = Table(
     "user_roles",
@@ -27,8 +32,8 @@ class Address(Base):
     state = Column(String(30), nullable=False)
     zip_code = Column(String(15), nullable=False)
 
-    patients = relationship("Patient", back_populates="address", lazy="selectin")
-    surgeries = relationship("Surgery", back_populates="address", lazy="selectin")
+    patients = relationship("Patient", back_populates="address", lazy="raise_on_sql", passive_deletes=True)
+    surgeries = relationship("Surgery", back_populates="address", lazy="raise_on_sql", passive_deletes=True)
 
     def __repr__(self):
         return f"<Address(id={self.id}, street='{self.street}', city='{self.city}')>"
@@ -44,9 +49,9 @@ class Surgery(Base):
     phone = Column(String(30))
     address_id = Column(Integer, ForeignKey("addresses.id", ondelete="RESTRICT"), unique=True)
 
-    address = relationship("Address", back_populates="surgeries", lazy="selectin")
-    dentists = relationship("Dentist", back_populates="surgery", lazy="selectin")
-    appointments = relationship("Appointment", back_populates="surgery", lazy="selectin")
+    address = relationship("Address", back_populates="surgeries", lazy="raise_on_sql")
+    dentists = relationship("Dentist", back_populates="surgery", lazy="raise_on_sql", passive_deletes=True)
+    appointments = relationship("Appointment", back_populates="surgery", lazy="raise_on_sql", passive_deletes=True)
 
     def __repr__(self):
         return f"<Surgery(id={self.id}, surgery_no='{self.surgery_no}', name='{self.name}')>"
@@ -65,14 +70,39 @@ class Patient(Base):
     email = Column(String(120))
     address_id = Column(Integer, ForeignKey("addresses.id", ondelete="SET NULL"))
 
-    address = relationship("Address", back_populates="patients", lazy="selectin")
-    appointments = relationship("Appointment", back_populates="patient", lazy="selectin")
-    user = relationship("User", back_populates="patient", lazy="selectin")
+    address = relationship("Address", back_populates="patients", lazy="raise_on_sql")
+    appointments = relationship("Appointment", back_populates="patient", lazy="raise_on_sql", passive_deletes=True)
+    user = relationship("User", back_populates="patient", lazy="raise_on_sql")
 
     def __repr__(self):
         return f"<Patient(id={self.id}, patient_no='{self.patient_no}', name='{self.first_name} {self.last_name}')>"
 
 
+# --- Patient search index ---
+# One row per indexed suffix of a normalized patient field, so exact, prefix
+# and substring lookups are all prefix range scans on ix_patient_search_terms_term.
+# Terms compare by code point (binary collation on MySQL, SQLite's default), so
+# the range bounds built in app/db/search_index.py hold for every character.
+# Maintained by the listeners in app/db/search_index.py.
+class PatientSearchTerm(Base):
+    __tablename__ = "patient_search_terms"
+
+    patient_id = Column(Integer, ForeignKey("patients.id", ondelete="CASCADE"), primary_key=True)
+    field = Column(String(12), primary_key=True)
+    position = Column(Integer, primary_key=True)
+    term = Column(
+        String(120).with_variant(mysql.VARCHAR(120, collation="utf8mb4_bin"), "mysql", "mariadb"),
+        nullable=False,
+    )
+
+    __table_args__ = (
+        Index("ix_patient_search_terms_term", "term"),
+    )
+
+    def __repr__(self):
+        return f"<PatientSearchTerm(patient_id={self.patient_id}, field='{self.field}', term='{self.term}')>"
+
+
 # --- Dentist ---
 class Dentist(Base):
     __tablename__ = "dentists"
@@ -86,9 +116,9 @@ class Dentist(Base):
     specialization = Column(String(80))
     surgery_id = Column(Integer, ForeignKey("surgeries.id", ondelete="SET NULL"))
 
-    surgery = relationship("Surgery", back_populates="dentists", lazy="selectin")
-    appointments = relationship("Appointment", back_populates="dentist", lazy="selectin")
-    user = relationship("User", back_populates="dentist", lazy="selectin")
+    surgery = relationship("Surgery", back_populates="dentists", lazy="raise_on_sql")
+    appointments = relationship("Appointment", back_populates="dentist", lazy="raise_on_sql", passive_deletes=True)
+    user = relationship("User", back_populates="dentist", lazy="raise_on_sql")
 
     def __repr__(self):
         return f"<Dentist(id={self.id}, name='{self.first_name} {self.last_name}')>"
@@ -113,9 +143,9 @@ class Appointment(Base):
     dentist_id = Column(Integer, ForeignKey("dentists.id", ondelete="CASCADE"), nullable=False)
     surgery_id = Column(Integer, ForeignKey("surgeries.id", ondelete="CASCADE"), nullable=False)
 
-    patient = relationship("Patient", back_populates="appointments", lazy="selectin")
-    dentist = relationship("Dentist", back_populates="appointments", lazy="selectin")
-    surgery = relationship("Surgery", back_populates="appointments", lazy="selectin")
+    patient = relationship("Patient", back_populates="appointments", lazy="raise_on_sql")
+    dentist = relationship("Dentist", back_populates="appointments", lazy="raise_on_sql")
+    surgery = relationship("Surgery", back_populates="appointments", lazy="raise_on_sql")
 
     __table_args__ = (
         UniqueConstraint("dentist_id", "appointment_date", "appointment_time", name="uq_dentist_slot"),
@@ -125,6 +155,92 @@ class Appointment(Base):
         return f"<Appointment(id={self.id}, date={self.appointment_date}, time={self.appointment_time}, status={self.status})>"
 
 
+# Cold store for finished history: COMPLETED and CANCELLED appointments older
+# than the archive horizon are moved here (same ids) by app/db/archival.py, so
+# the hot appointments table and its indexes only hold recent and future rows.
+class AppointmentArchive(Base):
+    __tablename__ = "appointments_archive"
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    appointment_date = Column(Date, nullable=False)
+    appointment_time = Column(Time, nullable=False)
+    status = Column(Enum(AppointmentStatus), nullable=False)
+
+    patient_id = Column(Integer, ForeignKey("patients.id", ondelete="CASCADE"), nullable=False)
+    dentist_id = Column(Integer, ForeignKey("dentists.id", ondelete="CASCADE"), nullable=False)
+    surgery_id = Column(Integer, ForeignKey("surgeries.id", ondelete="CASCADE"), nullable=False)
+    archived_at = Column(DateTime, nullable=False, server_default=func.now())
+
+    __table_args__ = (
+        Index("ix_appointments_archive_dentist", "dentist_id", "appointment_date", "appointment_time"),
+        Index("ix_appointments_archive_patient", "patient_id", "appointment_date", "appointment_time"),
+    )
+
+    def __repr__(self):
+        return f"<AppointmentArchive(id={self.id}, date={self.appointment_date}, time={self.appointment_time}, status={self.status})>"
+
+
+# Live (non-cancelled) appointments per dentist per Monday-starting week, so the
+# weekly limit is one conditional UPDATE instead of a COUNT over appointments.
+# Maintained by app/db/weekly_bookings.py.
+class DentistWeeklyBookings(Base):
+    __tablename__ = "dentist_weekly_bookings"
+
+    dentist_id = Column(Integer, ForeignKey("dentists.id", ondelete="CASCADE"), primary_key=True)
+    week_start = Column(Date, primary_key=True)
+    booked = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<DentistWeeklyBookings(dentist_id={self.dentist_id}, week_start={self.week_start}, booked={self.booked})>"
+
+
+# Bumped in the same transaction as any change to a dentist's calendar, so an
+# unchanged calendar can be revalidated (ETag / 304) with a single-row read.
+# Maintained by app/db/calendar_versions.py.
+class DentistCalendarVersion(Base):
+    __tablename__ = "dentist_calendar_versions"
+
+    dentist_id = Column(Integer, ForeignKey("dentists.id", ondelete="CASCADE"), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<DentistCalendarVersion(dentist_id={self.dentist_id}, version={self.version})>"
+
+
+# Transactional outbox: messages are written in the same transaction as the
+# change they announce and delivered later by app/core/outbox_worker.py.
+class OutboxMessage(Base):
+    __tablename__ = "outbox_messages"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    kind = Column(String(40), nullable=False)
+    payload = Column(Text, nullable=False)  # JSON
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(DateTime, nullable=False)  # naive UTC
+    sent_at = Column(DateTime, nullable=True)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime, nullable=False, server_default=func.now())
+
+    __table_args__ = (
+        Index("ix_outbox_messages_pending", "sent_at", "next_attempt_at"),
+    )
+
+    def __repr__(self):
+        return f"<OutboxMessage(id={self.id}, kind='{self.kind}', attempts={self.attempts}, sent_at={self.sent_at})>"
+
+
+# Named counters handed out in blocks (hi/lo) by app/db/number_blocks.py:
+# next_value is the first number no process has claimed yet.
+class NumberSequence(Base):
+    __tablename__ = "number_sequences"
+
+    name = Column(String(40), primary_key=True)
+    next_value = Column(BigInteger, nullable=False)
+
+    def __repr__(self):
+        return f"<NumberSequence(name='{self.name}', next_value={self.next_value})>"
+
+
 # --- Security Models ---
 class RoleEnum(str, PyEnum):
     ADMIN = "ADMIN"
@@ -143,9 +259,9 @@ class User(Base):
     created_at = Column(DateTime, nullable=False, server_default=func.now())
     updated_at = Column(DateTime, nullable=False, server_default=func.now(), onupdate=func.now())
 
-    roles = relationship("Role", secondary=user_roles, back_populates="users", lazy="selectin")
-    patient = relationship("Patient", back_populates="user", lazy="selectin")
-    dentist = relationship("Dentist", back_populates="user", lazy="selectin")
+    roles = relationship("Role", secondary=user_roles, back_populates="users", lazy="raise_on_sql", passive_deletes=True)
+    patient = relationship("Patient", back_populates="user", lazy="raise_on_sql", passive_deletes=True)
+    dentist = relationship("Dentist", back_populates="user", lazy="raise_on_sql", passive_deletes=True)
 
     def __repr__(self):
         return f"<User(id={self.id}, username='{self.username}', email='{self.email}', enabled={self.enabled})>"
@@ -159,12 +275,20 @@ class Role(Base):
     created_at = Column(DateTime, nullable=False, server_default=func.now())
     updated_at = Column(DateTime, nullable=False, server_default=func.now(), onupdate=func.now())
 
-    users = relationship("User", secondary=user_roles, back_populates="roles", lazy="selectin")
+    users = relationship("User", secondary=user_roles, back_populates="roles", lazy="raise_on_sql", passive_deletes=True)
 
     def __repr__(self):
         return f"<Role(id={self.id}, name='{self.name}')>"
 
 __all__ = [
-    "Base", "Address", "Surgery", "Patient", "Dentist", "Appointment", "AppointmentStatus",
+    "Base", "Address", "Surgery", "Patient", "PatientSearchTerm", "Dentist", "Appointment", "AppointmentStatus",
+    "AppointmentArchive", "DentistWeeklyBookings", "DentistCalendarVersion", "OutboxMessage", "NumberSequence",
     "User", "Role", "RoleEnum", "user_roles",
-]
\ No newline at end of file
+]
+
+# Registers the Patient listeners that keep patient_search_terms in sync
+import app.db.search_index  # noqa: E402,F401
+# Registers the Appointment listeners that keep availability bitmaps current
+import app.db.availability  # noqa: E402,F401
+# Registers the Appointment and Patient listeners that bump calendar versions
+import app.db.calendar_versions  # noqa: E402,F401
@@ -0,0 +1,60 @@
+# app/db/number_blocks.py
+# Collision-free business numbers (hi/lo). Each process reserves a block of
+# numbers with one atomic UPDATE on number_sequences, in its own short
+# transaction, then hands them out from memory. Blocks never overlap, so
+# numbers are unique across processes without touching the database per
+# number; unused parts of a block (on restart) only leave gaps.
+from sqlalchemy import insert, select, update
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.config import PATIENT_NO_BLOCK_SIZE
+from app.db.models import NumberSequence
+from app.db.upserts import insert_if_absent
+
+_sequences = NumberSequence.__table__
+
+
+class NumberAllocator:
+    def __init__(self, name: str, block_size: int, template: str):
+        self.name = name
+        self.block_size = block_size
+        self.template = template
+        self._next = 0
+        self._end = 0
+
+    async def _reserve(self, engine: AsyncEngine) -> int:
+        """Claim the next block; returns its first number."""
+        claim = (
+            update(_sequences)
+            .where(_sequences.c.name == self.name)
+            .values(next_value=_sequences.c.next_value + self.block_size)
+        )
+        async with engine.begin() as conn:
+            if not (await conn.execute(claim)).rowcount:
+                create = insert_if_absent(conn.dialect.name, _sequences, name=self.name, next_value=1)
+                await conn.execute(create if create is not None else insert(_sequences).values(name=self.name, next_value=1))
+                await conn.execute(claim)
+            # Read back inside the same transaction, which still holds the row lock
+            end = (await conn.execute(select(_sequences.c.next_value).where(_sequences.c.name == self.name))).scalar_one()
+        return end - self.block_size
+
+    async def next_value(self, engine: AsyncEngine) -> int:
+        if self._next >= self._end:
+            # Two coroutines may both refill; the later block wins and the
+            # rest of the earlier one is skipped, which is safe
+            start = await self._reserve(engine)
+            self._next, self._end = start, start + self.block_size
+        value = self._next
+        self._next += 1
+        return value
+
+    async def allocate(self, engine: AsyncEngine) -> str:
+        return self.template.format(await self.next_value(engine))
+
+    def reset(self) -> None:
+        """Forget the current block, e.g. when switching databases."""
+        self._next = self._end = 0
+
+
+# P + 10 digits: distinct from the legacy P{yyyymmdd}{nnn} numbers by length
+patient_numbers = NumberAllocator("patient_no", PATIENT_NO_BLOCK_SIZE, "P{:010d}")
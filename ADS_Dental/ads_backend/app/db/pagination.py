@@ -0,0 +1,94 @@
+# app/db/pagination.py
+# Keyset (cursor) pagination. Every list is ordered by a tuple of columns ending
+# in the primary key, and the cursor encodes the last row's tuple, so fetching
+# page N is a single index range scan instead of an OFFSET walk.
+import base64
+import json
+from datetime import date, datetime, time
+from typing import Any, List, Optional, Sequence, Tuple
+
+from sqlalchemy import and_, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.exceptions.http_exceptions import BadRequestException
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+
+def _to_json(value: Any) -> Any:
+    if isinstance(value, (date, datetime, time)):
+        return value.isoformat()
+    if hasattr(value, "value"):  # Enum
+        return value.value
+    return value
+
+
+def _from_json(column: ColumnElement, value: Any) -> Any:
+    if value is None:
+        return None
+    python_type = column.type.python_type
+    if python_type in (date, datetime, time):
+        return python_type.fromisoformat(value)
+    return python_type(value)
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    raw = json.dumps([_to_json(v) for v in values], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, columns: Sequence[ColumnElement]) -> List[Any]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if not isinstance(values, list) or len(values) != len(columns):
+            raise ValueError("cursor shape mismatch")
+        return [_from_json(c, v) for c, v in zip(columns, values)]
+    except (ValueError, TypeError, UnicodeError):
+        raise BadRequestException("Invalid pagination cursor")
+
+
+def _after(columns: Sequence[ColumnElement], values: Sequence[Any]):
+    # (c1, c2, ..., id) > (v1, v2, ..., vid), expanded so every backend can
+    # turn the leading equality terms into an index range.
+    clauses = []
+    for i, column in enumerate(columns):
+        equal_prefix = [columns[j] == values[j] for j in range(i)]
+        clauses.append(and_(*equal_prefix, column > values[i]))
+    return or_(*clauses)
+
+
+async def paginate(
+    db: AsyncSession,
+    stmt: Select,
+    order_by: Sequence[ColumnElement],
+    limit: int = DEFAULT_PAGE_SIZE,
+    after: Optional[str] = None,
+    row_keys: Optional[Sequence[str]] = None,
+) -> Tuple[list, Optional[str]]:
+    """
+    Run ``stmt`` ordered by ``order_by`` (which must end with a unique column)
+    and return one page plus the cursor for the next page.
+
+    Pages hold ORM entities, or plain rows when ``row_keys`` names the result
+    labels carrying the ``order_by`` values (for column projections).
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    if after:
+        stmt = stmt.where(_after(order_by, decode_cursor(after, order_by)))
+    stmt = stmt.order_by(*[c.asc() for c in order_by]).limit(limit + 1)
+    result = await db.execute(stmt)
+    rows = result.all() if row_keys else result.scalars().unique().all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        if row_keys:
+            next_cursor = encode_cursor([last._mapping[k] for k in row_keys])
+        else:
+            next_cursor = encode_cursor([getattr(last, c.key) for c in order_by])
+    return list(rows), next_cursor
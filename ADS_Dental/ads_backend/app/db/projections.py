@@ -0,0 +1,214 @@
+# app/db/projections.py
+# Column projections for the read endpoints. Each select names exactly the
+# columns its DTO needs (joining nested entities explicitly) and the row
+# mappers build DTOs straight from the result tuples, skipping ORM identity
+# map bookkeeping and relationship loading entirely.
+#
+# Rows come from typed, constrained columns, so DTOs are built with trusted()
+# (no validation); the few coercions validation used to make (Date ->
+# datetime, the models' enums -> the schemas') are done explicitly.
+from collections import defaultdict
+from datetime import date, datetime, time
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from sqlalchemy import or_, select
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from app.db.models import Address, Appointment, Dentist, Patient, Role, Surgery, User, user_roles
+from app.schemas.address_dto import AddressDTO
+from app.schemas.common import trusted
+from app.schemas.appointment_dto import (
+    AppointmentDTO, AppointmentIncludedDTO, AppointmentRefDTO, AppointmentStatus, IncludedSurgeryDTO,
+)
+from app.schemas.dentist_dto import DentistResponseDTO
+from app.schemas.patient_dto import PatientDTO
+from app.schemas.surgery_dto import SurgeryDTO
+from app.schemas.user_dto import RoleEnum, UserDTO
+
+PatientAddress = aliased(Address, name="patient_address")
+SurgeryAddress = aliased(Address, name="surgery_address")
+
+ADDRESS_FIELDS = ("id", "street", "city", "state", "zip_code")
+PATIENT_FIELDS = ("id", "patient_no", "first_name", "last_name", "phone", "email")
+DENTIST_FIELDS = ("id", "first_name", "last_name", "phone", "email", "specialization", "surgery_id", "user_id")
+SURGERY_FIELDS = ("id", "surgery_no", "name", "phone")
+
+
+def labelled(entity, fields: Sequence[str], prefix: str):
+    return [getattr(entity, f).label(f"{prefix}_{f}") for f in fields]
+
+
+def _address(row: Row, prefix: str) -> Optional[AddressDTO]:
+    if getattr(row, f"{prefix}_id") is None:
+        return None
+    return trusted(AddressDTO, **{f: getattr(row, f"{prefix}_{f}") for f in ADDRESS_FIELDS})
+
+
+# --- Patients ---
+def patient_projection():
+    return (
+        select(*labelled(Patient, PATIENT_FIELDS, "patient"), *labelled(PatientAddress, ADDRESS_FIELDS, "address"))
+        .select_from(Patient)
+        .outerjoin(PatientAddress, Patient.address_id == PatientAddress.id)
+    )
+
+
+def row_to_patient_dto(row: Row, prefix: str = "patient", address_prefix: str = "address") -> PatientDTO:
+    return trusted(
+        PatientDTO,
+        **{f: getattr(row, f"{prefix}_{f}") for f in PATIENT_FIELDS},
+        address=_address(row, address_prefix),
+    )
+
+
+# --- Users ---
+def user_projection():
+    # UserDTO carries a single role: the user's first role by id
+    first_role = (
+        select(Role.name)
+        .join(user_roles, user_roles.c.role_id == Role.id)
+        .where(user_roles.c.user_id == User.id)
+        .order_by(Role.id)
+        .limit(1)
+        .correlate(User)
+        .scalar_subquery()
+    )
+    return select(User.id, User.email, User.username, first_role.label("role_name"))
+
+
+def row_to_user_dto(row: Row) -> UserDTO:
+    role = RoleEnum(row.role_name) if row.role_name in RoleEnum.__members__ else None
+    return trusted(UserDTO, id=row.id, email=row.email, username=row.username, role=role)
+
+
+# --- Appointments ---
+def appointment_projection(source=Appointment):
+    """``source`` is Appointment (the hot set) or AppointmentArchive (history)."""
+    return (
+        select(
+            source.id,
+            source.appointment_date,
+            source.appointment_time,
+            source.status,
+            *labelled(Patient, PATIENT_FIELDS, "patient"),
+            *labelled(PatientAddress, ADDRESS_FIELDS, "address"),
+            *labelled(Dentist, DENTIST_FIELDS, "dentist"),
+            *labelled(Surgery, SURGERY_FIELDS, "surgery"),
+            *labelled(SurgeryAddress, ADDRESS_FIELDS, "surgery_address"),
+        )
+        .select_from(source)
+        .join(Patient, source.patient_id == Patient.id)
+        .outerjoin(PatientAddress, Patient.address_id == PatientAddress.id)
+        .join(Dentist, source.dentist_id == Dentist.id)
+        .join(Surgery, source.surgery_id == Surgery.id)
+        .outerjoin(SurgeryAddress, Surgery.address_id == SurgeryAddress.id)
+    )
+
+
+async def dentists_by_surgery(db: AsyncSession, surgery_ids: Iterable[int]) -> Dict[int, List[DentistResponseDTO]]:
+    """One IN query for the dentist lists embedded in each SurgeryDTO."""
+    surgery_ids = set(surgery_ids)
+    grouped: Dict[int, List[DentistResponseDTO]] = defaultdict(list)
+    if not surgery_ids:
+        return grouped
+    stmt = (
+        select(*(getattr(Dentist, f) for f in DENTIST_FIELDS))
+        .where(Dentist.surgery_id.in_(surgery_ids))
+        .order_by(Dentist.id)
+    )
+    for row in (await db.execute(stmt)).all():
+        grouped[row.surgery_id].append(trusted(DentistResponseDTO, **row._mapping))
+    return grouped
+
+
+def as_datetime(value: date) -> datetime:
+    # AppointmentDTO.appointment_date is a datetime; the column is a DATE
+    return value if isinstance(value, datetime) else datetime.combine(value, time())
+
+
+def row_to_appointment_dto(row: Row, surgery_dentists: Dict[int, List[DentistResponseDTO]]) -> AppointmentDTO:
+    return trusted(
+        AppointmentDTO,
+        id=row.id,
+        appointment_date=as_datetime(row.appointment_date),
+        appointment_time=row.appointment_time,
+        status=AppointmentStatus(row.status),
+        patient=row_to_patient_dto(row),
+        dentist=trusted(DentistResponseDTO, **{f: getattr(row, f"dentist_{f}") for f in DENTIST_FIELDS}),
+        surgery=trusted(
+            SurgeryDTO,
+            **{f: getattr(row, f"surgery_{f}") for f in SURGERY_FIELDS},
+            address=_address(row, "surgery_address"),
+            dentists=surgery_dentists.get(row.surgery_id, []),
+        ),
+    )
+
+
+async def rows_to_appointment_dtos(db: AsyncSession, rows: Sequence[Row]) -> List[AppointmentDTO]:
+    surgery_dentists = await dentists_by_surgery(db, (r.surgery_id for r in rows))
+    return [row_to_appointment_dto(r, surgery_dentists) for r in rows]
+
+
+# --- Compound (sideloaded) appointments ---
+def appointment_ref_projection(source=Appointment):
+    """Appointment columns and foreign keys only; related entities come from included_for()."""
+    return select(
+        source.id, source.appointment_date, source.appointment_time, source.status,
+        source.patient_id, source.dentist_id, source.surgery_id,
+    )
+
+
+def row_to_appointment_ref(row: Row) -> AppointmentRefDTO:
+    return trusted(
+        AppointmentRefDTO,
+        id=row.id,
+        appointment_date=as_datetime(row.appointment_date),
+        appointment_time=row.appointment_time,
+        status=AppointmentStatus(row.status),
+        patient_id=row.patient_id,
+        dentist_id=row.dentist_id,
+        surgery_id=row.surgery_id,
+    )
+
+
+async def included_for(db: AsyncSession, rows: Sequence[Row]) -> AppointmentIncludedDTO:
+    """Each patient, dentist and surgery the rows reference, once; one IN query per type."""
+    if not rows:
+        return trusted(AppointmentIncludedDTO, patients={}, dentists={}, surgeries={})
+    patient_ids = {r.patient_id for r in rows}
+    surgery_ids = {r.surgery_id for r in rows}
+    dentist_ids = {r.dentist_id for r in rows}
+
+    patient_rows = (await db.execute(patient_projection().where(Patient.id.in_(patient_ids)))).all()
+    surgery_rows = (await db.execute(
+        select(*labelled(Surgery, SURGERY_FIELDS, "surgery"), *labelled(SurgeryAddress, ADDRESS_FIELDS, "surgery_address"))
+        .select_from(Surgery)
+        .outerjoin(SurgeryAddress, Surgery.address_id == SurgeryAddress.id)
+        .where(Surgery.id.in_(surgery_ids))
+    )).all()
+    # The appointments' dentists and everyone working at the included surgeries
+    dentist_rows = (await db.execute(
+        select(*(getattr(Dentist, f) for f in DENTIST_FIELDS))
+        .where(or_(Dentist.id.in_(dentist_ids), Dentist.surgery_id.in_(surgery_ids)))
+        .order_by(Dentist.id)
+    )).all()
+
+    staff: Dict[int, List[int]] = defaultdict(list)
+    for d in dentist_rows:
+        staff[d.surgery_id].append(d.id)
+    return trusted(
+        AppointmentIncludedDTO,
+        patients={r.patient_id: row_to_patient_dto(r) for r in patient_rows},
+        dentists={d.id: trusted(DentistResponseDTO, **d._mapping) for d in dentist_rows},
+        surgeries={
+            r.surgery_id: trusted(
+                IncludedSurgeryDTO,
+                **{f: getattr(r, f"surgery_{f}") for f in SURGERY_FIELDS},
+                address=_address(r, "surgery_address"),
+                dentist_ids=staff.get(r.surgery_id, []),
+            )
+            for r in surgery_rows
+        },
+    )
@@ -0,0 +1,103 @@
+# app/db/reference_data.py
+# Small, rarely changing reference data kept in memory: surgery list pages,
+# each surgery's dentists (as ready-to-send JSON bodies with a strong ETag) and
+# the role name -> id map. A hit costs no query and no serialization.
+#
+# ORM writes to the source tables are queued on the session and invalidate the
+# affected group once it commits (as in availability.py); Core writes must call
+# queue_reference_change. The TTL bounds staleness from other workers' writes.
+import hashlib
+from collections import Counter
+from typing import Awaitable, Callable, Hashable, NamedTuple, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+
+from app.core.cache import TTLCache
+from app.core.config import REFERENCE_CACHE_MAX_ENTRIES, REFERENCE_CACHE_TTL_SECONDS
+from app.db.models import Address, Dentist, Role, Surgery, User
+
+# Groups: every cache key is a tuple starting with one of these
+SURGERIES = "surgeries"
+ROLES = "roles"
+
+reference_cache = TTLCache(REFERENCE_CACHE_MAX_ENTRIES, REFERENCE_CACHE_TTL_SECONDS)
+
+# Bumped on every invalidation, so a load that raced with a commit is not stored
+_generations: Counter = Counter()
+
+
+class CachedBody(NamedTuple):
+    etag: str
+    body: bytes
+
+
+def strong_etag(body: bytes) -> str:
+    return f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+
+async def cached_value(key: Tuple[Hashable, ...], load: Callable[[], Awaitable]):
+    value = reference_cache.get(key)
+    if value is None:
+        generation = _generations[key[0]]
+        value = await load()
+        if _generations[key[0]] == generation:
+            reference_cache.set(key, value)
+    return value
+
+
+async def cached_body(key: Tuple[Hashable, ...], load: Callable[[], Awaitable[bytes]]) -> CachedBody:
+    """JSON body for ``key`` with its ETag, from ``load()`` on a miss."""
+    async def build() -> CachedBody:
+        body = await load()
+        return CachedBody(strong_etag(body), body)
+
+    return await cached_value(key, build)
+
+
+def invalidate_reference_data(*groups: str) -> None:
+    for group in groups:
+        _generations[group] += 1
+    reference_cache.discard_keys(lambda key: key[0] in groups)
+
+
+# --- Invalidation ---
+def queue_reference_change(session: Session, group: str) -> None:
+    """
+    Invalidate ``group`` when ``session`` next commits. The listeners below
+    cover ORM writes; Core writes to the source tables must call this.
+    """
+    session.info.setdefault("reference_changes", set()).add(group)
+
+
+def _queue(group: str):
+    def listener(mapper, connection, target):
+        session = object_session(target)
+        if session is not None:
+            queue_reference_change(session, group)
+    return listener
+
+
+for _model, _events, _group in (
+    (Surgery, ("after_insert", "after_update", "after_delete"), SURGERIES),
+    (Dentist, ("after_insert", "after_update", "after_delete"), SURGERIES),
+    # A surgery's address is embedded in the list; new addresses belong to no surgery yet
+    (Address, ("after_update", "after_delete"), SURGERIES),
+    # Deleting a user cascades to their dentist row in the database
+    (User, ("after_delete",), SURGERIES),
+    (Role, ("after_insert", "after_update", "after_delete"), ROLES),
+):
+    for _event in _events:
+        event.listen(_model, _event, _queue(_group))
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_committed_changes(session):
+    groups = session.info.pop("reference_changes", None)
+    if groups:
+        invalidate_reference_data(*groups)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back_changes(session):
+    session.info.pop("reference_changes", None)
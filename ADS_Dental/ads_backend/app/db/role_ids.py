@@ -0,0 +1,37 @@
+# app/db/role_ids.py
+# Role name -> id, read once at startup and kept in the reference-data cache.
+# Roles are seeded reference data, so registrations link users to roles by
+# cached id instead of a SELECT per call; an unknown name triggers one reload
+# (e.g. a role added by another worker since the map was read).
+from typing import Dict, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models import Role
+from app.db.reference_data import ROLES, cached_value, reference_cache
+from app.db.routing import read_from_primary
+
+_KEY = (ROLES,)
+
+
+async def _read_role_ids(db: AsyncSession) -> Dict[str, int]:
+    read_from_primary(db)
+    rows = (await db.execute(select(Role.name, Role.id))).all()
+    return {name: role_id for name, role_id in rows}
+
+
+async def load_role_ids(db: AsyncSession) -> Dict[str, int]:
+    clear_role_ids()
+    return dict(await cached_value(_KEY, lambda: _read_role_ids(db)))
+
+
+async def role_id(db: AsyncSession, name: str) -> Optional[int]:
+    role_ids = await cached_value(_KEY, lambda: _read_role_ids(db))
+    if name not in role_ids:
+        role_ids = await load_role_ids(db)
+    return role_ids.get(name)
+
+
+def clear_role_ids() -> None:
+    reference_cache.pop(_KEY)
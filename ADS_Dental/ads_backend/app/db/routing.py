@@ -0,0 +1,199 @@
+# app/db/routing.py
+# Read-replica routing. Sessions are bound to the primary; a session opened for
+# a safe request (GET/HEAD) is additionally allowed to send its plain SELECTs
+# to a replica. Everything else goes to the primary: flushes, Core DML,
+# locking reads (FOR UPDATE), raw connections, every statement after the
+# session's first write, and every session not opened for a request
+# (background workers, CLI jobs).
+#
+# Read-your-writes: a request that writes marks its caller (the subject of its
+# bearer token) sticky for REPLICA_STICKY_SECONDS, during which that user reads
+# from the primary too, whichever token they use. Registration and login mark
+# the new user sticky. Stickiness is per process; the window should exceed the
+# usual replication lag.
+#
+# Loads that fill a process-wide or shared cache (principals, reference data,
+# cached responses, availability bitmaps) call read_from_primary first: a
+# replica row cached after the write's invalidation ran would outlive the lag.
+#
+# Replicas are probed every REPLICA_HEALTH_CHECK_SECONDS and a replica whose
+# connections fail is taken out of rotation at once; with no healthy replica,
+# reads fall back to the primary.
+import asyncio
+import itertools
+import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, List, Optional, Sequence
+
+from fastapi import Request
+from jose import JWTError
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+
+from app.core.cache import TTLCache
+from app.core.config import REPLICA_HEALTH_CHECK_SECONDS, REPLICA_STICKY_SECONDS
+
+logger = logging.getLogger(__name__)
+
+# Session.info keys
+ROUTER = "replica_router"
+REPLICA_READS = "replica_reads"
+WROTE = "wrote"
+REPLICA = "replica"
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+STICKY_MAX_ENTRIES = 100_000
+
+
+class ReplicaRouter:
+    def __init__(self, primary: AsyncEngine, replicas: Sequence[AsyncEngine] = (),
+                 sticky_seconds: float = REPLICA_STICKY_SECONDS,
+                 health_check_seconds: float = REPLICA_HEALTH_CHECK_SECONDS):
+        self.primary = primary
+        self.replicas: List[AsyncEngine] = list(replicas)
+        self.health_check_seconds = health_check_seconds
+        self._healthy = set(range(len(self.replicas)))
+        self._turn = itertools.count()
+        self._sticky = TTLCache(STICKY_MAX_ENTRIES, sticky_seconds)
+        self._health_task: Optional[asyncio.Task] = None
+        for index, replica in enumerate(self.replicas):
+            event.listen(replica.sync_engine, "handle_error", self._on_error(index))
+
+    # --- Choosing an engine ---
+    def reader(self) -> AsyncEngine:
+        """A healthy replica, round robin; the primary when there is none."""
+        healthy = sorted(self._healthy)
+        if not healthy:
+            return self.primary
+        return self.replicas[healthy[next(self._turn) % len(healthy)]]
+
+    def healthy_replicas(self) -> List[AsyncEngine]:
+        return [self.replicas[i] for i in sorted(self._healthy)]
+
+    # --- Read-your-writes ---
+    def mark_write(self, key: Optional[str]) -> None:
+        if key:
+            self._sticky.set(key, True)
+
+    def is_sticky(self, key: Optional[str]) -> bool:
+        return bool(key) and self._sticky.get(key, False)
+
+    # --- Health ---
+    def _set_health(self, index: int, healthy: bool) -> None:
+        if healthy == (index in self._healthy):
+            return
+        if healthy:
+            self._healthy.add(index)
+            logger.info("Replica %s is back in rotation", self.replicas[index].url)
+        else:
+            self._healthy.discard(index)
+            logger.warning("Replica %s taken out of rotation", self.replicas[index].url)
+
+    def _on_error(self, index: int):
+        def handle_error(context):
+            # Failed connects (no connection yet) and dropped connections
+            if context.is_disconnect or context.connection is None:
+                self._set_health(index, False)
+        return handle_error
+
+    async def _probe(self, replica: AsyncEngine) -> bool:
+        try:
+            async with replica.connect() as conn:
+                await asyncio.wait_for(conn.execute(text("SELECT 1")), self.health_check_seconds)
+            return True
+        except Exception:
+            return False
+
+    async def check_replicas(self) -> None:
+        results = await asyncio.gather(*(self._probe(r) for r in self.replicas))
+        for index, healthy in enumerate(results):
+            self._set_health(index, healthy)
+
+    def start_health_checks(self) -> None:
+        if self.replicas and self._health_task is None:
+            self._health_task = asyncio.create_task(self._health_loop())
+
+    async def stop_health_checks(self) -> None:
+        if self._health_task is not None:
+            self._health_task.cancel()
+            try:
+                await self._health_task
+            except asyncio.CancelledError:
+                pass
+            self._health_task = None
+
+    async def _health_loop(self) -> None:
+        while True:
+            await self.check_replicas()
+            await asyncio.sleep(self.health_check_seconds)
+
+
+class RoutingSession(Session):
+    def get_bind(self, mapper=None, clause=None, **kw):
+        primary = super().get_bind(mapper=mapper, clause=clause, **kw)
+        router: Optional[ReplicaRouter] = self.info.get(ROUTER)
+        is_read = isinstance(clause, Select) and clause._for_update_arg is None and not self._flushing
+        if not is_read:
+            # Textual SQL and raw connections go to the primary without counting as writes
+            if self._flushing or getattr(clause, "is_dml", False):
+                self.info[WROTE] = True
+            return primary
+        if router is None or not self.info.get(REPLICA_READS) or self.info.get(WROTE):
+            return primary
+        # One replica per session, so a request reads one consistent source
+        replica = self.info.get(REPLICA)
+        if replica is None:
+            replica = self.info[REPLICA] = router.reader()
+        return replica.sync_engine
+
+
+def routing_sessionmaker(router: ReplicaRouter) -> async_sessionmaker:
+    return async_sessionmaker(
+        bind=router.primary, expire_on_commit=False, class_=AsyncSession,
+        sync_session_class=RoutingSession, info={ROUTER: router},
+    )
+
+
+def read_from_primary(db: AsyncSession) -> None:
+    """Send the rest of ``db``'s reads to the primary, e.g. before filling a cache."""
+    db.info.pop(REPLICA_READS, None)
+
+
+def mark_sticky(db: AsyncSession, subject: str) -> None:
+    """Pin ``subject``'s reads to the primary for the sticky window, e.g. a new user."""
+    router: Optional[ReplicaRouter] = db.info.get(ROUTER)
+    if router is not None:
+        router.mark_write(subject)
+
+
+def sticky_key(request: Request) -> Optional[str]:
+    """Who a request reads its writes as: the subject of a valid bearer token."""
+    # app.core.security imports this module (through app.db.session)
+    from app.core.security import decode_token
+
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        subject = decode_token(token).get("sub")
+    except JWTError:
+        return None
+    return str(subject) if subject is not None else None
+
+
+@asynccontextmanager
+async def request_session(session_factory: async_sessionmaker, request: Request) -> AsyncIterator[AsyncSession]:
+    """A session for ``request``: replica reads when it is safe and its caller is not sticky."""
+    async with session_factory() as session:
+        router: Optional[ReplicaRouter] = session.info.get(ROUTER)
+        key = sticky_key(request)
+        safe = request.method in SAFE_METHODS
+        if router is not None and router.replicas and safe and not router.is_sticky(key):
+            session.info[REPLICA_READS] = True
+        try:
+            yield session
+        finally:
+            if router is not None and (session.info.get(WROTE) or not safe):
+                router.mark_write(key)
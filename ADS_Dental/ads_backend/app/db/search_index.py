@@ -0,0 +1,123 @@
+# app/db/search_index.py
+# Patient search index. Each searchable field is normalized and every suffix of
+# it is stored in patient_search_terms, which turns "contains" into "starts
+# with" and lets the database answer it from the term index instead of
+# scanning five columns with leading-wildcard ILIKEs.
+import re
+from typing import Any, Iterable, List, Mapping
+
+from sqlalchemy import case, delete, event, func, insert, inspect, select
+from sqlalchemy.engine import Connection
+
+from app.db.models import Patient, PatientSearchTerm
+
+SEARCH_FIELDS = ("patient_no", "email", "first_name", "last_name", "phone")
+# Fields whose exact match outranks everything else
+EXACT_FIELDS = ("patient_no", "email")
+MIN_QUERY_LENGTH = 2
+MAX_TERM_LENGTH = 120
+INSERT_BATCH_SIZE = 5000
+
+_PHONE_LIKE = re.compile(r"[\d\s\-().+]+")
+_NON_DIGITS = re.compile(r"\D")
+
+
+def normalize(field: str, value: Any) -> str:
+    if value is None:
+        return ""
+    if field == "phone":
+        return _NON_DIGITS.sub("", str(value))
+    return " ".join(str(value).lower().split())[:MAX_TERM_LENGTH]
+
+
+def normalize_query(query: str) -> str:
+    query = query.strip()
+    if _PHONE_LIKE.fullmatch(query):
+        return _NON_DIGITS.sub("", query)
+    return " ".join(query.lower().split())[:MAX_TERM_LENGTH]
+
+
+def search_terms(patient_id: int, values: Mapping[str, Any]) -> List[dict]:
+    rows = []
+    for field in SEARCH_FIELDS:
+        text = normalize(field, values.get(field))
+        for position in range(len(text) - MIN_QUERY_LENGTH + 1):
+            if text[position] == " ":
+                continue
+            rows.append({"patient_id": patient_id, "field": field, "position": position, "term": text[position:]})
+    return rows
+
+
+def index_patients(connection: Connection, patients: Iterable[Mapping[str, Any]], replace: bool = True) -> None:
+    """(Re)build the search terms for the given patient rows (``id`` + SEARCH_FIELDS)."""
+    patients = list(patients)
+    if not patients:
+        return
+    if replace:
+        ids = [p["id"] for p in patients]
+        connection.execute(delete(PatientSearchTerm).where(PatientSearchTerm.patient_id.in_(ids)))
+    rows = [row for p in patients for row in search_terms(p["id"], p)]
+    for i in range(0, len(rows), INSERT_BATCH_SIZE):
+        connection.execute(insert(PatientSearchTerm), rows[i:i + INSERT_BATCH_SIZE])
+
+
+def rebuild_search_index(connection: Connection, batch_size: int = INSERT_BATCH_SIZE) -> None:
+    """Backfill the whole index, e.g. after a bulk load that bypassed the ORM."""
+    connection.execute(delete(PatientSearchTerm))
+    columns = [Patient.id, *(getattr(Patient, f) for f in SEARCH_FIELDS)]
+    last_id = 0
+    while True:
+        batch = connection.execute(
+            select(*columns).where(Patient.id > last_id).order_by(Patient.id).limit(batch_size)
+        ).mappings().all()
+        if not batch:
+            break
+        index_patients(connection, batch, replace=False)
+        last_id = batch[-1]["id"]
+
+
+def ranked_patient_ids(query: str):
+    """
+    Subquery of (patient_id, rank) for patients matching ``query``:
+    0 = exact patient_no/email, 1 = prefix of a field, 2 = substring.
+    """
+    rank = case(
+        (
+            (PatientSearchTerm.position == 0)
+            & PatientSearchTerm.field.in_(EXACT_FIELDS)
+            & (PatientSearchTerm.term == query),
+            0,
+        ),
+        (PatientSearchTerm.position == 0, 1),
+        else_=2,
+    )
+    # The explicit [query, successor) range lets every backend use the term
+    # index (SQLite won't for a case-insensitive LIKE); LIKE keeps it exact.
+    # The successor bound needs the term column's binary collation.
+    upper = query[:-1] + chr(ord(query[-1]) + 1)
+    return (
+        select(PatientSearchTerm.patient_id, func.min(rank).label("rank"))
+        .where(
+            (PatientSearchTerm.term >= query)
+            & (PatientSearchTerm.term < upper)
+            & PatientSearchTerm.term.startswith(query, autoescape=True)
+        )
+        .group_by(PatientSearchTerm.patient_id)
+        .subquery("ranked")
+    )
+
+
+def _values(patient: Patient) -> dict:
+    return {"id": patient.id, **{f: getattr(patient, f) for f in SEARCH_FIELDS}}
+
+
+@event.listens_for(Patient, "after_insert")
+def _index_inserted_patient(mapper, connection, target):
+    index_patients(connection, [_values(target)], replace=False)
+
+
+@event.listens_for(Patient, "after_update")
+def _index_updated_patient(mapper, connection, target):
+    state = inspect(target)
+    if any(state.attrs[f].history.has_changes() for f in SEARCH_FIELDS):
+        index_patients(connection, [_values(target)])
@@ -1,28 +1,41 @@
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+from fastapi import Request
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from app.db.base import Base
-from app.core.config import DATABASE_URL
+from app.db.routing import ReplicaRouter, request_session, routing_sessionmaker
+from app.core.config import DATABASE_REPLICA_URLS, DATABASE_URL
 import ssl
 
 ssl_context = ssl.create_default_context()
 ssl_context.check_hostname = False
 ssl_context.verify_mode = ssl.CERT_NONE
 
-engine = create_async_engine(
-    DATABASE_URL,
-    connect_args={"ssl": ssl_context},
-    pool_pre_ping=True,
-    pool_recycle=300,
-)
+def _create_engine(url: str):
+    return create_async_engine(
+        url,
+        connect_args={"ssl": ssl_context},
+        pool_pre_ping=True,
+        pool_recycle=300,
+    )
 
-AsyncSessionLocal = async_sessionmaker(bind=engine, expire_on_commit=False, class_=AsyncSession)
+engine = _create_engine(DATABASE_URL)
 
-async def get_database():
-    async with AsyncSessionLocal() as session:
+# Primary plus any read replicas; see app/db/routing.py
+replica_router = ReplicaRouter(engine, [_create_engine(url) for url in DATABASE_REPLICA_URLS])
+
+AsyncSessionLocal = routing_sessionmaker(replica_router)
+
+async def get_database(request: Request):
+    async with request_session(AsyncSessionLocal, request) as session:
         try:
             yield session
         finally:
             await session.close()
 
+def get_session_factory() -> async_sessionmaker:
+    # For responses that outlive the request-scoped session (e.g. streaming).
+    # Its sessions read from the primary: they are not tied to a request.
+    return AsyncSessionLocal
+
 async def init_db():
     async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
\ No newline at end of file
+        await conn.run_sync(Base.metadata.create_all)
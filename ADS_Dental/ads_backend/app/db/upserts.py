@@ -0,0 +1,23 @@
+# app/db/upserts.py
+# "Insert unless the primary key already exists" for the counter and version
+# tables, using each backend's native form so concurrent first writers don't
+# fail on the primary key.
+from typing import Optional
+
+from sqlalchemy import Table
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlalchemy.sql import Insert
+
+
+def insert_if_absent(dialect: str, table: Table, **values) -> Optional[Insert]:
+    """Native insert-or-ignore for ``dialect``, or None if it has none."""
+    if dialect == "sqlite":
+        return sqlite.insert(table).values(**values).on_conflict_do_nothing()
+    if dialect == "postgresql":
+        return postgresql.insert(table).values(**values).on_conflict_do_nothing()
+    if dialect in ("mysql", "mariadb"):
+        # A no-op update rather than INSERT IGNORE, which would also hide FK errors
+        stmt = mysql.insert(table).values(**values)
+        key = table.primary_key.columns.values()[0]
+        return stmt.on_duplicate_key_update({key.name: stmt.table.c[key.name]})
+    return None
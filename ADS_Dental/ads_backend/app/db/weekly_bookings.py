@@ -0,0 +1,130 @@
+# app/db/weekly_bookings.py
+# Per-dentist weekly booking counters. A booking claims a place with one
+# conditional UPDATE (booked = booked + 1 WHERE booked < limit) inside the
+# booking's own transaction: the row lock serializes concurrent claims for the
+# same dentist and week, and a rollback returns the place automatically.
+from collections import Counter
+from datetime import date, timedelta
+from typing import Iterable
+
+from sqlalchemy import case, delete, event, insert, select, update
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import WEEKLY_APPOINTMENT_LIMIT
+from app.db.models import Appointment, AppointmentArchive, AppointmentStatus, DentistWeeklyBookings, Patient
+from app.db.upserts import insert_if_absent
+
+INSERT_BATCH_SIZE = 5000
+
+_counters = DentistWeeklyBookings.__table__
+
+
+def week_start(day: date) -> date:
+    return day - timedelta(days=day.weekday())
+
+
+async def _create_counter(db: AsyncSession, dentist_id: int, week: date) -> None:
+    stmt = insert_if_absent(db.get_bind().dialect.name, _counters, dentist_id=dentist_id, week_start=week, booked=0)
+    if stmt is not None:
+        await db.execute(stmt)
+        return
+    try:
+        async with db.begin_nested():
+            await db.execute(insert(_counters).values(dentist_id=dentist_id, week_start=week, booked=0))
+    except IntegrityError:
+        pass  # created concurrently
+
+
+def _claim(dentist_id: int, week: date, places: int):
+    return (
+        update(_counters)
+        .where(
+            _counters.c.dentist_id == dentist_id,
+            _counters.c.week_start == week,
+            _counters.c.booked <= WEEKLY_APPOINTMENT_LIMIT - places,
+        )
+        .values(booked=_counters.c.booked + places)
+    )
+
+
+async def claim_weekly_bookings(db: AsyncSession, dentist_id: int, day: date, wanted: int = 1) -> int:
+    """
+    Take up to ``wanted`` of the dentist's weekly places for ``day`` in the
+    current transaction and return how many were taken.
+    """
+    week = week_start(day)
+    if (await db.execute(_claim(dentist_id, week, wanted))).rowcount == 1:
+        return wanted
+    # No counter yet for this week, or fewer than ``wanted`` places left
+    await _create_counter(db, dentist_id, week)
+    claimed = 0
+    while claimed < wanted and (await db.execute(_claim(dentist_id, week, 1))).rowcount == 1:
+        claimed += 1
+    return claimed
+
+
+async def claim_weekly_booking(db: AsyncSession, dentist_id: int, day: date) -> bool:
+    """Take one weekly place for ``day``; False when the week is already full."""
+    return await claim_weekly_bookings(db, dentist_id, day) == 1
+
+
+async def release_weekly_booking(db: AsyncSession, dentist_id: int, day: date) -> None:
+    await db.execute(
+        update(_counters)
+        .where(
+            _counters.c.dentist_id == dentist_id,
+            _counters.c.week_start == week_start(day),
+            _counters.c.booked > 0,
+        )
+        .values(booked=_counters.c.booked - 1)
+    )
+
+
+def release_patient_bookings(connection: Connection, patient_ids: Iterable[int]) -> None:
+    """
+    Give back the weekly places held by the patients' appointments. Call before
+    deleting the patients: the database cascades their appointments away.
+    """
+    patient_ids = list(patient_ids)
+    if not patient_ids:
+        return
+    counts = Counter()
+    # Archived COMPLETED appointments hold places too (see rebuild_weekly_bookings)
+    for source in (Appointment, AppointmentArchive):
+        rows = connection.execute(
+            select(source.dentist_id, source.appointment_date)
+            .where(source.patient_id.in_(patient_ids), source.status != AppointmentStatus.CANCELLED)
+        )
+        for dentist_id, day in rows:
+            counts[(dentist_id, week_start(day))] += 1
+    for (dentist_id, week), places in counts.items():
+        connection.execute(
+            update(_counters)
+            .where(_counters.c.dentist_id == dentist_id, _counters.c.week_start == week)
+            .values(booked=case((_counters.c.booked > places, _counters.c.booked - places), else_=0))
+        )
+
+
+@event.listens_for(Patient, "before_delete")
+def _patient_deleted(mapper, connection, target):
+    # Before the DELETE, while the cascaded appointments still exist
+    release_patient_bookings(connection, [target.id])
+
+
+def rebuild_weekly_bookings(connection: Connection) -> None:
+    """Recount every week from appointments, e.g. after a bulk load that bypassed the services."""
+    connection.execute(delete(_counters))
+    counts = Counter()
+    # Archived COMPLETED appointments still count towards their week
+    for source in (Appointment, AppointmentArchive):
+        rows = connection.execution_options(yield_per=INSERT_BATCH_SIZE).execute(
+            select(source.dentist_id, source.appointment_date)
+            .where(source.status != AppointmentStatus.CANCELLED)
+        )
+        for dentist_id, day in rows:
+            counts[(dentist_id, week_start(day))] += 1
+    values = [{"dentist_id": d, "week_start": w, "booked": n} for (d, w), n in counts.items()]
+    for i in range(0, len(values), INSERT_BATCH_SIZE):
+        connection.execute(insert(_counters), values[i:i + INSERT_BATCH_SIZE])
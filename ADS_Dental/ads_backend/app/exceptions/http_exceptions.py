@@ -31,6 +31,7 @@ def http_exception_handler(request: Request, exc: HTTPException):
             "code": exc.status_code,
             "details": str(exc)
         },
+        headers=getattr(exc, "headers", None),
     )
 
 def generic_exception_handler(request: Request, exc: Exception):
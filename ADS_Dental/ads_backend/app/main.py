@@ -185,19 +185,47 @@
 #     addresses = (await db.execute(stmt)).scalars().all()
 #     return [AddressDTO.from_orm(a) for a in addresses]
 
+import logging
 from fastapi import FastAPI, Request, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
-from app.api.endpoints import patients, auth, appointments, users, dentists, surgery
+from app.api.endpoints import patients, auth, appointments, users, dentists, surgery, export
+from app.api.serialization import FastJSONResponse
 from app.exceptions.http_exceptions import http_exception_handler, generic_exception_handler
+from app.core.security import password_hasher
+from app.core.config import SMTP_HOST, SMTP_PORT, SMTP_USERNAME, SMTP_PASSWORD, SMTP_STARTTLS, SMTP_TIMEOUT_SECONDS
+from app.core.mailer import SMTPMailer
+from app.core.outbox_worker import OutboxWorker
+from app.db.role_ids import load_role_ids
+from app.db.session import get_session_factory, replica_router
+from app.services.notification_service import OUTBOX_RENDERERS
+
+logger = logging.getLogger(__name__)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Place your async startup code here
+    session_factory = app.dependency_overrides.get(get_session_factory, get_session_factory)()
+    try:
+        async with session_factory() as db:
+            await load_role_ids(db)
+    except Exception:
+        # Not fatal: role ids are then resolved on first use
+        logger.warning("Could not preload role ids", exc_info=True)
+    outbox_worker = None
+    if SMTP_HOST:
+        mailer = SMTPMailer(SMTP_HOST, SMTP_PORT, SMTP_USERNAME, SMTP_PASSWORD, SMTP_STARTTLS, SMTP_TIMEOUT_SECONDS)
+        outbox_worker = OutboxWorker(mailer, OUTBOX_RENDERERS)
+        outbox_worker.start(session_factory)
+    replica_router.start_health_checks()
     yield
+    await replica_router.stop_health_checks()
+    if outbox_worker is not None:
+        await outbox_worker.stop()
+    password_hasher.shutdown()
 
-app = FastAPI(lifespan=lifespan)
+app = FastAPI(lifespan=lifespan, default_response_class=FastJSONResponse)
 
 origins = [
     "http://localhost:5173",
@@ -225,3 +253,4 @@ app.include_router(auth.router)
 app.include_router(appointments.router)
 app.include_router(users.router)
 app.include_router(surgery.router)
+app.include_router(export.router)
@@ -1,7 +1,9 @@
 from pydantic import BaseModel
 from datetime import datetime, time
 from enum import Enum
+from typing import Dict, List, Optional
 
+from app.schemas.address_dto import AddressDTO
 from app.schemas.dentist_dto import DentistResponseDTO
 from app.schemas.patient_dto import PatientDTO
 from app.schemas.surgery_dto import SurgeryDTO
@@ -9,7 +11,7 @@ from app.schemas.surgery_dto import SurgeryDTO
 
 class AppointmentStatus(str, Enum):
     BOOKED = "BOOKED"
-    CANCELED = "CANCELED"
+    CANCELLED = "CANCELLED"
     COMPLETED = "COMPLETED"
 
 class AppointmentCreateDTO(BaseModel):
@@ -28,4 +30,50 @@ class AppointmentDTO(BaseModel):
     surgery: SurgeryDTO
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+# Compound ("sideloaded") format: appointments reference related entities by
+# id and each entity appears once in ``included``
+class AppointmentRefDTO(BaseModel):
+    id: int
+    appointment_date: datetime
+    appointment_time: time
+    status: AppointmentStatus
+    patient_id: int
+    dentist_id: int
+    surgery_id: int
+
+class IncludedSurgeryDTO(BaseModel):
+    id: int
+    surgery_no: Optional[str]
+    name: Optional[str]
+    phone: Optional[str]
+    address: Optional[AddressDTO]
+    dentist_ids: List[int] = []
+
+class AppointmentIncludedDTO(BaseModel):
+    patients: Dict[int, PatientDTO] = {}
+    dentists: Dict[int, DentistResponseDTO] = {}
+    surgeries: Dict[int, IncludedSurgeryDTO] = {}
+
+class AppointmentCompoundPageDTO(BaseModel):
+    items: List[AppointmentRefDTO]
+    included: AppointmentIncludedDTO
+    next_cursor: Optional[str] = None
+
+class BulkAppointmentStatus(str, Enum):
+    CREATED = "created"
+    SLOT_CONFLICT = "slot_conflict"
+    WEEKLY_LIMIT = "weekly_limit"
+    UNKNOWN_PATIENT = "unknown_patient"
+    UNKNOWN_DENTIST = "unknown_dentist"
+    UNKNOWN_SURGERY = "unknown_surgery"
+
+class BulkAppointmentResultDTO(BaseModel):
+    index: int
+    status: BulkAppointmentStatus
+    appointment_id: Optional[int] = None
+
+class BulkAppointmentResponseDTO(BaseModel):
+    created: int
+    results: List[BulkAppointmentResultDTO]
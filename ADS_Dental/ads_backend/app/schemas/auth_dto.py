@@ -6,4 +6,8 @@ class LoginDTO(BaseModel):
 
 class TokenDTO(BaseModel):
     access_token: str
-    token_type: str
\ No newline at end of file
+    token_type: str
+
+class InviteAcceptDTO(BaseModel):
+    token: str
+    password: str
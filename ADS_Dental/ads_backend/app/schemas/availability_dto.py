@@ -0,0 +1,17 @@
+from pydantic import BaseModel
+from datetime import date, time
+from typing import List
+
+
+class DayAvailabilityDTO(BaseModel):
+    date: date
+    free: List[time]
+
+class DentistAvailabilityDTO(BaseModel):
+    dentist_id: int
+    slot_minutes: int
+    days: List[DayAvailabilityDTO]
+
+class SurgeryAvailabilityDTO(BaseModel):
+    surgery_id: int
+    dentists: List[DentistAvailabilityDTO]
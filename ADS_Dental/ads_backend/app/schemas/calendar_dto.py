@@ -0,0 +1,28 @@
+from pydantic import BaseModel
+from datetime import date, time
+from typing import List
+
+from app.schemas.appointment_dto import AppointmentStatus
+
+
+class CalendarPatientDTO(BaseModel):
+    id: int
+    patient_no: str
+    first_name: str
+    last_name: str
+
+class CalendarEntryDTO(BaseModel):
+    id: int
+    appointment_time: time
+    status: AppointmentStatus
+    surgery_id: int
+    patient: CalendarPatientDTO
+
+class CalendarDayDTO(BaseModel):
+    date: date
+    appointments: List[CalendarEntryDTO]
+
+class DentistCalendarDTO(BaseModel):
+    dentist_id: int
+    version: int
+    days: List[CalendarDayDTO]
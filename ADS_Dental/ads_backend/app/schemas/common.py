@@ -1,5 +1,31 @@
 from pydantic import BaseModel
+from typing import Generic, List, Optional, Type, TypeVar
+
+T = TypeVar("T")
 
 class ORMBase(BaseModel):
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class Page(BaseModel, Generic[T]):
+    items: List[T]
+    next_cursor: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+M = TypeVar("M", bound=BaseModel)
+
+def trusted(cls: Type[M], **fields) -> M:
+    """
+    ``cls`` from data that is already valid (typed database rows), with every
+    field given. Does what model_construct does minus its per-field default and
+    alias handling, which makes model_construct slower than validating.
+    """
+    obj = cls.__new__(cls)
+    # In declaration order, which is the order fields are serialized in
+    object.__setattr__(obj, "__dict__", {name: fields[name] for name in cls.model_fields})
+    object.__setattr__(obj, "__pydantic_fields_set__", set(fields))
+    object.__setattr__(obj, "__pydantic_extra__", None)
+    object.__setattr__(obj, "__pydantic_private__", None)
+    return obj
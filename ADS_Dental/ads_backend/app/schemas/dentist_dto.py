@@ -20,4 +20,4 @@ class DentistResponseDTO(BaseModel):
     user_id: int
 
     class Config:
-        orm_mode = True
+        from_attributes = True
@@ -1,5 +1,6 @@
 from pydantic import BaseModel, EmailStr
-from typing import Optional
+from enum import Enum
+from typing import List, Optional
 from app.schemas.address_dto import AddressCreateDTO, AddressDTO
 
 class PatientCreateDTO(BaseModel):
@@ -20,4 +21,28 @@ class PatientDTO(BaseModel):
     address: Optional[AddressDTO] = None
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class PatientImportDTO(PatientCreateDTO):
+    # Imported patients without a password get an invite token instead
+    password: Optional[str] = None
+
+class PatientImportStatus(str, Enum):
+    CREATED = "created"
+    DUPLICATE = "duplicate"
+    INVALID = "invalid"
+
+class PatientImportResultDTO(BaseModel):
+    row: int
+    status: PatientImportStatus
+    patient_id: Optional[int] = None
+    patient_no: Optional[str] = None
+    invite_token: Optional[str] = None
+    errors: Optional[List[str]] = None
+
+class PatientImportResponseDTO(BaseModel):
+    received: int
+    created: int
+    duplicates: int
+    invalid: int
+    results: List[PatientImportResultDTO]
@@ -1,27 +1,178 @@
-from app.db.models import Appointment
+from app.db.models import Appointment, AppointmentArchive, AppointmentStatus, Dentist, Patient, Surgery
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException
-from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy import insert, tuple_
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from sqlalchemy.future import select
+from app.db.availability import queue_change
+from app.db.calendar_versions import bump_calendar_versions
+from app.core.outbox_worker import notify_outbox
+from app.services.notification_service import enqueue_appointment_confirmations
+from app.db.load_plans import load_plan
+from app.db.pagination import paginate, DEFAULT_PAGE_SIZE
+from app.db.projections import (
+    appointment_projection, appointment_ref_projection, included_for, row_to_appointment_ref, rows_to_appointment_dtos,
+)
+from app.db.fieldsets import Fieldset, rows_to_sparse_appointments, sparse_appointment_projection
+from app.db.weekly_bookings import claim_weekly_booking, claim_weekly_bookings, release_weekly_booking, week_start
+from app.core.config import STREAM_BATCH_SIZE, WEEKLY_APPOINTMENT_LIMIT, BULK_APPOINTMENT_MAX_ROWS
+from app.exceptions.http_exceptions import BadRequestException, ConflictException
+from app.schemas.appointment_dto import AppointmentCompoundPageDTO, AppointmentCreateDTO, AppointmentDTO, BulkAppointmentStatus
+from app.schemas.common import trusted
+from app.core.principal import Principal
+from collections import defaultdict
+from typing import AsyncIterator, List, Optional
+
+# Keyset order for appointment lists: chronological, id breaks ties
+APPOINTMENT_ORDER = (Appointment.appointment_date, Appointment.appointment_time, Appointment.id)
+ARCHIVE_ORDER = (AppointmentArchive.appointment_date, AppointmentArchive.appointment_time, AppointmentArchive.id)
+
+def _is_slot_conflict(error: IntegrityError) -> bool:
+    # MySQL and PostgreSQL name the constraint, SQLite lists its columns
+    message = str(error.orig)
+    return "uq_dentist_slot" in message or "appointments.appointment_time" in message
 
 async def create_appointment_service(db: AsyncSession, payload, patient_id: int):
+    """
+    Book one slot. The weekly place is claimed first, then the INSERT is
+    flushed right away so a lost race on uq_dentist_slot surfaces here and is
+    answered with 409 after a single rollback, which also returns the place.
+    """
+    day = payload.appointment_date.date()
     try:
+        if not await claim_weekly_booking(db, payload.dentist_id, day):
+            await db.rollback()
+            raise ConflictException(
+                f"Dentist already has {WEEKLY_APPOINTMENT_LIMIT} appointments in the week of {week_start(day)}"
+            )
         appointment = Appointment(
-            appointment_date=payload.appointment_date,
+            appointment_date=day,
+            appointment_time=payload.appointment_date.time(),
             dentist_id=payload.dentist_id,
             surgery_id=payload.surgery_id,
             patient_id=patient_id
         )
         db.add(appointment)
+        await db.flush()
+        enqueue_appointment_confirmations(db, [appointment.id])
         await db.commit()
-        await db.refresh(appointment)
-        return appointment
+    except IntegrityError as e:
+        await db.rollback()
+        if _is_slot_conflict(e):
+            raise ConflictException("This slot has just been booked, please choose another")
+        raise BadRequestException("Unknown dentist or surgery")
     except SQLAlchemyError as e:
         await db.rollback()
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
+    notify_outbox()
+    return await db.get(
+        Appointment, appointment.id, options=load_plan("appointment_detail"), populate_existing=True
+    )
+
+async def _existing_ids(db: AsyncSession, model, ids) -> set:
+    return set((await db.execute(select(model.id).where(model.id.in_(ids)))).scalars().all())
+
+async def _bulk_create(db: AsyncSession, rows: List[AppointmentCreateDTO]):
+    results: List[Optional[BulkAppointmentStatus]] = [None] * len(rows)
+    slots = [(r.dentist_id, r.appointment_date.date(), r.appointment_date.time()) for r in rows]
+
+    # One IN query per referenced table
+    patients = await _existing_ids(db, Patient, {r.patient_id for r in rows})
+    dentists = await _existing_ids(db, Dentist, {r.dentist_id for r in rows})
+    surgeries = await _existing_ids(db, Surgery, {r.surgery_id for r in rows})
+    candidates = []
+    for i, row in enumerate(rows):
+        if row.patient_id not in patients:
+            results[i] = BulkAppointmentStatus.UNKNOWN_PATIENT
+        elif row.dentist_id not in dentists:
+            results[i] = BulkAppointmentStatus.UNKNOWN_DENTIST
+        elif row.surgery_id not in surgeries:
+            results[i] = BulkAppointmentStatus.UNKNOWN_SURGERY
+        else:
+            candidates.append(i)
+
+    # Slots already booked, or claimed by an earlier row of this batch
+    slot_columns = tuple_(Appointment.dentist_id, Appointment.appointment_date, Appointment.appointment_time)
+    wanted_slots = {slots[i] for i in candidates}
+    taken = set()
+    if wanted_slots:
+        taken = {tuple(r) for r in (await db.execute(
+            select(Appointment.dentist_id, Appointment.appointment_date, Appointment.appointment_time)
+            .where(slot_columns.in_(wanted_slots))
+        )).all()}
+    by_week = defaultdict(list)
+    for i in candidates:
+        if slots[i] in taken:
+            results[i] = BulkAppointmentStatus.SLOT_CONFLICT
+            continue
+        taken.add(slots[i])
+        dentist_id, day, _ = slots[i]
+        by_week[(dentist_id, week_start(day))].append(i)
+
+    accepted = []
+    for (dentist_id, week), indexes in by_week.items():
+        claimed = await claim_weekly_bookings(db, dentist_id, week, len(indexes))
+        accepted += indexes[:claimed]
+        for i in indexes[claimed:]:
+            results[i] = BulkAppointmentStatus.WEEKLY_LIMIT
+    accepted.sort()
+
+    ids = {}
+    if accepted:
+        await db.execute(insert(Appointment).values([
+            {
+                "dentist_id": slots[i][0],
+                "appointment_date": slots[i][1],
+                "appointment_time": slots[i][2],
+                "status": AppointmentStatus.BOOKED,
+                "patient_id": rows[i].patient_id,
+                "surgery_id": rows[i].surgery_id,
+            }
+            for i in accepted
+        ]))
+        inserted = (await db.execute(
+            select(Appointment.id, Appointment.dentist_id, Appointment.appointment_date, Appointment.appointment_time)
+            .where(slot_columns.in_([slots[i] for i in accepted]))
+        )).all()
+        ids = {(r.dentist_id, r.appointment_date, r.appointment_time): r.id for r in inserted}
+        # Core inserts bypass the ORM listeners that maintain availability and calendar versions
+        for i in accepted:
+            results[i] = BulkAppointmentStatus.CREATED
+            queue_change(db.sync_session, True, *slots[i])
+        await db.run_sync(lambda session: bump_calendar_versions(session.connection(), {slots[i][0] for i in accepted}))
+        enqueue_appointment_confirmations(db, (ids[slots[i]] for i in accepted))
+    await db.commit()
+    if accepted:
+        notify_outbox()
+
+    return {
+        "created": len(accepted),
+        "results": [
+            {"index": i, "status": status, "appointment_id": ids.get(slots[i]) if status == BulkAppointmentStatus.CREATED else None}
+            for i, status in enumerate(results)
+        ],
+    }
+
+async def bulk_create_appointments_service(db: AsyncSession, rows: List[AppointmentCreateDTO], attempts: int = 3):
+    """
+    Book a day sheet in one transaction: batched existence and slot checks, one
+    weekly-limit claim per dentist and week, and a single multi-row INSERT.
+    Rows that cannot be booked are reported instead of failing the batch.
+    """
+    if len(rows) > BULK_APPOINTMENT_MAX_ROWS:
+        raise BadRequestException(f"At most {BULK_APPOINTMENT_MAX_ROWS} appointments per request")
+    if not rows:
+        return {"created": 0, "results": []}
+    for _ in range(attempts):
+        try:
+            return await _bulk_create(db, rows)
+        except IntegrityError:
+            # A slot was booked concurrently after the check; re-check everything
+            await db.rollback()
+    raise ConflictException("Appointments changed concurrently, please retry")
 
 async def get_appointment_by_id_service(db: AsyncSession, appointment_id: int):
-    appointment = await db.get(Appointment, appointment_id)
+    appointment = await db.get(Appointment, appointment_id, options=load_plan("appointment_detail"))
     if not appointment:
         raise HTTPException(status_code=404, detail="Appointment not found")
     return appointment
@@ -30,32 +181,98 @@ async def delete_appointment_service(db: AsyncSession, appointment_id: int):
     appointment = await db.get(Appointment, appointment_id)
     if not appointment:
         raise HTTPException(status_code=404, detail="Appointment not found")
+    if appointment.status != AppointmentStatus.CANCELLED:
+        await release_weekly_booking(db, appointment.dentist_id, appointment.appointment_date)
     await db.delete(appointment)
     await db.commit()
 
-async def list_appointments_service(db: AsyncSession, current_user):
-    # Extract all role names as lowercase strings
-    role_names = [r.name.lower() for r in current_user.roles]
+def _visible_appointments_query(current_user: Principal, stmt, source=Appointment):
+    if current_user.has_role("ADMIN"):
+        pass
 
-    if "admin" in role_names:
-        result = await db.execute(select(Appointment))
-        return result.scalars().all()
-
-    elif "dentist" in role_names:
-        if not hasattr(current_user, "dentist_id") or current_user.dentist_id is None:
+    elif current_user.has_role("DENTIST"):
+        if current_user.dentist_id is None:
             raise HTTPException(status_code=404, detail="Dentist profile not found")
-        result = await db.execute(
-            select(Appointment).where(Appointment.dentist_id == current_user.dentist_id)
-        )
-        return result.scalars().all()
+        stmt = stmt.where(source.dentist_id == current_user.dentist_id)
 
-    elif "patient" in role_names:
-        if not hasattr(current_user, "patient_id") or current_user.patient_id is None:
+    elif current_user.has_role("PATIENT"):
+        if current_user.patient_id is None:
             raise HTTPException(status_code=404, detail="Patient profile not found")
-        result = await db.execute(
-            select(Appointment).where(Appointment.patient_id == current_user.patient_id)
-        )
-        return result.scalars().all()
+        stmt = stmt.where(source.patient_id == current_user.patient_id)
 
     else:
         raise HTTPException(status_code=403, detail="Not authorized to view appointments")
+    return stmt
+
+def _appointment_query(current_user: Principal, fieldset: Optional[Fieldset], source=Appointment):
+    projection = appointment_projection(source) if fieldset is None else sparse_appointment_projection(fieldset, source)
+    return _visible_appointments_query(current_user, projection, source)
+
+async def _to_items(db: AsyncSession, rows, fieldset: Optional[Fieldset]):
+    if fieldset is None:
+        return await rows_to_appointment_dtos(db, rows)
+    return await rows_to_sparse_appointments(db, rows, fieldset)
+
+async def list_appointments_service(
+    db: AsyncSession, current_user: Principal, limit: int = DEFAULT_PAGE_SIZE, after: Optional[str] = None,
+    fieldset: Optional[Fieldset] = None,
+):
+    """AppointmentDTOs, or dicts with only ``fieldset``'s attributes (see app/db/fieldsets.py)."""
+    stmt = _appointment_query(current_user, fieldset)
+    rows, next_cursor = await paginate(
+        db, stmt, APPOINTMENT_ORDER, limit, after, row_keys=("appointment_date", "appointment_time", "id")
+    )
+    return {"items": await _to_items(db, rows, fieldset), "next_cursor": next_cursor}
+
+async def list_appointment_history_service(
+    db: AsyncSession, current_user: Principal, limit: int = DEFAULT_PAGE_SIZE, after: Optional[str] = None,
+    fieldset: Optional[Fieldset] = None,
+):
+    """Archived appointments only; the default list and calendars read the hot table."""
+    stmt = _appointment_query(current_user, fieldset, AppointmentArchive)
+    rows, next_cursor = await paginate(
+        db, stmt, ARCHIVE_ORDER, limit, after, row_keys=("appointment_date", "appointment_time", "id")
+    )
+    return {"items": await _to_items(db, rows, fieldset), "next_cursor": next_cursor}
+
+async def list_appointments_compound_service(
+    db: AsyncSession, current_user: Principal, limit: int = DEFAULT_PAGE_SIZE, after: Optional[str] = None,
+    archived: bool = False,
+):
+    """A page in the compound format: id references plus each related entity once."""
+    source, order = (AppointmentArchive, ARCHIVE_ORDER) if archived else (Appointment, APPOINTMENT_ORDER)
+    stmt = _visible_appointments_query(current_user, appointment_ref_projection(source), source)
+    rows, next_cursor = await paginate(
+        db, stmt, order, limit, after, row_keys=("appointment_date", "appointment_time", "id")
+    )
+    return trusted(
+        AppointmentCompoundPageDTO,
+        items=[row_to_appointment_ref(r) for r in rows],
+        included=await included_for(db, rows),
+        next_cursor=next_cursor,
+    )
+
+async def get_visible_appointment_service(
+    db: AsyncSession, current_user: Principal, appointment_id: int, fieldset: Optional[Fieldset] = None,
+):
+    row = (await db.execute(
+        _appointment_query(current_user, fieldset).where(Appointment.id == appointment_id)
+    )).first()
+    if row is None:
+        raise HTTPException(status_code=404, detail="Appointment not found")
+    return (await _to_items(db, [row], fieldset))[0]
+
+def stream_appointments_service(current_user: Principal):
+    # Build (and authorize) the query now, while the request is still open
+    stmt = (
+        _visible_appointments_query(current_user, select(Appointment).options(*load_plan("appointment_detail")))
+        .order_by(*APPOINTMENT_ORDER)
+        .execution_options(yield_per=STREAM_BATCH_SIZE)
+    )
+
+    async def produce(db: AsyncSession) -> AsyncIterator[AppointmentDTO]:
+        result = await db.stream(stmt)
+        async for appointment in result.scalars():
+            yield AppointmentDTO.model_validate(appointment)
+
+    return produce
@@ -0,0 +1,55 @@
+from datetime import date, timedelta
+from typing import Dict, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from app.core.config import APPOINTMENT_SLOT_MINUTES, AVAILABILITY_MAX_DAYS
+from app.db.availability import booked_bitmaps, free_slots
+from app.db.models import Dentist, Surgery
+from app.exceptions.http_exceptions import BadRequestException, NotFoundException
+
+# Default window: four weeks starting today
+DEFAULT_WINDOW_DAYS = 28
+
+
+def resolve_window(start: Optional[date], end: Optional[date], default_days: int = DEFAULT_WINDOW_DAYS):
+    start = start or date.today()
+    end = end or start + timedelta(days=default_days - 1)
+    if end < start:
+        raise BadRequestException("'to' must not be before 'from'")
+    if (end - start).days >= AVAILABILITY_MAX_DAYS:
+        raise BadRequestException(f"Availability window is limited to {AVAILABILITY_MAX_DAYS} days")
+    return start, end
+
+
+def _dentist_availability(dentist_id: int, days: Dict[date, int]) -> dict:
+    return {
+        "dentist_id": dentist_id,
+        "slot_minutes": APPOINTMENT_SLOT_MINUTES,
+        "days": [{"date": day, "free": free_slots(bitmap)} for day, bitmap in sorted(days.items())],
+    }
+
+
+async def dentist_availability_service(
+    db: AsyncSession, dentist_id: int, start: Optional[date] = None, end: Optional[date] = None
+):
+    start, end = resolve_window(start, end)
+    if await db.get(Dentist, dentist_id) is None:
+        raise NotFoundException("Dentist", dentist_id)
+    bitmaps = await booked_bitmaps(db, [dentist_id], start, end)
+    return _dentist_availability(dentist_id, bitmaps[dentist_id])
+
+
+async def surgery_availability_service(
+    db: AsyncSession, surgery_id: int, start: Optional[date] = None, end: Optional[date] = None
+):
+    start, end = resolve_window(start, end)
+    dentist_ids = (await db.execute(
+        select(Dentist.id).where(Dentist.surgery_id == surgery_id).order_by(Dentist.id)
+    )).scalars().all()
+    if not dentist_ids and await db.get(Surgery, surgery_id) is None:
+        raise NotFoundException("Surgery", surgery_id)
+    bitmaps = await booked_bitmaps(db, dentist_ids, start, end)
+    return {
+        "surgery_id": surgery_id,
+        "dentists": [_dentist_availability(d, bitmaps[d]) for d in dentist_ids],
+    }
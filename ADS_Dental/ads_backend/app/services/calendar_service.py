@@ -0,0 +1,64 @@
+from datetime import date
+from itertools import groupby
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from app.db.calendar_versions import calendar_version, ensure_calendar_version
+from app.db.models import Appointment, Dentist, Patient
+from app.exceptions.http_exceptions import NotFoundException
+
+# Default calendar window: one week starting on the requested day (or today)
+DEFAULT_CALENDAR_DAYS = 7
+
+
+def calendar_etag(dentist_id: int, version: int, start: date, end: date) -> str:
+    return f'"cal-{dentist_id}-{version}-{start.isoformat()}-{end.isoformat()}"'
+
+
+async def dentist_calendar_version_service(db: AsyncSession, dentist_id: int) -> int:
+    version = await calendar_version(db, dentist_id)
+    if version is None:
+        if await db.get(Dentist, dentist_id) is None:
+            raise NotFoundException("Dentist", dentist_id)
+        version = await ensure_calendar_version(db, dentist_id)
+    return version
+
+
+async def dentist_calendar_service(db: AsyncSession, dentist_id: int, version: int, start: date, end: date):
+    # ``version`` must be read before the rows: a change landing in between then
+    # yields newer data under an older ETag, which only costs a later refetch.
+    rows = (await db.execute(
+        select(
+            Appointment.id,
+            Appointment.appointment_date,
+            Appointment.appointment_time,
+            Appointment.status,
+            Appointment.surgery_id,
+            Patient.id.label("patient_id"),
+            Patient.patient_no,
+            Patient.first_name,
+            Patient.last_name,
+        )
+        .join(Patient, Appointment.patient_id == Patient.id)
+        .where(Appointment.dentist_id == dentist_id, Appointment.appointment_date.between(start, end))
+        .order_by(Appointment.appointment_date, Appointment.appointment_time)
+    )).all()
+    days = [
+        {
+            "date": day,
+            "appointments": [
+                {
+                    "id": r.id,
+                    "appointment_time": r.appointment_time,
+                    "status": r.status,
+                    "surgery_id": r.surgery_id,
+                    "patient": {
+                        "id": r.patient_id, "patient_no": r.patient_no,
+                        "first_name": r.first_name, "last_name": r.last_name,
+                    },
+                }
+                for r in day_rows
+            ],
+        }
+        for day, day_rows in groupby(rows, key=lambda r: r.appointment_date)
+    ]
+    return {"dentist_id": dentist_id, "version": version, "days": days}
@@ -1,39 +1,27 @@
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.future import select
-from app.db.models import User, Dentist, Role
-from app.core.security import hash_password
+from app.db.models import Dentist
+from app.db.reference_data import SURGERIES, queue_reference_change
+from app.core.security import hash_password_async
+from app.exceptions.http_exceptions import BadRequestException
 from app.schemas.dentist_dto import DentistCreateDTO, DentistResponseDTO
-from fastapi import HTTPException
+from app.schemas.user_dto import RoleEnum
+from app.services.registration_service import insert_user, username_from_email
 
-async def register_dentist_service(db: AsyncSession, payload: DentistCreateDTO):
-    existing = await db.execute(select(User).where(User.email == str(payload.email)))
-    if existing.scalar_one_or_none():
-        raise HTTPException(status_code=400, detail="Email already registered")
-    username = str(payload.email).split("@")[0]
-    user = User(
-        email=payload.email,
-        username=username,
-        password_hash=hash_password(payload.password),
+async def register_dentist_service(db: AsyncSession, payload: DentistCreateDTO) -> DentistResponseDTO:
+    # User, role link and dentist INSERTs in one transaction (see registration_service)
+    password_hash = await hash_password_async(payload.password)
+    user_id = await insert_user(
+        db, payload.email, username_from_email(payload.email), password_hash, RoleEnum.DENTIST.value
     )
-    db.add(user)
-    await db.commit()
-    await db.refresh(user)
-    # Assign DENTIST role
-    role_dentist = await db.execute(select(Role).where(Role.name == "DENTIST"))
-    role_obj = role_dentist.scalar_one_or_none()
-    if role_obj:
-        user.roles.append(role_obj)
+    values = payload.model_dump(exclude={"password"})
+    try:
+        result = await db.execute(insert(Dentist).values(**values, user_id=user_id))
+        # Core insert: the surgery's cached dentist lists must be dropped explicitly
+        queue_reference_change(db.sync_session, SURGERIES)
         await db.commit()
-        await db.refresh(user)
-    dentist = Dentist(
-        user_id=user.id,
-        first_name=payload.first_name,
-        last_name=payload.last_name,
-        phone=payload.phone,
-        email=payload.email,
-        specialization=payload.specialization,
-        surgery_id=payload.surgery_id
-    )
-    db.add(dentist)
-    await db.commit()
-    await db.refresh(dentist)
+    except IntegrityError:
+        await db.rollback()
+        raise BadRequestException("Unknown surgery")
+    return DentistResponseDTO(id=result.inserted_primary_key[0], user_id=user_id, **values)
@@ -0,0 +1,111 @@
+# app/services/export_service.py
+# Full-table dumps for reporting. Each export is one flat, joined SELECT read
+# through a server-side cursor EXPORT_BATCH_SIZE rows at a time; every batch is
+# encoded (CSV, or NDJSON through a running gzip compressor) and handed to the
+# response before the next is fetched, so memory does not grow with the table.
+import csv
+import io
+import json
+import zlib
+from datetime import date, datetime, time
+from enum import Enum
+from typing import AsyncIterator, Callable, List, Sequence
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.sql import Select
+
+from app.core.config import EXPORT_BATCH_SIZE
+from app.db.models import Address, Appointment, AppointmentArchive, Dentist, Patient, Surgery
+
+EXPORT_FORMATS = ("csv", "ndjson")
+
+
+def patient_export_query() -> Select:
+    return (
+        select(
+            Patient.id, Patient.patient_no, Patient.first_name, Patient.last_name, Patient.phone, Patient.email,
+            Address.street, Address.city, Address.state, Address.zip_code,
+        )
+        .outerjoin(Address, Patient.address_id == Address.id)
+        .order_by(Patient.id)
+    )
+
+
+def appointment_export_query(archived: bool = False) -> Select:
+    source = AppointmentArchive if archived else Appointment
+    return (
+        select(
+            source.id, source.appointment_date, source.appointment_time, source.status,
+            Patient.id.label("patient_id"), Patient.patient_no,
+            Patient.first_name.label("patient_first_name"), Patient.last_name.label("patient_last_name"),
+            Dentist.id.label("dentist_id"),
+            Dentist.first_name.label("dentist_first_name"), Dentist.last_name.label("dentist_last_name"),
+            Surgery.id.label("surgery_id"), Surgery.surgery_no, Surgery.name.label("surgery_name"),
+        )
+        .join(Patient, source.patient_id == Patient.id)
+        .join(Dentist, source.dentist_id == Dentist.id)
+        .join(Surgery, source.surgery_id == Surgery.id)
+        .order_by(source.id)
+    )
+
+
+def _plain(value):
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (date, datetime, time)):
+        return value.isoformat()
+    return value
+
+
+def _csv_encoder(columns: Sequence[str]):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+
+    def drain() -> bytes:
+        data = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return data.encode("utf-8")
+
+    def encode(rows) -> bytes:
+        writer.writerows([_plain(v) for v in row] for row in rows)
+        return drain()
+
+    writer.writerow(columns)
+    return drain(), encode, lambda: b""
+
+
+def _gzip_ndjson_encoder(columns: Sequence[str]):
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)  # gzip container
+
+    def encode(rows) -> bytes:
+        lines = "".join(
+            json.dumps({c: _plain(v) for c, v in zip(columns, row)}, separators=(",", ":")) + "\n" for row in rows
+        )
+        return compressor.compress(lines.encode("utf-8"))
+
+    return b"", encode, compressor.flush
+
+
+def export_chunks(session_factory: async_sessionmaker, stmt: Select, fmt: str,
+                  batch_size: int = EXPORT_BATCH_SIZE) -> Callable[[], AsyncIterator[bytes]]:
+    """Response body for ``stmt`` in ``fmt``; opens its own session when iterated."""
+    columns: List[str] = [c.name for c in stmt.selected_columns]
+    make_encoder = _csv_encoder if fmt == "csv" else _gzip_ndjson_encoder
+
+    async def body() -> AsyncIterator[bytes]:
+        head, encode, finish = make_encoder(columns)
+        if head:
+            yield head
+        async with session_factory() as session:
+            result = await session.stream(stmt.execution_options(yield_per=batch_size))
+            async for rows in result.partitions():
+                data = encode(rows)
+                if data:
+                    yield data
+        tail = finish()
+        if tail:
+            yield tail
+
+    return body
@@ -0,0 +1,74 @@
+import json
+from email.message import EmailMessage
+from typing import Dict, Iterable, List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from app.core.config import MAIL_FROM
+from app.core.outbox_worker import utcnow
+from app.db.models import Appointment, Dentist, OutboxMessage, Patient, Surgery
+
+APPOINTMENT_CONFIRMATION = "appointment_confirmation"
+
+
+def enqueue_appointment_confirmations(db: AsyncSession, appointment_ids: Iterable[int]) -> None:
+    """Queue confirmations in ``db``'s transaction; they are only sent if it commits."""
+    now = utcnow()
+    db.add_all([
+        OutboxMessage(
+            kind=APPOINTMENT_CONFIRMATION,
+            payload=json.dumps({"appointment_id": appointment_id}),
+            next_attempt_at=now,
+        )
+        for appointment_id in appointment_ids
+    ])
+
+
+async def render_appointment_confirmations(
+    db: AsyncSession, messages: List[OutboxMessage]
+) -> Dict[int, Optional[EmailMessage]]:
+    """One query for the whole batch; None for appointments deleted since booking."""
+    wanted = {m.id: json.loads(m.payload)["appointment_id"] for m in messages}
+    rows = (await db.execute(
+        select(
+            Appointment.id,
+            Appointment.appointment_date,
+            Appointment.appointment_time,
+            Patient.first_name.label("patient_first_name"),
+            Patient.last_name.label("patient_last_name"),
+            Patient.email.label("patient_email"),
+            Dentist.first_name.label("dentist_first_name"),
+            Dentist.last_name.label("dentist_last_name"),
+            Surgery.name.label("surgery_name"),
+        )
+        .join(Patient, Appointment.patient_id == Patient.id)
+        .join(Dentist, Appointment.dentist_id == Dentist.id)
+        .join(Surgery, Appointment.surgery_id == Surgery.id)
+        .where(Appointment.id.in_(set(wanted.values())))
+    )).all()
+    by_id = {r.id: r for r in rows}
+
+    emails: Dict[int, Optional[EmailMessage]] = {}
+    for message_id, appointment_id in wanted.items():
+        row = by_id.get(appointment_id)
+        if row is None or not row.patient_email:
+            emails[message_id] = None
+            continue
+        when = f"{row.appointment_date:%A %d %B %Y} at {row.appointment_time:%H:%M}"
+        email = EmailMessage()
+        email["From"] = MAIL_FROM
+        email["To"] = row.patient_email
+        email["Subject"] = f"Appointment confirmed: {row.appointment_date:%d %b %Y} {row.appointment_time:%H:%M}"
+        email.set_content(
+            f"Dear {row.patient_first_name} {row.patient_last_name},\n\n"
+            f"Your appointment with Dr {row.dentist_first_name} {row.dentist_last_name} "
+            f"at {row.surgery_name} on {when} is confirmed.\n\n"
+            "ADS Dental Surgeries\n"
+        )
+        emails[message_id] = email
+    return emails
+
+
+# Outbox message kinds and how to turn a batch of them into emails
+OUTBOX_RENDERERS = {
+    APPOINTMENT_CONFIRMATION: render_appointment_confirmations,
+}
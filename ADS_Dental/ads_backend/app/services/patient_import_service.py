@@ -0,0 +1,259 @@
+# app/services/patient_import_service.py
+# Bulk patient onboarding. The upload is read as a byte stream and parsed
+# record by record (CSV with a header row, or NDJSON), so memory is bounded by
+# one batch, not by the file. Each batch is validated, de-duplicated by email
+# (within the file and against existing users) and written in one transaction
+# with a few multi-row INSERTs. Rows without a password, or every row when
+# ``invite`` is set, skip bcrypt and get an invite token instead.
+import asyncio
+import codecs
+import csv
+import json
+import logging
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import func, insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import PATIENT_IMPORT_BATCH_SIZE
+from app.core.security import INVITE_PENDING_PASSWORD, create_invite_token, hash_password_async, password_hasher
+from app.db.models import Address, Patient, User, user_roles
+from app.db.number_blocks import patient_numbers
+from app.db.role_ids import role_id
+from app.db.search_index import SEARCH_FIELDS, index_patients
+from app.exceptions.http_exceptions import ConflictException
+from app.schemas.patient_dto import PatientImportDTO, PatientImportStatus
+from app.schemas.user_dto import RoleEnum
+from app.services.registration_service import username_from_email
+
+logger = logging.getLogger(__name__)
+
+CSV_ADDRESS_FIELDS = ("street", "city", "state", "zip_code")
+USERNAME_LENGTH = 60
+
+Record = Tuple[int, object]  # (1-based row number, parsed dict or a parse error message)
+
+
+async def _lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *complete, pending = pending.split("\n")
+        for line in complete:
+            yield line.rstrip("\r")
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending.rstrip("\r")
+
+
+async def ndjson_records(chunks: AsyncIterator[bytes]) -> AsyncIterator[Record]:
+    row = 0
+    async for line in _lines(chunks):
+        if not line.strip():
+            continue
+        row += 1
+        try:
+            yield row, json.loads(line)
+        except ValueError as e:
+            yield row, f"invalid JSON: {e}"
+
+
+def _csv_row(header: List[str], values: List[str]) -> dict:
+    raw = {k: v for k, v in zip(header, values) if v != ""}
+    address = {f: raw.pop(f) for f in CSV_ADDRESS_FIELDS if f in raw}
+    if address:
+        raw["address"] = address
+    return raw
+
+
+async def csv_records(chunks: AsyncIterator[bytes]) -> AsyncIterator[Record]:
+    header: Optional[List[str]] = None
+    row = 0
+    record = ""
+    async for line in _lines(chunks):
+        # A quoted field may contain newlines: keep joining physical lines
+        # until the record's quotes balance
+        record = f"{record}\n{line}" if record else line
+        if record.count('"') % 2:
+            continue
+        line, record = record, ""
+        if not line.strip():
+            continue
+        values = next(csv.reader([line]))
+        if header is None:
+            header = [h.strip().lower() for h in values]
+            continue
+        row += 1
+        if len(values) > len(header):
+            yield row, f"expected {len(header)} columns, got {len(values)}"
+        else:
+            yield row, _csv_row(header, values)
+    if record:
+        yield row + 1, "unterminated quoted field"
+
+
+async def _hash_passwords(passwords: List[Optional[str]]) -> List[str]:
+    # At most one bcrypt per hashing worker at a time, so a big import never
+    # trips the pool's overflow guard meant for login bursts
+    limit = asyncio.Semaphore(password_hasher.workers)
+
+    async def one(password: Optional[str]) -> str:
+        if password is None:
+            return INVITE_PENDING_PASSWORD
+        async with limit:
+            return await hash_password_async(password)
+
+    return await asyncio.gather(*(one(p) for p in passwords))
+
+
+def _validation_errors(error: ValidationError) -> List[str]:
+    return [f"{'.'.join(str(p) for p in e['loc']) or 'row'}: {e['msg']}" for e in error.errors()]
+
+
+class PatientImport:
+    def __init__(self, db: AsyncSession, invite: bool = False, batch_size: int = PATIENT_IMPORT_BATCH_SIZE):
+        self.db = db
+        self.invite = invite
+        self.batch_size = batch_size
+        self.seen_emails = set()
+        self.results: List[dict] = []
+
+    def _report(self, row: int, status: PatientImportStatus, **fields) -> None:
+        self.results.append({"row": row, "status": status, **fields})
+
+    def _validate(self, batch: List[Record]) -> List[Tuple[int, PatientImportDTO]]:
+        valid = []
+        for row, raw in batch:
+            if isinstance(raw, str):
+                self._report(row, PatientImportStatus.INVALID, errors=[raw])
+                continue
+            try:
+                dto = PatientImportDTO.model_validate(raw)
+            except ValidationError as e:
+                self._report(row, PatientImportStatus.INVALID, errors=_validation_errors(e))
+                continue
+            email = str(dto.email).lower()
+            if email in self.seen_emails:
+                self._report(row, PatientImportStatus.DUPLICATE, errors=["email appears earlier in the file"])
+                continue
+            self.seen_emails.add(email)
+            valid.append((row, dto))
+        return valid
+
+    async def _taken(self, column, values) -> set:
+        values = set(values)
+        if not values:
+            return set()
+        return set((await self.db.execute(select(column).where(column.in_(values)))).scalars().all())
+
+    async def _insert(self, rows: List[Tuple[int, PatientImportDTO]]) -> None:
+        db = self.db
+        # Case-insensitive, as within the file and in MySQL's default collation
+        taken_emails = await self._taken(func.lower(User.email), (str(dto.email).lower() for _, dto in rows))
+        fresh = []
+        for row, dto in rows:
+            if str(dto.email).lower() in taken_emails:
+                self._report(row, PatientImportStatus.DUPLICATE, errors=["email already registered"])
+            else:
+                fresh.append((row, dto))
+        if not fresh:
+            await db.commit()
+            return
+        # Compared case-insensitively, as MySQL's default collation does
+        taken_usernames = {u.lower() for u in await self._taken(
+            User.username, (username_from_email(dto.email) for _, dto in fresh)
+        )}
+        patient_role = await role_id(db, RoleEnum.PATIENT.value)
+        await db.commit()  # no transaction held while bcrypt runs
+
+        password_hashes = await _hash_passwords([None if self.invite else dto.password for _, dto in fresh])
+        patient_nos = [await patient_numbers.allocate(db.bind) for _ in fresh]
+
+        users, patients = [], []
+        for (row, dto), patient_no, password_hash in zip(fresh, patient_nos, password_hashes):
+            username = username_from_email(dto.email)[:USERNAME_LENGTH]
+            if username.lower() in taken_usernames:
+                # Patient numbers are unique, so this suffix always is too
+                username = f"{username[:USERNAME_LENGTH - len(patient_no)]}.{patient_no[1:]}"
+            taken_usernames.add(username.lower())
+            users.append({"email": str(dto.email), "username": username, "password_hash": password_hash})
+            patients.append({
+                "patient_no": patient_no, "first_name": dto.first_name, "last_name": dto.last_name,
+                "phone": dto.phone, "email": str(dto.email),
+            })
+
+        await db.execute(insert(User), users)
+        user_ids = dict((await db.execute(
+            select(User.email, User.id).where(User.email.in_([u["email"] for u in users]))
+        )).all())
+        if patient_role is not None:
+            await db.execute(insert(user_roles), [{"user_id": user_ids[u["email"]], "role_id": patient_role} for u in users])
+        # Addresses have no natural key to re-select by: let the ORM batch them
+        # (one multi-row INSERT ... RETURNING where the backend supports it)
+        addresses = {i: Address(**dto.address.model_dump()) for i, (_, dto) in enumerate(fresh) if dto.address}
+        db.add_all(addresses.values())
+        await db.flush()
+        for i, patient in enumerate(patients):
+            patient["user_id"] = user_ids[patient["email"]]
+            patient["address_id"] = addresses[i].id if i in addresses else None
+        await db.execute(insert(Patient), patients)
+        patient_ids = dict((await db.execute(
+            select(Patient.patient_no, Patient.id).where(Patient.patient_no.in_(patient_nos))
+        )).all())
+        indexed = [{"id": patient_ids[p["patient_no"]], **{f: p[f] for f in SEARCH_FIELDS}} for p in patients]
+        await db.run_sync(lambda session: index_patients(session.connection(), indexed, replace=False))
+        await db.commit()
+
+        for (row, dto), patient, password_hash in zip(fresh, patients, password_hashes):
+            self._report(
+                row, PatientImportStatus.CREATED,
+                patient_id=patient_ids[patient["patient_no"]], patient_no=patient["patient_no"],
+                invite_token=create_invite_token(patient["email"]) if password_hash == INVITE_PENDING_PASSWORD else None,
+            )
+
+    async def _import_batch(self, batch: List[Record], attempts: int = 2) -> None:
+        rows = self._validate(batch)
+        reported = len(self.results)
+        for _ in range(attempts):
+            try:
+                return await self._insert(rows)
+            except IntegrityError:
+                # An email or username was registered concurrently; re-check the batch
+                await self.db.rollback()
+                del self.results[reported:]
+        raise ConflictException(f"Patients changed concurrently, rows from {batch[0][0]} on were not imported")
+
+    async def run(self, records: AsyncIterator[Record]) -> dict:
+        batch: List[Record] = []
+        received = 0
+        async for record in records:
+            batch.append(record)
+            received += 1
+            if len(batch) >= self.batch_size:
+                await self._import_batch(batch)
+                batch = []
+                logger.info("Patient import: %s rows processed", received)
+        if batch:
+            await self._import_batch(batch)
+
+        counts: Dict[PatientImportStatus, int] = {s: 0 for s in PatientImportStatus}
+        for result in self.results:
+            counts[result["status"]] += 1
+        self.results.sort(key=lambda r: r["row"])
+        return {
+            "received": received,
+            "created": counts[PatientImportStatus.CREATED],
+            "duplicates": counts[PatientImportStatus.DUPLICATE],
+            "invalid": counts[PatientImportStatus.INVALID],
+            "results": self.results,
+        }
+
+
+async def import_patients_service(
+    db: AsyncSession, chunks: AsyncIterator[bytes], csv_format: bool, invite: bool = False
+) -> dict:
+    records = csv_records(chunks) if csv_format else ndjson_records(chunks)
+    return await PatientImport(db, invite).run(records)
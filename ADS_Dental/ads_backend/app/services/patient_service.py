@@ -1,43 +1,76 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from app.db.models import User, Patient, Address, Role
-from app.core.security import hash_password
+from sqlalchemy import insert
+from app.db.models import Patient, Address
+from app.core.security import hash_password_async
+from app.core.principal import invalidate_principal
+from app.core.response_cache import PATIENT, response_cache
 from app.schemas.patient_dto import PatientDTO, PatientCreateDTO
+from app.schemas.address_dto import AddressDTO
+from app.schemas.user_dto import RoleEnum
 from fastapi import HTTPException
-import random
-from datetime import datetime
-from sqlalchemy.orm import selectinload
+from app.db.load_plans import load_plan
+from app.db.number_blocks import patient_numbers
+from app.db.pagination import paginate, DEFAULT_PAGE_SIZE
+from app.db.projections import patient_projection, row_to_patient_dto
+from app.db.routing import read_from_primary
+from app.core.config import STREAM_BATCH_SIZE, SEARCH_RESULT_LIMIT
+from app.db.search_index import MIN_QUERY_LENGTH, index_patients, normalize_query, ranked_patient_ids
+from app.services.registration_service import insert_address, insert_user, username_from_email
+from typing import AsyncIterator, Optional
 
-async def list_patients_service(db: AsyncSession):
-    result = await db.execute(
+async def list_patients_service(db: AsyncSession, limit: int = DEFAULT_PAGE_SIZE, after: Optional[str] = None):
+    rows, next_cursor = await paginate(
+        db,
+        patient_projection(),
+        (Patient.last_name, Patient.id),
+        limit,
+        after,
+        row_keys=("patient_last_name", "patient_id"),
+    )
+    return {"items": [row_to_patient_dto(r) for r in rows], "next_cursor": next_cursor}
+
+async def stream_patients_service(db: AsyncSession) -> AsyncIterator[PatientDTO]:
+    stmt = (
         select(Patient)
-        .options(selectinload(Patient.address))
-        .order_by(Patient.last_name.asc())
+        .options(*load_plan("patient_summary"))
+        .order_by(Patient.last_name.asc(), Patient.id.asc())
+        .execution_options(yield_per=STREAM_BATCH_SIZE)
     )
-    patients = result.scalars().all()
-    return patients
+    result = await db.stream(stmt)
+    async for patient in result.scalars():
+        yield PatientDTO.model_validate(patient)
 
 async def get_patient_by_id_service(db: AsyncSession, patient_id: int):
-    patient = await db.get(Patient, patient_id)
+    patient = await db.get(Patient, patient_id, options=load_plan("patient_summary"))
     if not patient:
         raise HTTPException(status_code=404, detail="Patient not found")
     return patient
 
+async def cached_patient_service(db: AsyncSession, patient_id: int) -> bytes:
+    """PatientDTO JSON for ``patient_id``, from the response cache when possible."""
+    async def load() -> bytes:
+        read_from_primary(db)
+        patient = await get_patient_by_id_service(db, patient_id)
+        return PatientDTO.model_validate(patient).model_dump_json().encode("utf-8")
+
+    return await response_cache.get_or_load(PATIENT, patient_id, load)
+
 async def create_patient_service(db: AsyncSession, payload: PatientDTO) -> PatientDTO:
-    patient = Patient(**payload.model_dump())
+    patient = Patient(**payload.model_dump(exclude={"address"}))
     db.add(patient)
     await db.commit()
-    await db.refresh(patient)
+    patient = await db.get(Patient, patient.id, options=load_plan("patient_summary"), populate_existing=True)
     return PatientDTO.model_validate(patient)
 
 async def update_patient_service(db: AsyncSession, patient_id: int, payload: PatientDTO) -> PatientDTO:
-    patient = await db.get(Patient, patient_id)
+    patient = await db.get(Patient, patient_id, options=load_plan("patient_summary"))
     if not patient:
         raise HTTPException(status_code=404, detail="Patient not found")
-    for k, v in payload.model_dump(exclude_unset=True).items():
+    for k, v in payload.model_dump(exclude_unset=True, exclude={"id", "address"}).items():
         setattr(patient, k, v)
     await db.commit()
-    await db.refresh(patient)
+    await response_cache.invalidate((PATIENT, patient_id))
     return PatientDTO.model_validate(patient)
 
 async def delete_patient_service(db: AsyncSession, patient_id: int):
@@ -46,73 +79,64 @@ async def delete_patient_service(db: AsyncSession, patient_id: int):
         raise HTTPException(status_code=404, detail="Patient not found")
     await db.delete(patient)
     await db.commit()
+    await response_cache.invalidate((PATIENT, patient_id))
+    if patient.user_id is not None:
+        invalidate_principal(patient.user_id)
 
-async def search_patient_service(db: AsyncSession, searchString: str):
-    like = f"%{searchString.strip()}%"
-    stmt = select(Patient).where(
-        Patient.first_name.ilike(like) |
-        Patient.last_name.ilike(like) |
-        Patient.patient_no.ilike(like) |
-        Patient.email.ilike(like) |
-        Patient.phone.ilike(like)
+async def search_patient_service(db: AsyncSession, searchString: str, limit: int = SEARCH_RESULT_LIMIT):
+    # Ranked: exact patient_no/email first, then prefix matches, then substrings
+    query = normalize_query(searchString)
+    if len(query) < MIN_QUERY_LENGTH:
+        return []
+    ranked = ranked_patient_ids(query)
+    stmt = (
+        patient_projection()
+        .join(ranked, ranked.c.patient_id == Patient.id)
+        .order_by(ranked.c.rank, Patient.last_name, Patient.id)
+        .limit(limit)
     )
-    patients = (await db.execute(stmt)).scalars().all()
-    return [PatientDTO.model_validate(p) for p in patients]
+    rows = (await db.execute(stmt)).all()
+    return [row_to_patient_dto(r) for r in rows]
 
-async def list_addresses_service(db: AsyncSession):
-    result = await db.execute(
-        select(Address)
-        .options(selectinload(Address.patients))
-        .order_by(Address.city.asc())
+async def list_addresses_service(db: AsyncSession, limit: int = DEFAULT_PAGE_SIZE, after: Optional[str] = None):
+    addresses, next_cursor = await paginate(
+        db,
+        select(Address).options(*load_plan("address_summary")),
+        (Address.city, Address.id),
+        limit,
+        after,
     )
-    addresses = result.scalars().all()
-    return addresses
+    return {"items": addresses, "next_cursor": next_cursor}
 
-async def register_patient_service(db: AsyncSession, payload: PatientCreateDTO):
+async def register_patient_service(db: AsyncSession, payload: PatientCreateDTO) -> PatientDTO:
+    """
+    One transaction of plain INSERTs (user, role link, address, patient, search
+    terms) and a COMMIT; the response is built from the payload and the keys
+    the INSERTs returned rather than by reloading the patient.
+    """
     from sqlalchemy.exc import SQLAlchemyError
-    patient_no = f"P{datetime.now().strftime('%Y%m%d')}{random.randint(100,999)}"
+    # From this process's reserved block: no round trip, no unique-key retries
+    patient_no = await patient_numbers.allocate(db.bind)
+    password_hash = await hash_password_async(payload.password)
     try:
-        # Save Patient first
-        address = None
-        if payload.address:
-            address = Address(**payload.address.model_dump())
-            db.add(address)
-            await db.flush()
-            await db.refresh(address)
-        patient = Patient(
-            patient_no=patient_no,
-            first_name=payload.first_name,
-            last_name=payload.last_name,
-            phone=payload.phone,
-            email=payload.email,
-            address_id=address.id if address else None
-        )
-        db.add(patient)
-        await db.flush()
-        await db.refresh(patient)
-        # Save User and link to Patient only if Patient was added
-        username = str(payload.email).split("@")[0]
-        user = User(
-            email=payload.email,
-            username=username,
-            password_hash=hash_password(payload.password),
+        user_id = await insert_user(
+            db, payload.email, username_from_email(payload.email), password_hash, RoleEnum.PATIENT.value
         )
-        db.add(user)
-        await db.flush()
-        await db.refresh(user)
-        # Assign PATIENT role
-        role_patient = await db.execute(select(Role).where(Role.name == "PATIENT"))
-        role_obj = role_patient.scalar_one_or_none()
-        if role_obj:
-            user.roles.append(role_obj)
-            await db.flush()
-            await db.refresh(user)
-        # Link patient to user
-        patient.user_id = user.id
-        await db.flush()
-        await db.refresh(patient)
+        address_id = await insert_address(db, payload.address)
+        values = {
+            "patient_no": patient_no,
+            "first_name": payload.first_name,
+            "last_name": payload.last_name,
+            "phone": payload.phone,
+            "email": str(payload.email),
+        }
+        result = await db.execute(insert(Patient).values(**values, user_id=user_id, address_id=address_id))
+        patient_id = result.inserted_primary_key[0]
+        # Core INSERT: index the new patient for search explicitly
+        await db.run_sync(lambda session: index_patients(session.connection(), [{"id": patient_id, **values}], replace=False))
         await db.commit()
-        return patient
     except SQLAlchemyError as e:
         await db.rollback()
-        raise HTTPException(status_code=500, detail=f"Registration failed: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Registration failed: {str(e)}")
+    address = AddressDTO(id=address_id, **payload.address.model_dump()) if payload.address else None
+    return PatientDTO(id=patient_id, **values, address=address)
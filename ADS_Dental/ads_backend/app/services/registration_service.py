@@ -0,0 +1,51 @@
+# app/services/registration_service.py
+# Shared building blocks for creating accounts (patients, dentists, users).
+# Every row is written with a Core INSERT whose generated key comes straight
+# back from the statement, so a registration is a handful of INSERTs and one
+# COMMIT: no existence SELECTs, no role lookup, no flush/refresh cycles. The
+# password is hashed before the transaction starts.
+from typing import Optional
+
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models import Address, User, user_roles
+from app.db.role_ids import role_id
+from app.db.routing import mark_sticky
+from app.exceptions.http_exceptions import BadRequestException
+from app.schemas.address_dto import AddressCreateDTO
+
+
+def username_from_email(email: str) -> str:
+    return str(email).split("@")[0]
+
+
+async def insert_address(db: AsyncSession, address: Optional[AddressCreateDTO]) -> Optional[int]:
+    if address is None:
+        return None
+    result = await db.execute(insert(Address).values(**address.model_dump()))
+    return result.inserted_primary_key[0]
+
+
+async def insert_user(db: AsyncSession, email: str, username: str, password_hash: str, role: str) -> int:
+    """
+    INSERT the user and its role link. A duplicate email or username rolls
+    the transaction back and is reported as a 400, like the old pre-check.
+    """
+    try:
+        result = await db.execute(
+            insert(User).values(email=str(email), username=username, password_hash=password_hash)
+        )
+    except IntegrityError as e:
+        await db.rollback()
+        if "username" in str(e.orig):
+            raise BadRequestException("Username already taken")
+        raise BadRequestException("Email already registered")
+    user_id = result.inserted_primary_key[0]
+    # The new user's first requests must not read a replica that lacks them
+    mark_sticky(db, str(email))
+    linked_role = await role_id(db, role)
+    if linked_role is not None:
+        await db.execute(insert(user_roles).values(user_id=user_id, role_id=linked_role))
+    return user_id
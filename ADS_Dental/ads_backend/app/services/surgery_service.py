@@ -1,12 +1,49 @@
+from pydantic import TypeAdapter
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from app.db.models import Surgery
+from app.db.models import Dentist, Surgery
+from app.db.load_plans import load_plan
+from app.db.pagination import paginate, DEFAULT_PAGE_SIZE
+from app.db.reference_data import SURGERIES, CachedBody, cached_body
+from app.db.routing import read_from_primary
+from app.exceptions.http_exceptions import NotFoundException
+from app.schemas.common import Page
+from app.schemas.dentist_dto import DentistResponseDTO
+from app.schemas.surgery_dto import SurgeryDTO
+from typing import List, Optional
 
+_surgery_page = TypeAdapter(Page[SurgeryDTO])
+_dentist_list = TypeAdapter(List[DentistResponseDTO])
 
-async def list_surgeries_service(db: AsyncSession):
-    result = await db.execute(
-        select(Surgery)
-        .order_by(Surgery.name.asc())
+
+async def list_surgeries_service(db: AsyncSession, limit: int = DEFAULT_PAGE_SIZE, after: Optional[str] = None):
+    surgeries, next_cursor = await paginate(
+        db,
+        select(Surgery).options(*load_plan("surgery_summary")),
+        (Surgery.name, Surgery.id),
+        limit,
+        after,
     )
-    surgeries = result.scalars().all()
-    return surgeries
\ No newline at end of file
+    return {"items": surgeries, "next_cursor": next_cursor}
+
+
+async def cached_surgeries_service(db: AsyncSession, limit: int = DEFAULT_PAGE_SIZE, after: Optional[str] = None) -> CachedBody:
+    async def load() -> bytes:
+        read_from_primary(db)
+        page = await list_surgeries_service(db, limit, after)
+        return _surgery_page.dump_json(_surgery_page.validate_python(page, from_attributes=True))
+
+    return await cached_body((SURGERIES, "page", limit, after), load)
+
+
+async def cached_surgery_dentists_service(db: AsyncSession, surgery_id: int) -> CachedBody:
+    async def load() -> bytes:
+        read_from_primary(db)
+        if await db.get(Surgery, surgery_id) is None:
+            raise NotFoundException("Surgery", surgery_id)
+        dentists = (await db.execute(
+            select(Dentist).where(Dentist.surgery_id == surgery_id).order_by(Dentist.id)
+        )).scalars().all()
+        return _dentist_list.dump_json(_dentist_list.validate_python(dentists, from_attributes=True))
+
+    return await cached_body((SURGERIES, "dentists", surgery_id), load)
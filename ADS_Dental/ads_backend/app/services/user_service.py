@@ -1,10 +1,22 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from fastapi import HTTPException
-from app.db.models import User, Role, Dentist
+from app.db.models import Patient, User, Role
 from app.schemas.user_dto import UserDTO, UserCreateDTO, UserUpdateDTO, RoleEnum
-from app.core.security import hash_password
-from typing import List
+from app.schemas.common import Page, trusted
+from app.core.security import hash_password_async
+from app.core.principal import invalidate_principal
+from app.core.response_cache import PATIENT, USER, response_cache
+from app.db.availability import queue_patient_removal
+from app.db.calendar_versions import bump_patient_calendars
+from app.db.load_plans import load_plan
+from app.db.pagination import paginate, DEFAULT_PAGE_SIZE
+from app.db.weekly_bookings import release_patient_bookings
+from app.db.projections import user_projection, row_to_user_dto
+from app.db.routing import read_from_primary
+from app.core.config import STREAM_BATCH_SIZE
+from app.services.registration_service import insert_user
+from typing import AsyncIterator, List, Optional
 
 def user_to_dto(user: User) -> UserDTO:
     # Map the first role (if any) to the DTO
@@ -18,45 +30,47 @@ def user_to_dto(user: User) -> UserDTO:
     )
 
 async def create_user_service(db: AsyncSession, payload: UserCreateDTO) -> UserDTO:
-    existing = await db.execute(select(User).where(User.email == str(payload.email) or User.username == payload.username))
-    user_exists = existing.scalar_one_or_none()
-    if user_exists:
-        raise HTTPException(status_code=400, detail="User already registered")
-    user = User(
-        email=payload.email,
-        username=payload.username,
-        password_hash=hash_password(payload.password),
-    )
-    db.add(user)
+    password_hash = await hash_password_async(payload.password)
+    user_id = await insert_user(db, payload.email, payload.username, password_hash, payload.role.value)
     await db.commit()
-    await db.refresh(user)
-    # Assign role
-    role = await db.execute(select(Role).where(Role.name == payload.role.value))
-    role_obj = role.scalar_one_or_none()
-    if role_obj:
-        user.roles.append(role_obj)
-        await db.commit()
-        await db.refresh(user)
-    return user_to_dto(user)
+    return UserDTO(id=user_id, email=payload.email, username=payload.username, role=payload.role)
 
-async def list_users_service(db: AsyncSession) -> List[UserDTO]:
-    stmt = select(User)
-    users = (await db.execute(stmt)).scalars().all()
-    return [user_to_dto(u) for u in users]
+async def list_users_service(db: AsyncSession, limit: int = DEFAULT_PAGE_SIZE, after: Optional[str] = None) -> Page[UserDTO]:
+    rows, next_cursor = await paginate(db, user_projection(), (User.id,), limit, after, row_keys=("id",))
+    return trusted(Page[UserDTO], items=[row_to_user_dto(r) for r in rows], next_cursor=next_cursor)
+
+async def stream_users_service(db: AsyncSession) -> AsyncIterator[UserDTO]:
+    stmt = (
+        select(User)
+        .options(*load_plan("user_with_roles"))
+        .order_by(User.id.asc())
+        .execution_options(yield_per=STREAM_BATCH_SIZE)
+    )
+    result = await db.stream(stmt)
+    async for user in result.scalars():
+        yield user_to_dto(user)
 
 async def get_user_service(db: AsyncSession, user_id: int) -> UserDTO:
-    user = await db.get(User, user_id)
+    user = await db.get(User, user_id, options=load_plan("user_with_roles"))
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     return user_to_dto(user)
 
+async def cached_user_service(db: AsyncSession, user_id: int) -> bytes:
+    """UserDTO JSON for ``user_id``, from the response cache when possible."""
+    async def load() -> bytes:
+        read_from_primary(db)
+        return (await get_user_service(db, user_id)).model_dump_json().encode("utf-8")
+
+    return await response_cache.get_or_load(USER, user_id, load)
+
 async def update_user_service(db: AsyncSession, user_id: int, payload: UserUpdateDTO) -> UserDTO:
-    user = await db.get(User, user_id)
+    user = await db.get(User, user_id, options=load_plan("user_with_roles"))
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     update_data = payload.model_dump(exclude_unset=True)
     if "password" in update_data and update_data["password"]:
-        update_data["password_hash"] = hash_password(update_data.pop("password"))
+        update_data["password_hash"] = await hash_password_async(update_data.pop("password"))
     for k, v in update_data.items():
         setattr(user, k, v)
     # Update role if provided
@@ -66,46 +80,25 @@ async def update_user_service(db: AsyncSession, user_id: int, payload: UserUpdat
         if role_obj:
             user.roles = [role_obj]
     await db.commit()
-    await db.refresh(user)
+    invalidate_principal(user.id)
+    await response_cache.invalidate((USER, user_id))
     return user_to_dto(user)
 
 async def delete_user_service(db: AsyncSession, user_id: int):
     user = await db.get(User, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
-    await db.delete(user)
-    await db.commit()
+    # The database cascades the delete to the user's patient profile
+    patient_ids = (await db.execute(select(Patient.id).where(Patient.user_id == user_id))).scalars().all()
+    # The Patient listeners do not see that cascade: release its places, bump
+    # the calendars and drop the availability it removes appointments from here
+    def before_cascade(session):
+        release_patient_bookings(session.connection(), patient_ids)
+        bump_patient_calendars(session.connection(), patient_ids)
+        queue_patient_removal(session, session.connection(), patient_ids)
 
-async def register_dentist_service(db: AsyncSession, payload: UserCreateDTO):
-    existing = await db.execute(select(User).where(User.email == str(payload.email)))
-    if existing.scalar_one_or_none():
-        raise HTTPException(status_code=400, detail="Email already registered")
-    username = str(payload.email).split("@")[0]
-    user = User(
-        email=payload.email,
-        username=username,
-        password_hash=hash_password(payload.password),
-    )
-    db.add(user)
-    await db.commit()
-    await db.refresh(user)
-    # Assign DENTIST role
-    role_dentist = await db.execute(select(Role).where(Role.name == "DENTIST"))
-    role_obj = role_dentist.scalar_one_or_none()
-    if role_obj:
-        user.roles.append(role_obj)
-        await db.commit()
-        await db.refresh(user)
-    dentist = Dentist(
-        user_id=user.id,
-        first_name=payload.first_name,
-        last_name=payload.last_name,
-        phone=payload.phone,
-        email=payload.email,
-        specialization=payload.specialization,
-        surgery_id=payload.surgery_id
-    )
-    db.add(dentist)
+    await db.run_sync(before_cascade)
+    await db.delete(user)
     await db.commit()
-    await db.refresh(dentist)
-    return dentist
+    invalidate_principal(user_id)
+    await response_cache.invalidate((USER, user_id), *((PATIENT, p) for p in patient_ids))
@@ -0,0 +1,149 @@
+import os
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite://")
+
+from datetime import date, time
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+from app.main import app
+from app.db.session import get_database, get_session_factory
+from app.db.models import Base, Address, Surgery, Dentist, Patient, Appointment, User, Role
+from app.core.security import hash_password, create_access_token, claims_cache
+from app.core.principal import principal_cache
+from app.db.availability import availability_cache
+from app.db.reference_data import reference_cache
+from app.core.response_cache import MemoryBackend, response_cache
+from app.db.number_blocks import patient_numbers
+from app.db.weekly_bookings import rebuild_weekly_bookings
+
+
+def _enable_foreign_keys(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
+
+def seed(session):
+    password_hash = hash_password("password")
+    addr1 = Address(street="123 West Avenue", city="Phoenix", state="AZ", zip_code="85012")
+    addr2 = Address(street="900 Johns Street", city="Cleveland", state="OH", zip_code="43098")
+    addr3 = Address(street="45 Green Street", city="Dallas", state="TX", zip_code="75201")
+    session.add_all([addr1, addr2, addr3])
+    session.flush()
+
+    surg1 = Surgery(surgery_no="S001", name="Bells Court Dental", phone="602-555-1234", address_id=addr1.id)
+    surg2 = Surgery(surgery_no="S002", name="The Galleria Surgery", phone="216-555-5678", address_id=addr2.id)
+    session.add_all([surg1, surg2])
+    session.flush()
+
+    role_admin, role_dentist, role_patient = Role(name="ADMIN"), Role(name="DENTIST"), Role(name="PATIENT")
+    session.add_all([role_admin, role_dentist, role_patient])
+    session.flush()
+
+    admin = User(username="admin", email="admin@ads.com", password_hash=password_hash, roles=[role_admin])
+    u_d1 = User(username="tsmith", email="tsmith@ads.com", password_hash=password_hash, roles=[role_dentist])
+    u_d2 = User(username="hpearson", email="hpearson@ads.com", password_hash=password_hash, roles=[role_dentist])
+    u_p1 = User(username="gwhite", email="gwhite@mail.com", password_hash=password_hash, roles=[role_patient])
+    u_p2 = User(username="jbell", email="jbell@mail.com", password_hash=password_hash, roles=[role_patient])
+    u_p3 = User(username="ianm", email="ianm@mail.com", password_hash=password_hash, roles=[role_patient])
+    session.add_all([admin, u_d1, u_d2, u_p1, u_p2, u_p3])
+    session.flush()
+
+    d1 = Dentist(user_id=u_d1.id, first_name="Tony", last_name="Smith", specialization="General",
+                 phone="480-123-1111", email="tsmith@ads.com", surgery_id=surg1.id)
+    d2 = Dentist(user_id=u_d2.id, first_name="Helen", last_name="Pearson", specialization="Orthodontics",
+                 phone="480-123-2222", email="hpearson@ads.com", surgery_id=surg2.id)
+    session.add_all([d1, d2])
+    session.flush()
+
+    p1 = Patient(user_id=u_p1.id, patient_no="P001", first_name="Gillian", last_name="White",
+                 email="gwhite@mail.com", address_id=addr1.id)
+    p2 = Patient(user_id=u_p2.id, patient_no="P002", first_name="Jill", last_name="Bell",
+                 email="jbell@mail.com", address_id=addr1.id)
+    p3 = Patient(user_id=u_p3.id, patient_no="P003", first_name="Ian", last_name="MacKay",
+                 email="ianm@mail.com", address_id=addr2.id)
+    session.add_all([p1, p2, p3])
+    session.flush()
+
+    session.add_all([
+        Appointment(appointment_date=date(2013, 9, 12), appointment_time=time(9, 0), status="BOOKED",
+                    patient_id=p1.id, dentist_id=d1.id, surgery_id=surg1.id),
+        Appointment(appointment_date=date(2013, 9, 12), appointment_time=time(10, 0), status="BOOKED",
+                    patient_id=p2.id, dentist_id=d1.id, surgery_id=surg1.id),
+        Appointment(appointment_date=date(2013, 9, 13), appointment_time=time(11, 0), status="BOOKED",
+                    patient_id=p3.id, dentist_id=d2.id, surgery_id=surg2.id),
+    ])
+    session.flush()
+    rebuild_weekly_bookings(session.connection())
+    session.commit()
+
+
+@pytest.fixture
+def database_url(tmp_path):
+    path = tmp_path / "ads_test.db"
+    sync_engine = create_engine(f"sqlite:///{path}")
+    event.listen(sync_engine, "connect", _enable_foreign_keys)
+    Base.metadata.create_all(sync_engine)
+    with sessionmaker(bind=sync_engine)() as session:
+        seed(session)
+    sync_engine.dispose()
+    return f"sqlite+aiosqlite:///{path}"
+
+
+@pytest.fixture
+def engine(database_url):
+    engine = create_async_engine(database_url, poolclass=NullPool, connect_args={"timeout": 30})
+    event.listen(engine.sync_engine, "connect", _enable_foreign_keys)
+    yield engine
+
+
+@pytest.fixture
+def session_factory(engine):
+    return async_sessionmaker(bind=engine, expire_on_commit=False, class_=AsyncSession)
+
+
+@pytest.fixture
+def client(session_factory):
+    async def override_get_database():
+        async with session_factory() as session:
+            yield session
+
+    principal_cache.clear()
+    claims_cache.clear()
+    availability_cache.clear()
+    reference_cache.clear()
+    response_cache.use(MemoryBackend())
+    patient_numbers.reset()
+    app.dependency_overrides[get_database] = override_get_database
+    app.dependency_overrides[get_session_factory] = lambda: session_factory
+    with TestClient(app) as test_client:
+        yield test_client
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def statements(engine):
+    """Collects every SQL statement sent to the test database."""
+    captured = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if not statement.lstrip().upper().startswith("PRAGMA"):
+            captured.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    yield captured
+    event.remove(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+
+
+@pytest.fixture
+def auth_headers():
+    def make(email: str, role: str) -> dict:
+        token = create_access_token({"sub": email, "role": role})
+        return {"Authorization": f"Bearer {token}"}
+    return make
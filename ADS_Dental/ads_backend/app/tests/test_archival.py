@@ -0,0 +1,56 @@
+import asyncio
+from datetime import date
+
+from sqlalchemy import update
+
+from app.db.archival import archive_appointments
+from app.db.models import Appointment
+
+URL = "/adsweb/api/v1/appointments/"
+HISTORY_URL = "/adsweb/api/v1/appointments/history"
+
+
+def finish(session_factory, statuses):
+    async def run():
+        async with session_factory() as session:
+            for appointment_id, status in statuses.items():
+                await session.execute(update(Appointment).where(Appointment.id == appointment_id).values(status=status))
+            await session.commit()
+    asyncio.run(run())
+
+
+def test_finished_appointments_move_to_the_archive_in_batches(client, auth_headers, session_factory):
+    finish(session_factory, {1: "COMPLETED", 3: "CANCELLED"})
+    admin = auth_headers("admin@ads.com", "ADMIN")
+    calendar = client.get("/adsweb/api/v1/dentists/1/calendar", params={"from": "2013-09-09", "to": "2013-09-15"}, headers=admin)
+
+    # Appointment 2 is still BOOKED; nothing after the cutoff is touched
+    assert asyncio.run(archive_appointments(session_factory, before=date(2013, 9, 13), batch_size=1)) == 1
+    assert asyncio.run(archive_appointments(session_factory, before=date(2014, 1, 1), batch_size=1)) == 1
+    assert asyncio.run(archive_appointments(session_factory, before=date(2014, 1, 1))) == 0
+
+    assert [a["id"] for a in client.get(URL, headers=admin).json()["items"]] == [2]
+    history = client.get(HISTORY_URL, headers=admin).json()["items"]
+    assert [(a["id"], a["status"], a["patient"]["patient_no"]) for a in history] == [
+        (1, "COMPLETED", "P001"), (3, "CANCELLED", "P003"),
+    ]
+
+    # The archived appointment left the calendar, so its ETag changed
+    response = client.get(
+        "/adsweb/api/v1/dentists/1/calendar", params={"from": "2013-09-09", "to": "2013-09-15"},
+        headers={**admin, "If-None-Match": calendar.headers["etag"]},
+    )
+    assert response.status_code == 200
+    assert [a["id"] for a in response.json()["days"][0]["appointments"]] == [2]
+
+
+def test_history_visibility(client, auth_headers, session_factory):
+    finish(session_factory, {1: "COMPLETED", 2: "COMPLETED", 3: "COMPLETED"})
+    asyncio.run(archive_appointments(session_factory, before=date(2014, 1, 1)))
+
+    patient = client.get(HISTORY_URL, headers=auth_headers("gwhite@mail.com", "PATIENT")).json()
+    assert [a["id"] for a in patient["items"]] == [1]
+    dentist = client.get(HISTORY_URL, headers=auth_headers("hpearson@ads.com", "DENTIST")).json()
+    assert [a["id"] for a in dentist["items"]] == [3]
+    page = client.get(HISTORY_URL, params={"limit": 2}, headers=auth_headers("admin@ads.com", "ADMIN")).json()
+    assert [a["id"] for a in page["items"]] == [1, 2] and page["next_cursor"]
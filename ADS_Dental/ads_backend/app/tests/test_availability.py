@@ -0,0 +1,107 @@
+import asyncio
+from datetime import date, time
+from types import SimpleNamespace
+
+from sqlalchemy import select
+
+from app.db.availability import _apply_committed_changes, availability_cache, booked_bitmaps
+from app.db.models import Appointment
+
+DENTIST_URL = "/adsweb/api/v1/dentists/1/availability"
+SURGERY_URL = "/adsweb/api/v1/surgeries/1/availability"
+# Seed: Tony Smith (dentist 1) is booked 09:00 and 10:00 on Thursday 2013-09-12
+WINDOW = {"from": "2013-09-12", "to": "2013-09-16"}
+
+
+def free_by_day(body):
+    return {day["date"]: day["free"] for day in body["days"]}
+
+
+def test_dentist_availability_excludes_booked_slots_and_weekends(client, auth_headers):
+    response = client.get(DENTIST_URL, params=WINDOW, headers=auth_headers("gwhite@mail.com", "PATIENT"))
+    assert response.status_code == 200
+    days = free_by_day(response.json())
+    assert list(days) == ["2013-09-12", "2013-09-13", "2013-09-16"]
+    assert days["2013-09-12"][:2] == ["09:30:00", "10:30:00"]
+    assert len(days["2013-09-12"]) == 14
+    assert len(days["2013-09-13"]) == 16
+
+
+def test_surgery_availability_lists_each_dentist(client, auth_headers):
+    response = client.get(SURGERY_URL, params=WINDOW, headers=auth_headers("gwhite@mail.com", "PATIENT"))
+    assert response.status_code == 200
+    assert [d["dentist_id"] for d in response.json()["dentists"]] == [1]
+
+
+def test_bookings_update_cached_bitmaps_without_requerying(client, auth_headers, statements, session_factory):
+    headers = auth_headers("gwhite@mail.com", "PATIENT")
+    client.get(DENTIST_URL, params=WINDOW, headers=headers)
+
+    booked = client.post("/adsweb/api/v1/appointments/", headers=headers, json={
+        "dentist_id": 1, "surgery_id": 1, "patient_id": 1, "appointment_date": "2013-09-13T11:00:00",
+    })
+    assert booked.status_code == 200
+
+    statements.clear()
+    days = free_by_day(client.get(DENTIST_URL, params=WINDOW, headers=headers).json())
+    assert "11:00:00" not in days["2013-09-13"]
+    assert not any("FROM appointments" in s for s in statements)
+
+    async def cancel_first_booking():
+        async with session_factory() as session:
+            appointment = (await session.execute(select(Appointment).order_by(Appointment.id))).scalars().first()
+            await session.delete(appointment)
+            await session.commit()
+
+    asyncio.run(cancel_first_booking())
+    days = free_by_day(client.get(DENTIST_URL, params=WINDOW, headers=headers).json())
+    assert days["2013-09-12"][0] == "09:00:00"
+
+
+def test_availability_rejects_bad_windows(client, auth_headers):
+    headers = auth_headers("gwhite@mail.com", "PATIENT")
+    assert client.get(DENTIST_URL, params={"from": "2013-09-12", "to": "2013-09-01"}, headers=headers).status_code == 400
+    assert client.get(DENTIST_URL, params={"from": "2013-01-01", "to": "2013-12-31"}, headers=headers).status_code == 400
+    assert client.get("/adsweb/api/v1/dentists/99/availability", headers=headers).status_code == 404
+    assert client.get("/adsweb/api/v1/surgeries/99/availability", headers=headers).status_code == 404
+
+
+def test_load_racing_a_booking_commit_is_not_cached(client, session_factory):
+    # A booking for dentist 1 commits while its days are being loaded
+    change = (True, 1, date(2013, 9, 13), time(11, 0))
+
+    async def load():
+        async with session_factory() as db:
+            execute = db.execute
+
+            async def racing_execute(*args, **kwargs):
+                result = await execute(*args, **kwargs)
+                _apply_committed_changes(SimpleNamespace(info={"availability_changes": [change]}))
+                return result
+
+            db.execute = racing_execute
+            await booked_bitmaps(db, [1], date(2013, 9, 12), date(2013, 9, 13))
+
+    asyncio.run(load())
+    assert availability_cache.get((1, date(2013, 9, 13))) is None
+
+
+def test_deleting_a_patient_user_frees_their_slots(client, auth_headers):
+    headers = auth_headers("gwhite@mail.com", "PATIENT")
+    booked = client.post("/adsweb/api/v1/appointments/", headers=auth_headers("jbell@mail.com", "PATIENT"), json={
+        "dentist_id": 1, "surgery_id": 1, "patient_id": 2, "appointment_date": "2013-09-13T11:00:00",
+    })
+    assert booked.status_code == 200
+    days = free_by_day(client.get(DENTIST_URL, params=WINDOW, headers=headers).json())
+    assert "10:00:00" not in days["2013-09-12"] and "11:00:00" not in days["2013-09-13"]
+
+    # jbell (user 5): the database cascades their patient and appointments away
+    assert client.delete("/adsweb/api/v1/users/5", headers=auth_headers("admin@ads.com", "ADMIN")).status_code == 204
+    days = free_by_day(client.get(DENTIST_URL, params=WINDOW, headers=headers).json())
+    assert "10:00:00" in days["2013-09-12"] and "11:00:00" in days["2013-09-13"]
+
+    # Deleting a patient directly goes through the Patient listener
+    admin = auth_headers("admin@ads.com", "ADMIN")
+    assert client.delete("/adsweb/api/v1/patient/1", headers=admin).status_code == 204
+    days = free_by_day(client.get(DENTIST_URL, params=WINDOW, headers=admin).json())
+    assert days["2013-09-12"][0] == "09:00:00"
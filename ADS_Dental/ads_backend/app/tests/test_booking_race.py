@@ -0,0 +1,46 @@
+import asyncio
+
+import httpx
+
+from app.main import app
+
+URL = "/adsweb/api/v1/appointments/"
+
+
+def test_racing_for_one_slot_yields_one_booking_and_409s(client, auth_headers):
+    # Each patient books with their own token, as in production
+    patients = ["gwhite@mail.com", "jbell@mail.com", "ianm@mail.com"]
+    payload = {"dentist_id": 2, "surgery_id": 2, "patient_id": 1, "appointment_date": "2013-10-01T09:00:00"}
+
+    async def race():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test", timeout=60) as http:
+            responses = await asyncio.gather(*(
+                http.post(URL, json=payload, headers=auth_headers(patients[i % 3], "PATIENT")) for i in range(60)
+            ))
+        return responses
+
+    responses = asyncio.run(race())
+    statuses = [r.status_code for r in responses]
+    assert statuses.count(200) == 1
+    assert statuses.count(409) == 59
+    assert all("slot" in r.json()["error"] for r in responses if r.status_code == 409)
+
+
+def test_unknown_dentist_is_a_client_error(client, auth_headers):
+    response = client.post(URL, headers=auth_headers("gwhite@mail.com", "PATIENT"), json={
+        "dentist_id": 99, "surgery_id": 1, "patient_id": 1, "appointment_date": "2013-10-01T09:00:00",
+    })
+    assert response.status_code == 400
+
+
+def test_conflict_leaves_the_weekly_place_free(client, auth_headers):
+    headers = auth_headers("gwhite@mail.com", "PATIENT")
+    taken = {"dentist_id": 1, "surgery_id": 1, "patient_id": 1, "appointment_date": "2013-09-12T09:00:00"}
+    for _ in range(5):
+        assert client.post(URL, headers=headers, json=taken).status_code == 409
+    # Seed has two bookings that week; three places must still be free
+    statuses = [
+        client.post(URL, headers=headers, json={**taken, "appointment_date": f"2013-09-10T0{h}:00:00"}).status_code
+        for h in range(1, 5)
+    ]
+    assert statuses == [200, 200, 200, 409]
@@ -0,0 +1,51 @@
+from app.db.availability import availability_cache
+
+URL = "/adsweb/api/v1/appointments/bulk"
+
+
+def row(dentist_id=1, surgery_id=1, patient_id=1, at="2013-10-07T09:00:00"):
+    return {"dentist_id": dentist_id, "surgery_id": surgery_id, "patient_id": patient_id, "appointment_date": at}
+
+
+def test_bulk_booking_reports_each_row(client, auth_headers, statements):
+    payload = [
+        row(at="2013-10-07T09:00:00"),
+        row(at="2013-10-07T09:00:00", patient_id=2),   # same slot as row 0
+        row(at="2013-09-12T09:00:00"),                 # already booked in the seed
+        row(dentist_id=99),
+        row(patient_id=99),
+        row(surgery_id=99),
+        row(dentist_id=2, surgery_id=2, at="2013-10-07T10:00:00"),
+    ] + [row(at=f"2013-10-08T{h}:00:00") for h in range(10, 16)]  # six more for dentist 1 that week
+
+    response = client.post(URL, json=payload, headers=auth_headers("admin@ads.com", "ADMIN"))
+    assert response.status_code == 200
+    body = response.json()
+    statuses = [r["status"] for r in body["results"]]
+    assert statuses[:7] == [
+        "created", "slot_conflict", "slot_conflict", "unknown_dentist", "unknown_patient", "unknown_surgery", "created",
+    ]
+    # Dentist 1 gets five places for the week of 2013-10-07: row 0 plus four of the six
+    assert statuses[7:] == ["created"] * 4 + ["weekly_limit"] * 2
+    assert body["created"] == 6
+    assert all((r["appointment_id"] is not None) == (r["status"] == "created") for r in body["results"])
+    assert sum(s.lstrip().upper().startswith("INSERT INTO APPOINTMENTS") for s in statements) == 1
+
+    listed = client.get("/adsweb/api/v1/appointments/", params={"limit": 500},
+                        headers=auth_headers("admin@ads.com", "ADMIN")).json()["items"]
+    assert len(listed) == 3 + 6
+
+
+def test_bulk_booking_updates_cached_availability(client, auth_headers):
+    headers = auth_headers("admin@ads.com", "ADMIN")
+    window = {"from": "2013-10-07", "to": "2013-10-07"}
+    client.get("/adsweb/api/v1/dentists/1/availability", params=window, headers=headers)
+    assert len(availability_cache)
+    client.post(URL, json=[row(at="2013-10-07T09:00:00")], headers=headers)
+    free = client.get("/adsweb/api/v1/dentists/1/availability", params=window, headers=headers).json()["days"][0]["free"]
+    assert "09:00:00" not in free
+
+
+def test_bulk_booking_is_admin_only(client, auth_headers):
+    response = client.post(URL, json=[row()], headers=auth_headers("gwhite@mail.com", "PATIENT"))
+    assert response.status_code == 403
@@ -0,0 +1,66 @@
+URL = "/adsweb/api/v1/dentists/1/calendar"
+WEEK = {"from": "2013-09-09", "to": "2013-09-15"}
+
+
+def test_calendar_groups_appointments_by_day(client, auth_headers):
+    response = client.get(URL, params=WEEK, headers=auth_headers("tsmith@ads.com", "DENTIST"))
+    assert response.status_code == 200
+    assert response.headers["etag"]
+    days = response.json()["days"]
+    assert [d["date"] for d in days] == ["2013-09-12"]
+    assert [(a["appointment_time"], a["patient"]["patient_no"]) for a in days[0]["appointments"]] == [
+        ("09:00:00", "P001"), ("10:00:00", "P002"),
+    ]
+
+
+def test_unchanged_calendar_revalidates_with_one_version_read(client, auth_headers, statements):
+    headers = auth_headers("tsmith@ads.com", "DENTIST")
+    etag = client.get(URL, params=WEEK, headers=headers).headers["etag"]
+
+    statements.clear()
+    response = client.get(URL, params=WEEK, headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+    assert len(statements) == 1 and "dentist_calendar_versions" in statements[0]
+
+    # A different window is a different representation
+    other = client.get(URL, params={"from": "2013-09-09", "to": "2013-09-20"}, headers={**headers, "If-None-Match": etag})
+    assert other.status_code == 200
+
+
+def test_bookings_and_patient_renames_change_the_etag(client, auth_headers):
+    dentist = auth_headers("tsmith@ads.com", "DENTIST")
+    etag = client.get(URL, params=WEEK, headers=dentist).headers["etag"]
+
+    client.post("/adsweb/api/v1/appointments/", headers=auth_headers("gwhite@mail.com", "PATIENT"), json={
+        "dentist_id": 1, "surgery_id": 1, "patient_id": 1, "appointment_date": "2013-09-13T15:00:00",
+    })
+    response = client.get(URL, params=WEEK, headers={**dentist, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert [d["date"] for d in response.json()["days"]] == ["2013-09-12", "2013-09-13"]
+    etag = response.headers["etag"]
+
+    admin = auth_headers("admin@ads.com", "ADMIN")
+    patient = client.get("/adsweb/api/v1/patient/2", headers=admin).json()
+    client.put("/adsweb/api/v1/patient/2", headers=admin, json={**patient, "last_name": "Bellamy"})
+    response = client.get(URL, params=WEEK, headers={**dentist, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["days"][0]["appointments"][1]["patient"]["last_name"] == "Bellamy"
+
+
+def test_calendar_access(client, auth_headers):
+    assert client.get(URL, params=WEEK, headers=auth_headers("hpearson@ads.com", "DENTIST")).status_code == 403
+    assert client.get(URL, params=WEEK, headers=auth_headers("gwhite@mail.com", "PATIENT")).status_code == 403
+    assert client.get(URL, params=WEEK, headers=auth_headers("admin@ads.com", "ADMIN")).status_code == 200
+    assert client.get("/adsweb/api/v1/dentists/99/calendar", headers=auth_headers("admin@ads.com", "ADMIN")).status_code == 404
+
+
+def test_deleting_a_user_changes_the_etag_of_their_calendars(client, auth_headers):
+    dentist = auth_headers("tsmith@ads.com", "DENTIST")
+    etag = client.get(URL, params=WEEK, headers=dentist).headers["etag"]
+
+    # jbell (user 5): the database cascades their patient and appointment away
+    assert client.delete("/adsweb/api/v1/users/5", headers=auth_headers("admin@ads.com", "ADMIN")).status_code == 204
+    response = client.get(URL, params=WEEK, headers={**dentist, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert [a["patient"]["patient_no"] for a in response.json()["days"][0]["appointments"]] == ["P001"]
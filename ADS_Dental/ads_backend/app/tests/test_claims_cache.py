@@ -0,0 +1,76 @@
+import time
+from datetime import timedelta
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from jose import JWTError
+
+from app.api.dependencies.rbac import require_role, require_user
+from app.core import security
+from app.core.security import create_access_token, decode_token, get_claims
+from app.main import app as main_app
+
+
+@pytest.fixture
+def decodes(monkeypatch):
+    calls = []
+    real_decode = security.jwt.decode
+
+    def counting_decode(*args, **kwargs):
+        calls.append(1)
+        return real_decode(*args, **kwargs)
+
+    monkeypatch.setattr(security.jwt, "decode", counting_decode)
+    return calls
+
+
+def test_token_is_decoded_once_across_requests(client, auth_headers, decodes):
+    headers = auth_headers("admin@ads.com", "ADMIN")
+    for _ in range(3):
+        assert client.get("/adsweb/api/v1/patients", headers=headers).status_code == 200
+    assert len(decodes) == 1
+
+
+def test_role_check_and_principal_share_one_decode(client, decodes):
+    app = FastAPI()
+
+    @app.get("/both", dependencies=[Depends(require_role(["PATIENT"]))])
+    async def both(claims: dict = Depends(get_claims), user=Depends(require_user(["PATIENT"]))):
+        return {"sub": claims["sub"], "id": user.id}
+
+    app.dependency_overrides = main_app.dependency_overrides
+    token = create_access_token({"sub": "gwhite@mail.com", "role": "PATIENT"})
+    response = TestClient(app).get("/both", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 200
+    assert response.json()["sub"] == "gwhite@mail.com"
+    assert len(decodes) == 1
+
+
+def test_require_user_rejects_other_roles(client, auth_headers):
+    app = FastAPI()
+
+    @app.get("/admin-only")
+    async def admin_only(user=Depends(require_user(["ADMIN"]))):
+        return {"id": user.id}
+
+    app.dependency_overrides = main_app.dependency_overrides
+    response = TestClient(app).get("/admin-only", headers=auth_headers("gwhite@mail.com", "PATIENT"))
+    assert response.status_code == 403
+
+
+def test_cached_claims_expire_with_the_token(client):
+    token = create_access_token({"sub": "admin@ads.com", "role": "ADMIN"}, expires_delta=timedelta(seconds=1))
+    assert decode_token(token)["sub"] == "admin@ads.com"
+    # exp has whole-second resolution and jose accepts the exp second itself
+    time.sleep(2.1)
+    with pytest.raises(JWTError):
+        decode_token(token)
+    response = client.get("/adsweb/api/v1/patients", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 401
+
+
+def test_callers_cannot_mutate_cached_claims(client):
+    token = create_access_token({"sub": "admin@ads.com", "role": "ADMIN"})
+    decode_token(token)["role"] = "PATIENT"
+    assert decode_token(token)["role"] == "ADMIN"
@@ -0,0 +1,29 @@
+URL = "/adsweb/api/v1/appointments/"
+COMPOUND = {"Accept": "application/vnd.ads.compound+json"}
+
+
+def test_compound_page_references_each_entity_once(client, auth_headers, statements):
+    headers = {**auth_headers("admin@ads.com", "ADMIN"), **COMPOUND}
+    statements.clear()
+    response = client.get(URL, headers=headers)
+    assert response.headers["content-type"].startswith("application/vnd.ads.compound+json")
+    body = response.json()
+    assert [(a["id"], a["patient_id"], a["dentist_id"], a["surgery_id"]) for a in body["items"]] == [
+        (1, 1, 1, 1), (2, 2, 1, 1), (3, 3, 2, 2),
+    ]
+    included = body["included"]
+    assert sorted(included["patients"]) == ["1", "2", "3"]
+    assert included["dentists"]["1"]["last_name"] == "Smith"
+    assert included["surgeries"]["2"]["name"] == "The Galleria Surgery"
+    assert included["surgeries"]["2"]["dentist_ids"] == [2]
+    assert included["patients"]["1"]["address"]["city"] == "Phoenix"
+    # The page, then one IN query each for patients, surgeries and dentists
+    assert len([s for s in statements if "FROM appointments" in s]) == 1
+    assert [s.split("FROM")[1].split()[0] for s in statements if " IN (" in s] == ["patients", "surgeries", "dentists"]
+
+
+def test_compound_respects_visibility_and_rejects_fieldsets(client, auth_headers):
+    headers = {**auth_headers("gwhite@mail.com", "PATIENT"), **COMPOUND}
+    body = client.get(URL, headers=headers).json()
+    assert [a["id"] for a in body["items"]] == [1] and list(body["included"]["patients"]) == ["1"]
+    assert client.get(URL, headers=headers, params={"fields": "id"}).status_code == 400
@@ -0,0 +1,32 @@
+import csv
+import gzip
+import io
+import json
+
+
+def test_patient_export_is_csv_with_address_columns(client, auth_headers):
+    response = client.get("/adsweb/api/v1/export/patients", headers=auth_headers("admin@ads.com", "ADMIN"))
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert 'filename="patients.csv"' in response.headers["content-disposition"]
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [r["patient_no"] for r in rows] == ["P001", "P002", "P003"]
+    assert {"street", "city", "state", "zip_code"} <= rows[0].keys()
+
+
+def test_appointment_export_is_flat_gzip_ndjson(client, auth_headers):
+    response = client.get("/adsweb/api/v1/export/appointments?format=ndjson",
+                          headers=auth_headers("admin@ads.com", "ADMIN"))
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/gzip"
+    rows = [json.loads(line) for line in gzip.decompress(response.content).splitlines()]
+    assert [r["id"] for r in rows] == [1, 2, 3]
+    assert rows[0]["appointment_date"] == "2013-09-12" and rows[0]["status"] == "BOOKED"
+    assert rows[2]["dentist_last_name"] == "Pearson" and rows[2]["surgery_name"] == "The Galleria Surgery"
+
+
+def test_export_is_admin_only_and_checks_format(client, auth_headers):
+    assert client.get("/adsweb/api/v1/export/patients",
+                      headers=auth_headers("tsmith@ads.com", "DENTIST")).status_code == 403
+    assert client.get("/adsweb/api/v1/export/patients?format=xml",
+                      headers=auth_headers("admin@ads.com", "ADMIN")).status_code == 400
@@ -0,0 +1,40 @@
+URL = "/adsweb/api/v1/appointments/"
+
+
+def test_sparse_list_prunes_columns_and_joins(client, auth_headers, statements):
+    headers = auth_headers("admin@ads.com", "ADMIN")
+    statements.clear()
+    body = client.get(URL, headers=headers, params={"fields": "appointment_date,patient.last_name"}).json()
+    assert body["items"][0] == {
+        "id": 1, "appointment_date": "2013-09-12T00:00:00", "patient": {"id": 1, "last_name": "White"},
+    }
+    query = next(s for s in statements if "FROM appointments" in s)
+    assert "JOIN patients" in query and "dentists" not in query and "surgeries" not in query
+    assert "first_name" not in query and "status" not in query
+    assert not [s for s in statements if "FROM dentists" in s]
+
+
+def test_include_embeds_whole_objects(client, auth_headers):
+    headers = auth_headers("admin@ads.com", "ADMIN")
+    item = client.get(URL, headers=headers, params={"include": "surgery.dentists", "fields": "id"}).json()["items"][2]
+    assert set(item) == {"id", "surgery"}
+    assert item["surgery"]["name"] == "The Galleria Surgery" and "address" not in item["surgery"]
+    assert [d["last_name"] for d in item["surgery"]["dentists"]] == ["Pearson"]
+
+
+def test_detail_endpoint_respects_fields_and_visibility(client, auth_headers):
+    patient = auth_headers("gwhite@mail.com", "PATIENT")
+    full = client.get(f"{URL}1", headers=patient).json()
+    assert full["surgery"]["dentists"][0]["last_name"] == "Smith" and full["patient"]["address"]["city"] == "Phoenix"
+    sparse = client.get(f"{URL}1", headers=patient, params={"fields": "status,dentist.last_name,patient.address"}).json()
+    assert sparse == {
+        "id": 1, "status": "BOOKED", "dentist": {"id": 1, "last_name": "Smith"},
+        "patient": full["patient"],
+    }
+    assert client.get(f"{URL}3", headers=patient).status_code == 404
+
+
+def test_unknown_fields_are_rejected(client, auth_headers):
+    headers = auth_headers("admin@ads.com", "ADMIN")
+    assert client.get(URL, headers=headers, params={"fields": "patient.password_hash"}).status_code == 400
+    assert client.get(URL, headers=headers, params={"include": "user"}).status_code == 400
@@ -0,0 +1,31 @@
+import pytest
+
+
+ADMIN = ("admin@ads.com", "ADMIN")
+
+
+@pytest.mark.parametrize(
+    "path, expected_statements",
+    [
+        ("/adsweb/api/v1/patients", 1),
+        ("/adsweb/api/v1/patient/1", 1),
+        ("/adsweb/api/v1/patient/search/Bell", 1),
+        ("/adsweb/api/v1/addresses", 1),
+        ("/adsweb/api/v1/surgeries", 2),
+        ("/adsweb/api/v1/users/", 1),
+        ("/adsweb/api/v1/users/1", 2),
+        # 2 for the authenticated principal, 1 for the appointments, 1 for surgery dentists
+        ("/adsweb/api/v1/appointments/", 4),
+    ],
+)
+def test_statements_per_endpoint(client, statements, auth_headers, path, expected_statements):
+    response = client.get(path, headers=auth_headers(*ADMIN))
+    assert response.status_code == 200, response.text
+    assert len(statements) == expected_statements, statements
+
+
+def test_surgeries_do_not_load_appointments(client, statements, auth_headers):
+    response = client.get("/adsweb/api/v1/surgeries", headers=auth_headers(*ADMIN))
+    assert response.status_code == 200
+    assert [s["name"] for s in response.json()["items"]] == ["Bells Court Dental", "The Galleria Surgery"]
+    assert not any("FROM appointments" in s for s in statements)
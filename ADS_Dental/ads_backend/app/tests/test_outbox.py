@@ -0,0 +1,125 @@
+import asyncio
+import smtplib
+import socket
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import select, update
+
+from app.core.mailer import SMTPMailer
+from app.core.outbox_worker import OutboxWorker, utcnow
+from app.db.models import OutboxMessage
+from app.services.notification_service import OUTBOX_RENDERERS
+
+URL = "/adsweb/api/v1/appointments/"
+BOOKING = {"dentist_id": 2, "surgery_id": 2, "patient_id": 1, "appointment_date": "2013-10-01T09:00:00"}
+
+
+class FlakyMailer:
+    """Fails the first ``failures`` sends, then records messages."""
+
+    def __init__(self, failures=0):
+        self.failures = failures
+        self.sent = []
+
+    def send_many(self, messages):
+        results = []
+        for message in messages:
+            if self.failures:
+                self.failures -= 1
+                results.append(smtplib.SMTPServerDisconnected("connection lost"))
+            else:
+                self.sent.append(message)
+                results.append(None)
+        return results
+
+    def close(self):
+        pass
+
+
+def outbox(session_factory):
+    async def load():
+        async with session_factory() as session:
+            return (await session.execute(select(OutboxMessage).order_by(OutboxMessage.id))).scalars().all()
+    return asyncio.run(load())
+
+
+def test_booking_queues_exactly_one_confirmation(client, auth_headers, session_factory):
+    headers = auth_headers("gwhite@mail.com", "PATIENT")
+    assert client.post(URL, headers=headers, json=BOOKING).status_code == 200
+    assert client.post(URL, headers=headers, json=BOOKING).status_code == 409
+    messages = outbox(session_factory)
+    assert [m.kind for m in messages] == ["appointment_confirmation"]
+    assert messages[0].sent_at is None
+
+
+def test_worker_retries_with_backoff_then_sends(client, auth_headers, session_factory):
+    client.post(URL, headers=auth_headers("gwhite@mail.com", "PATIENT"), json=BOOKING)
+    mailer = FlakyMailer(failures=1)
+    worker = OutboxWorker(mailer, OUTBOX_RENDERERS, backoff_seconds=60)
+
+    assert asyncio.run(worker.drain_once(session_factory)) == 1
+    failed = outbox(session_factory)[0]
+    assert failed.attempts == 1 and failed.sent_at is None
+    assert failed.next_attempt_at > utcnow() + timedelta(seconds=25)
+    # Not due yet: nothing is claimed
+    assert asyncio.run(worker.drain_once(session_factory)) == 0
+
+    async def make_due():
+        async with session_factory() as session:
+            await session.execute(update(OutboxMessage).values(next_attempt_at=utcnow()))
+            await session.commit()
+
+    asyncio.run(make_due())
+    assert asyncio.run(worker.drain_once(session_factory)) == 1
+    assert outbox(session_factory)[0].sent_at is not None
+    (email,) = mailer.sent
+    assert email["To"] == "gwhite@mail.com"
+    assert "Dr Helen Pearson at The Galleria Surgery on Tuesday 01 October 2013 at 09:00" in email.get_content()
+
+
+def test_worker_delivers_to_a_local_smtp_sink(client, auth_headers, session_factory):
+    controller_module = pytest.importorskip("aiosmtpd.controller")
+
+    class Sink:
+        def __init__(self):
+            self.envelopes = []
+
+        async def handle_DATA(self, server, session, envelope):
+            self.envelopes.append(envelope)
+            return "250 OK"
+
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    sink = Sink()
+    controller = controller_module.Controller(sink, hostname="127.0.0.1", port=port)
+    controller.start()
+    try:
+        for day in ("01", "02"):
+            client.post(URL, headers=auth_headers("gwhite@mail.com", "PATIENT"),
+                        json={**BOOKING, "appointment_date": f"2013-10-{day}T09:00:00"})
+        mailer = SMTPMailer("127.0.0.1", port)
+        worker = OutboxWorker(mailer, OUTBOX_RENDERERS)
+        assert asyncio.run(worker.drain_once(session_factory)) == 2
+        mailer.close()
+    finally:
+        controller.stop()
+    assert [e.rcpt_tos for e in sink.envelopes] == [["gwhite@mail.com"], ["gwhite@mail.com"]]
+
+
+def test_started_worker_drains_and_stops(client, auth_headers, session_factory):
+    client.post(URL, headers=auth_headers("gwhite@mail.com", "PATIENT"), json=BOOKING)
+    mailer = FlakyMailer()
+
+    async def run():
+        worker = OutboxWorker(mailer, OUTBOX_RENDERERS, poll_seconds=30)
+        worker.start(session_factory)
+        for _ in range(250):
+            if mailer.sent:
+                break
+            await asyncio.sleep(0.02)
+        await worker.stop()
+
+    asyncio.run(run())
+    assert len(mailer.sent) == 1
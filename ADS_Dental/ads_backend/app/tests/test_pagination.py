@@ -0,0 +1,37 @@
+import pytest
+
+
+@pytest.mark.parametrize(
+    "path, key",
+    [
+        ("/adsweb/api/v1/patients", "last_name"),
+        ("/adsweb/api/v1/addresses", "city"),
+        ("/adsweb/api/v1/surgeries", "name"),
+        ("/adsweb/api/v1/users/", "id"),
+        ("/adsweb/api/v1/appointments/", "appointment_date"),
+    ],
+)
+def test_walking_pages_returns_every_row_once_in_order(client, auth_headers, path, key):
+    headers = auth_headers("admin@ads.com", "ADMIN")
+    full = client.get(path, headers=headers).json()
+    assert full["next_cursor"] is None
+
+    walked, cursor = [], None
+    while True:
+        params = {"limit": 1, **({"after": cursor} if cursor else {})}
+        page = client.get(path, headers=headers, params=params).json()
+        assert len(page["items"]) <= 1
+        walked.extend(page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert [row["id"] for row in walked] == [row["id"] for row in full["items"]]
+    assert [row[key] for row in walked] == sorted(row[key] for row in walked)
+
+
+def test_invalid_cursor_is_rejected(client, auth_headers):
+    response = client.get(
+        "/adsweb/api/v1/patients", headers=auth_headers("admin@ads.com", "ADMIN"), params={"after": "not-a-cursor"}
+    )
+    assert response.status_code == 400
@@ -0,0 +1,79 @@
+import asyncio
+import json
+
+from app.services.patient_import_service import PatientImport, ndjson_records
+
+URL = "/adsweb/api/v1/patients/import"
+
+CSV = (
+    "first_name,last_name,phone,email,password,street,city,state,zip_code\r\n"
+    "Ada,Lovelace,641-555-0101,ada@mail.com,secret,\"12 Analytical Way\nFlat 2\",London,LN,00001\r\n"
+    "Alan,Turing,641-555-0102,alan@mail.com,,,,,\r\n"
+    "Gillian,White,641-555-0103,gwhite@mail.com,pw,,,,\r\n"
+    "Grace,Hopper,641-555-0104,not-an-email,pw,,,,\r\n"
+    "Ada,Again,641-555-0105,ADA@mail.com,pw,,,,\r\n"
+)
+
+
+def test_csv_import_reports_every_row(client, auth_headers):
+    headers = {**auth_headers("admin@ads.com", "ADMIN"), "Content-Type": "text/csv"}
+    response = client.post(URL, headers=headers, content=CSV.encode("utf-8"))
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert (body["received"], body["created"], body["duplicates"], body["invalid"]) == (5, 2, 2, 1)
+    assert [r["status"] for r in body["results"]] == ["created", "created", "duplicate", "invalid", "duplicate"]
+    assert body["results"][3]["errors"][0].startswith("email:")
+
+    ada, alan = body["results"][0], body["results"][1]
+    assert ada["invite_token"] is None and alan["invite_token"]
+    admin = auth_headers("admin@ads.com", "ADMIN")
+    patient = client.get(f"/adsweb/api/v1/patient/{ada['patient_id']}", headers=admin).json()
+    assert patient["address"]["street"] == "12 Analytical Way\nFlat 2"
+    assert client.post("/api/v1/login", json={"email": "ada@mail.com", "password": "secret"}).status_code == 200
+
+    # The invite is not a bearer token; it sets Alan's password exactly once
+    invite = alan["invite_token"]
+    assert client.get("/adsweb/api/v1/appointments/", headers={"Authorization": f"Bearer {invite}"}).status_code == 401
+    assert client.post("/api/v1/login", json={"email": "alan@mail.com", "password": ""}).status_code == 401
+    assert client.post("/api/v1/invites/accept", json={"token": invite, "password": "enigma"}).status_code == 204
+    assert client.post("/api/v1/invites/accept", json={"token": invite, "password": "other"}).status_code == 400
+    assert client.post("/api/v1/login", json={"email": "alan@mail.com", "password": "enigma"}).status_code == 200
+
+
+def test_existing_emails_are_duplicates_in_any_case(client, auth_headers):
+    headers = {**auth_headers("admin@ads.com", "ADMIN"), "Content-Type": "text/csv"}
+    csv = "first_name,last_name,phone,email,password\r\nGillian,White,641-555-0103,GWhite@mail.com,pw\r\n"
+    body = client.post(URL, headers=headers, content=csv.encode("utf-8")).json()
+    assert (body["created"], body["duplicates"]) == (0, 1)
+    assert body["results"][0]["errors"] == ["email already registered"]
+
+
+def test_ndjson_import_in_batches_from_odd_chunks(session_factory):
+    lines = [
+        {"first_name": f"Zoë{i}", "last_name": "Import", "phone": "641-555-0199", "email": f"zoe{i}@mail.com",
+         "password": "pw", "address": {"street": f"{i} Main", "city": "Fairfield", "state": "IA", "zip_code": "52556"}}
+        for i in range(5)
+    ]
+    payload = ("\n".join(json.dumps(line, ensure_ascii=False) for line in lines) + "\n{broken\n").encode("utf-8")
+
+    async def chunks():
+        # 7-byte chunks split multi-byte characters and lines
+        for i in range(0, len(payload), 7):
+            yield payload[i:i + 7]
+
+    async def run():
+        async with session_factory() as db:
+            return await PatientImport(db, invite=True, batch_size=2).run(ndjson_records(chunks()))
+
+    body = asyncio.run(run())
+    assert (body["received"], body["created"], body["invalid"]) == (6, 5, 1)
+    assert all(r["invite_token"] for r in body["results"][:5])
+    assert len({r["patient_no"] for r in body["results"][:5]}) == 5
+    assert body["results"][5]["errors"][0].startswith("invalid JSON")
+
+
+def test_import_requires_csv_or_ndjson(client, auth_headers):
+    headers = {**auth_headers("admin@ads.com", "ADMIN"), "Content-Type": "application/json"}
+    assert client.post(URL, headers=headers, content=b"[]").status_code == 415
+    headers = {**auth_headers("gwhite@mail.com", "PATIENT"), "Content-Type": "text/csv"}
+    assert client.post(URL, headers=headers, content=CSV.encode("utf-8")).status_code == 403
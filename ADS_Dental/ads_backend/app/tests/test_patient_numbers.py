@@ -0,0 +1,62 @@
+import asyncio
+import multiprocessing
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.db.models import Patient
+from app.db.number_blocks import NumberAllocator
+
+PROCESSES = 4
+PER_PROCESS = 5000
+BATCH = 500
+
+
+def register_patients(url: str, worker: int) -> list:
+    # Runs in a fresh process: its own allocator state, engine and connections
+    async def run():
+        engine = create_async_engine(url, poolclass=NullPool, connect_args={"timeout": 30})
+        allocator = NumberAllocator("patient_no", 100, "P{:010d}")
+        numbers = []
+        for start in range(0, PER_PROCESS, BATCH):
+            batch = [await allocator.allocate(engine) for _ in range(BATCH)]
+            async with engine.begin() as conn:
+                await conn.execute(insert(Patient), [
+                    {"patient_no": n, "first_name": f"Worker{worker}", "last_name": f"Patient{start + i}"}
+                    for i, n in enumerate(batch)
+                ])
+            numbers += batch
+        await engine.dispose()
+        return numbers
+
+    return asyncio.run(run())
+
+
+def test_processes_never_hand_out_the_same_number(database_url, session_factory):
+    with multiprocessing.get_context("spawn").Pool(PROCESSES) as pool:
+        results = pool.starmap(register_patients, [(database_url, w) for w in range(PROCESSES)])
+
+    numbers = [n for result in results for n in result]
+    assert len(numbers) == len(set(numbers)) == PROCESSES * PER_PROCESS
+    # Blocks are contiguous: no process was handed a number from another's block
+    blocks = [{(int(n[1:]) - 1) // 100 for n in result} for result in results]
+    assert all(not (a & b) for i, a in enumerate(blocks) for b in blocks[i + 1:])
+
+    async def stored():
+        async with session_factory() as session:
+            return (await session.execute(select(func.count()).select_from(Patient))).scalar_one()
+
+    assert asyncio.run(stored()) == 3 + PROCESSES * PER_PROCESS
+
+
+def test_registration_uses_the_allocator(client, auth_headers):
+    headers = auth_headers("admin@ads.com", "ADMIN")
+    numbers = [
+        client.post("/adsweb/api/v1/patients", headers=headers, json={
+            "first_name": "Ada", "last_name": "Lovelace", "phone": "641-555-0199",
+            "email": f"ada{i}@mail.com", "password": "pw",
+        }).json()["patient_no"]
+        for i in range(3)
+    ]
+    assert numbers == ["P0000000001", "P0000000002", "P0000000003"]
@@ -0,0 +1,65 @@
+from sqlalchemy.dialects import mysql
+from sqlalchemy.schema import CreateTable
+
+from app.db.models import PatientSearchTerm
+
+
+def search(client, auth_headers, term, **params):
+    response = client.get(
+        f"/adsweb/api/v1/patient/search/{term}", headers=auth_headers("admin@ads.com", "ADMIN"), params=params
+    )
+    assert response.status_code == 200, response.text
+    return [p["patient_no"] for p in response.json()]
+
+
+def test_search_ranks_exact_then_prefix_then_substring(client, auth_headers):
+    headers = auth_headers("admin@ads.com", "ADMIN")
+    created = {}
+    for first, last, email in [("Bellamy", "Zed", "zed@mail.com"), ("Ann", "Campbell", "acampbell@mail.com")]:
+        response = client.post("/adsweb/api/v1/patients", headers=headers, json={
+            "first_name": first, "last_name": last, "phone": "641-555-0100", "email": email, "password": "pw",
+        })
+        assert response.status_code == 201, response.text
+        created[last] = response.json()["patient_no"]
+
+    # Bell (last_name prefix) and Bellamy (first_name prefix) rank above
+    # Campbell (substring only); ties are ordered by last name
+    assert search(client, auth_headers, "bell") == ["P002", created["Zed"], created["Campbell"]]
+    # An exact email match beats everything
+    assert search(client, auth_headers, "zed@mail.com")[0] == created["Zed"]
+
+
+def test_search_matches_phone_regardless_of_formatting(client, auth_headers):
+    headers = auth_headers("admin@ads.com", "ADMIN")
+    client.post("/adsweb/api/v1/patients", headers=headers, json={
+        "first_name": "Ada", "last_name": "Lovelace", "phone": "(641) 555-0199", "email": "ada@mail.com",
+        "password": "pw",
+    })
+    assert len(search(client, auth_headers, "555-0199")) == 1
+
+
+def test_search_for_terms_ending_in_z_or_9(client, auth_headers):
+    headers = auth_headers("admin@ads.com", "ADMIN")
+    client.post("/adsweb/api/v1/patients", headers=headers, json={
+        "first_name": "Luz", "last_name": "Ortiz", "phone": "641-555-0109", "email": "lortiz@mail.com",
+        "password": "pw",
+    })
+    assert len(search(client, auth_headers, "ortiz")) == 1
+    assert len(search(client, auth_headers, "0109")) == 1
+    # The [query, successor) range scan relies on code point order on MySQL too
+    ddl = str(CreateTable(PatientSearchTerm.__table__).compile(dialect=mysql.dialect()))
+    assert "term VARCHAR(120) COLLATE utf8mb4_bin NOT NULL" in ddl
+
+
+def test_search_honours_limit_and_minimum_length(client, auth_headers):
+    assert len(search(client, auth_headers, "mail.com", limit=2)) == 2
+    assert search(client, auth_headers, "b") == []
+
+
+def test_update_reindexes_patient(client, auth_headers):
+    headers = auth_headers("admin@ads.com", "ADMIN")
+    patient = client.get("/adsweb/api/v1/patient/1", headers=headers).json()
+    response = client.put("/adsweb/api/v1/patient/1", headers=headers, json={**patient, "first_name": "Gwendolyn"})
+    assert response.status_code == 200, response.text
+    assert search(client, auth_headers, "gwendolyn") == ["P001"]
+    assert search(client, auth_headers, "gillian") == []
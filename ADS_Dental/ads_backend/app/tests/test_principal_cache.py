@@ -0,0 +1,35 @@
+def test_principal_is_loaded_once_per_subject(client, statements, auth_headers):
+    headers = auth_headers("tsmith@ads.com", "DENTIST")
+    assert client.get("/adsweb/api/v1/appointments/", headers=headers).status_code == 200
+    first = len(statements)
+    statements.clear()
+    assert client.get("/adsweb/api/v1/appointments/", headers=headers).status_code == 200
+    assert len(statements) == first - 2
+
+
+def test_dentists_and_patients_only_see_their_appointments(client, auth_headers):
+    dentist = client.get("/adsweb/api/v1/appointments/", headers=auth_headers("tsmith@ads.com", "DENTIST")).json()
+    assert {a["dentist"]["id"] for a in dentist["items"]} == {1}
+    assert len(dentist["items"]) == 2
+
+    patient = client.get("/adsweb/api/v1/appointments/", headers=auth_headers("ianm@mail.com", "PATIENT")).json()
+    assert [a["patient"]["patient_no"] for a in patient["items"]] == ["P003"]
+
+
+def test_role_change_invalidates_cached_principal(client, auth_headers):
+    headers = auth_headers("gwhite@mail.com", "PATIENT")
+    assert client.get("/adsweb/api/v1/appointments/", headers=headers).status_code == 200
+
+    user_id = client.post("/api/v1/login", json={"email": "gwhite@mail.com", "password": "password"}).json()["user"]["id"]
+    assert client.put(f"/adsweb/api/v1/users/{user_id}/roles", json=["ADMIN"]).status_code == 200
+
+    # Now an admin: sees every appointment, not just their own
+    assert len(client.get("/adsweb/api/v1/appointments/", headers=headers).json()["items"]) == 3
+
+
+def test_deleted_user_is_rejected(client, auth_headers):
+    headers = auth_headers("jbell@mail.com", "PATIENT")
+    assert client.get("/adsweb/api/v1/appointments/", headers=headers).status_code == 200
+    user_id = client.post("/api/v1/login", json={"email": "jbell@mail.com", "password": "password"}).json()["user"]["id"]
+    assert client.delete(f"/adsweb/api/v1/users/{user_id}").status_code == 204
+    assert client.get("/adsweb/api/v1/appointments/", headers=headers).status_code == 401
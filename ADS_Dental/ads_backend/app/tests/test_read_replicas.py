@@ -0,0 +1,171 @@
+import asyncio
+import shutil
+
+import pytest
+from fastapi import Request
+from sqlalchemy import event, select, text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.core.principal import get_principal, principal_cache
+from app.core.response_cache import MemoryBackend, response_cache
+from app.core.security import create_access_token, hash_password
+from app.db.models import Dentist, Patient, User
+from app.db.routing import REPLICA_READS, WROTE, ReplicaRouter, request_session, routing_sessionmaker
+from app.services.calendar_service import dentist_calendar_version_service
+from app.services.patient_service import cached_patient_service
+from app.db.session import get_database
+from app.main import app
+from app.tests.conftest import _enable_foreign_keys
+
+
+def sqlite_engine(url):
+    engine = create_async_engine(url, poolclass=NullPool, connect_args={"timeout": 30})
+    event.listen(engine.sync_engine, "connect", _enable_foreign_keys)
+    return engine
+
+
+@pytest.fixture
+def replica_url(database_url, tmp_path):
+    """A second database file standing in for a replica: a snapshot of the seeded primary."""
+    path = tmp_path / "ads_replica.db"
+    shutil.copyfile(database_url.split(":///", 1)[1], path)
+    return f"sqlite+aiosqlite:///{path}"
+
+
+async def last_names(factory, **info):
+    async with factory() as db:
+        db.info.update(info)
+        return set((await db.execute(select(Patient.last_name))).scalars())
+
+
+def test_replica_reads_and_primary_writes(engine, replica_url):
+    factory = routing_sessionmaker(ReplicaRouter(engine, [sqlite_engine(replica_url)]))
+
+    async def run():
+        async with factory() as db:
+            db.info[REPLICA_READS] = True
+            db.add(Patient(patient_no="P900", first_name="Rita", last_name="Lag"))
+            await db.commit()
+            # After its own write a session reads the primary
+            assert "Lag" in set((await db.execute(select(Patient.last_name))).scalars())
+
+        assert "Lag" not in await last_names(factory, **{REPLICA_READS: True})
+        assert "Lag" in await last_names(factory)
+
+        # Textual SQL runs on the primary without making the session a writer
+        async with factory() as db:
+            db.info[REPLICA_READS] = True
+            await db.execute(text("SELECT 1"))
+            assert WROTE not in db.info
+            assert "Lag" not in set((await db.execute(select(Patient.last_name))).scalars())
+
+    asyncio.run(run())
+
+
+def test_writes_make_the_caller_read_from_the_primary(client, auth_headers, engine, replica_url):
+    factory = routing_sessionmaker(ReplicaRouter(engine, [sqlite_engine(replica_url)], sticky_seconds=60))
+
+    async def routed_database(request: Request):
+        async with request_session(factory, request) as session:
+            yield session
+
+    app.dependency_overrides[get_database] = routed_database
+    admin = auth_headers("admin@ads.com", "ADMIN")
+    dentist = auth_headers("tsmith@ads.com", "DENTIST")
+    first_names = lambda headers: {p["first_name"] for p in client.get("/adsweb/api/v1/patients", headers=headers).json()["items"]}
+
+    patient = client.get("/adsweb/api/v1/patient/1", headers=admin).json()
+    before = first_names(dentist)
+    assert client.put("/adsweb/api/v1/patient/1", headers=admin, json={**patient, "first_name": "Gwendolyn"}).status_code == 200
+
+    # The writer reads its write; others read the (never caught up) replica
+    assert first_names(admin) == before - {"Gillian"} | {"Gwendolyn"}
+    assert first_names(dentist) == before
+
+
+def test_unhealthy_replica_falls_back_to_primary(engine, tmp_path):
+    missing = sqlite_engine(f"sqlite+aiosqlite:///{tmp_path / 'missing' / 'replica.db'}")
+    router = ReplicaRouter(engine, [missing])
+    factory = routing_sessionmaker(router)
+
+    async def run():
+        await router.check_replicas()
+        assert router.healthy_replicas() == [] and router.reader() is engine
+        assert "White" in await last_names(factory, **{REPLICA_READS: True})
+
+    asyncio.run(run())
+
+
+def test_cache_fills_read_the_primary(engine, replica_url):
+    factory = routing_sessionmaker(ReplicaRouter(engine, [sqlite_engine(replica_url)]))
+    principal_cache.clear()
+    response_cache.use(MemoryBackend())
+
+    async def run():
+        async with factory() as db:
+            user = User(username="rlag", email="rlag@mail.com", password_hash=hash_password("pw"))
+            patient = Patient(patient_no="P901", first_name="Rita", last_name="Lag", email="rlag@mail.com")
+            db.add_all([user, patient])
+            await db.commit()
+        # Only the primary has them; a replica load would cache a miss or a 404
+        async with factory() as db:
+            db.info[REPLICA_READS] = True
+            assert (await get_principal(db, "rlag@mail.com")).id == user.id
+            assert b'"last_name":"Lag"' in await cached_patient_service(db, patient.id)
+
+    asyncio.run(run())
+
+
+def test_stickiness_follows_the_user_across_tokens(client, engine, replica_url):
+    router = ReplicaRouter(engine, [sqlite_engine(replica_url)], sticky_seconds=60)
+    factory = routing_sessionmaker(router)
+
+    def request(method: str, email: str) -> Request:
+        token = create_access_token({"sub": email, "role": "PATIENT", "nonce": method})
+        return Request({"type": "http", "method": method, "headers": [(b"authorization", f"Bearer {token}".encode())]})
+
+    async def reads_replica(email: str) -> bool:
+        async with request_session(factory, request("GET", email)) as db:
+            return bool(db.info.get(REPLICA_READS))
+
+    async def run():
+        assert await reads_replica("gwhite@mail.com")
+        async with request_session(factory, request("POST", "gwhite@mail.com")):
+            pass
+        # Another token for the same subject is sticky; other users are not
+        assert not await reads_replica("gwhite@mail.com")
+        assert await reads_replica("jbell@mail.com")
+
+    asyncio.run(run())
+
+    async def routed_database(request: Request):
+        async with request_session(factory, request) as session:
+            yield session
+
+    app.dependency_overrides[get_database] = routed_database
+    response = client.post("/api/v1/login", json={"email": "ianm@mail.com", "password": "password"})
+    assert response.status_code == 200
+    assert router.is_sticky("ianm@mail.com")
+
+
+def test_first_calendar_version_is_read_back_from_the_primary(engine, database_url, tmp_path):
+    async def add_dentist() -> int:
+        async with routing_sessionmaker(ReplicaRouter(engine))() as db:
+            dentist = Dentist(first_name="Nia", last_name="New", surgery_id=1)
+            db.add(dentist)
+            await db.commit()
+            return dentist.id
+
+    dentist_id = asyncio.run(add_dentist())
+    # The replica has the dentist but, like the primary, no calendar version yet
+    path = tmp_path / "ads_replica.db"
+    shutil.copyfile(database_url.split(":///", 1)[1], path)
+    factory = routing_sessionmaker(ReplicaRouter(engine, [sqlite_engine(f"sqlite+aiosqlite:///{path}")]))
+
+    async def run():
+        async with factory() as db:
+            db.info[REPLICA_READS] = True
+            return await dentist_calendar_version_service(db, dentist_id)
+
+    assert asyncio.run(run()) == 0
@@ -0,0 +1,38 @@
+URL = "/adsweb/api/v1/surgeries"
+
+
+def test_surgeries_are_served_from_memory_with_a_strong_etag(client, auth_headers, statements):
+    headers = auth_headers("gwhite@mail.com", "PATIENT")
+    first = client.get(URL, headers=headers)
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+    assert not etag.startswith("W/") and first.headers["cache-control"].startswith("private, max-age=")
+    assert [s["name"] for s in first.json()["items"]] == ["Bells Court Dental", "The Galleria Surgery"]
+
+    statements.clear()
+    again = client.get(URL, headers=headers)
+    assert again.content == first.content and again.headers["etag"] == etag
+    revalidated = client.get(URL, headers={**headers, "If-None-Match": etag})
+    assert revalidated.status_code == 304 and not revalidated.content
+    assert not [s for s in statements if "surgeries" in s]
+
+
+def test_new_dentist_invalidates_surgery_data(client, auth_headers):
+    headers = auth_headers("admin@ads.com", "ADMIN")
+    etag = client.get(URL, headers=headers).headers["etag"]
+    dentists = client.get(f"{URL}/1/dentists", headers=headers)
+    assert [d["last_name"] for d in dentists.json()] == ["Smith"]
+
+    client.post("/adsweb/api/v1/dentists/register", json={
+        "email": "rplevin@ads.com", "password": "pw", "first_name": "Robin", "last_name": "Plevin",
+        "phone": "641-555-0101", "specialization": "General", "surgery_id": 1,
+    })
+    assert client.get(URL, headers={**headers, "If-None-Match": etag}).status_code == 200
+    refreshed = client.get(f"{URL}/1/dentists", headers={**headers, "If-None-Match": dentists.headers["etag"]})
+    assert [d["last_name"] for d in refreshed.json()] == ["Smith", "Plevin"]
+
+
+def test_unknown_surgery_is_not_cached(client, auth_headers):
+    headers = auth_headers("admin@ads.com", "ADMIN")
+    assert client.get(f"{URL}/99/dentists", headers=headers).status_code == 404
+    assert client.get(f"{URL}/99/dentists", headers=headers).status_code == 404
@@ -0,0 +1,48 @@
+PATIENT = {
+    "first_name": "Ada", "last_name": "Lovelace", "phone": "641-555-0199", "email": "ada@mail.com", "password": "pw",
+    "address": {"street": "1 Analytical Way", "city": "London", "state": "LN", "zip_code": "00001"},
+}
+
+
+def test_patient_registration_is_inserts_only(client, auth_headers, statements):
+    headers = auth_headers("admin@ads.com", "ADMIN")
+    # The first registration also reserves a block of patient numbers
+    client.post("/adsweb/api/v1/patients", headers=headers, json={**PATIENT, "last_name": "Byron", "email": "first@mail.com"})
+    statements.clear()
+    response = client.post("/adsweb/api/v1/patients", headers=headers, json=PATIENT)
+    assert response.status_code == 201, response.text
+    body = response.json()
+    assert body["email"] == "ada@mail.com" and body["address"]["city"] == "London" and body["id"]
+
+    # Role ids were cached at startup: no SELECT, no refresh
+    tables = [s.split()[2] for s in statements]
+    assert all(s.lstrip().upper().startswith("INSERT") for s in statements)
+    assert tables == ["users", "user_roles", "addresses", "patients", "patient_search_terms"]
+
+    login = client.post("/api/v1/login", json={"email": "ada@mail.com", "password": "pw"}).json()
+    assert login["user"]["roles"] == ["PATIENT"]
+    assert client.get("/adsweb/api/v1/patient/search/lovelace", headers=headers).json()[0]["id"] == body["id"]
+
+
+def test_duplicate_email_is_rejected(client, auth_headers):
+    response = client.post("/adsweb/api/v1/patients", headers=auth_headers("admin@ads.com", "ADMIN"),
+                           json={**PATIENT, "email": "gwhite@mail.com"})
+    assert response.status_code == 400
+    assert client.post("/adsweb/api/v1/users/", json={
+        "email": "new@ads.com", "username": "tsmith", "password": "pw", "role": "ADMIN",
+    }).status_code == 400
+
+
+def test_dentist_and_user_creation(client):
+    dentist = client.post("/adsweb/api/v1/dentists/register", json={
+        "email": "rplevin@ads.com", "password": "pw", "first_name": "Robin", "last_name": "Plevin",
+        "phone": "641-555-0101", "specialization": "General", "surgery_id": 1,
+    })
+    assert dentist.status_code == 201, dentist.text
+    assert dentist.json()["surgery_id"] == 1 and dentist.json()["user_id"]
+    user = client.post("/adsweb/api/v1/users/", json={
+        "email": "ops@ads.com", "username": "ops", "password": "pw", "role": "ADMIN",
+    })
+    assert user.status_code == 201 and user.json()["role"] == "ADMIN"
+    login = client.post("/api/v1/login", json={"email": "rplevin@ads.com", "password": "pw"}).json()
+    assert login["user"]["roles"] == ["DENTIST"]
@@ -0,0 +1,130 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.core.response_cache import MemoryBackend, RedisBackend, ResponseCache, response_cache
+
+
+@pytest.fixture
+def resp_server():
+    """A local stand-in for Redis: GET, SET [PX ms], DEL and PING over RESP."""
+    data = {}
+
+    async def reply(writer, value):
+        if value is None:
+            writer.write(b"$-1\r\n")
+        elif isinstance(value, int):
+            writer.write(b":%d\r\n" % value)
+        elif isinstance(value, str):
+            writer.write(b"+%s\r\n" % value.encode())
+        else:
+            writer.write(b"$%d\r\n%s\r\n" % (len(value), value))
+        await writer.drain()
+
+    async def handle(reader, writer):
+        try:
+            while True:
+                count = int((await reader.readuntil(b"\r\n"))[1:-2])
+                args = []
+                for _ in range(count):
+                    length = int((await reader.readuntil(b"\r\n"))[1:-2])
+                    args.append((await reader.readexactly(length + 2))[:-2])
+                command, args = args[0].upper(), args[1:]
+                if command == b"GET":
+                    value, expires_at = data.get(args[0], (None, None))
+                    if expires_at is not None and expires_at <= time.monotonic():
+                        del data[args[0]]
+                        value = None
+                    await reply(writer, value)
+                elif command == b"SET":
+                    ttl = int(args[3]) / 1000 if len(args) > 3 else None
+                    data[args[0]] = (args[1], time.monotonic() + ttl if ttl else None)
+                    await reply(writer, "OK")
+                elif command == b"DEL":
+                    await reply(writer, sum(data.pop(k, None) is not None for k in args))
+                else:
+                    await reply(writer, "PONG")
+        except (asyncio.IncompleteReadError, ConnectionError):
+            writer.close()
+
+    loop = asyncio.new_event_loop()
+    server = loop.run_until_complete(asyncio.start_server(handle, "127.0.0.1", 0))
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    yield f"redis://127.0.0.1:{server.sockets[0].getsockname()[1]}/0"
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+
+
+def test_patient_detail_is_cached_until_updated(client, auth_headers, statements):
+    headers = auth_headers("tsmith@ads.com", "DENTIST")
+    patient = client.get("/adsweb/api/v1/patient/1", headers=headers).json()
+    statements.clear()
+    assert client.get("/adsweb/api/v1/patient/1", headers=headers).json() == patient
+    assert not [s for s in statements if "FROM patients" in s]
+    assert response_cache.stats() == {"hits": {"patient": 1}, "misses": {"patient": 1}}
+
+    client.put("/adsweb/api/v1/patient/1", headers=auth_headers("admin@ads.com", "ADMIN"),
+               json={**patient, "first_name": "Gillian"})
+    assert client.get("/adsweb/api/v1/patient/1", headers=headers).json()["first_name"] == "Gillian"
+
+
+def test_deleted_user_and_patient_are_not_served_from_cache(client, auth_headers):
+    admin = auth_headers("admin@ads.com", "ADMIN")
+    assert client.get("/adsweb/api/v1/users/4").json()["email"] == "gwhite@mail.com"
+    assert client.get("/adsweb/api/v1/patient/1", headers=admin).status_code == 200
+    assert client.delete("/adsweb/api/v1/users/4").status_code == 204
+    assert client.get("/adsweb/api/v1/users/4").status_code == 404
+    assert client.get("/adsweb/api/v1/patient/1", headers=admin).status_code == 404
+
+
+def test_concurrent_misses_load_once():
+    cache = ResponseCache(MemoryBackend())
+    calls = 0
+
+    async def load():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return b"{}"
+
+    async def storm():
+        return await asyncio.gather(*(cache.get_or_load("patient", 1, load) for _ in range(20)))
+
+    assert asyncio.run(storm()) == [b"{}"] * 20
+    assert calls == 1
+
+
+def test_redis_protocol_backend(resp_server):
+    cache = ResponseCache(RedisBackend(resp_server))
+    loads = []
+
+    async def load():
+        loads.append(1)
+        return b'{"id":1}'
+
+    async def scenario():
+        assert await cache.get_or_load("user", 1, load) == b'{"id":1}'
+        assert await cache.get_or_load("user", 1, load) == b'{"id":1}'
+        await cache.invalidate(("user", 1))
+        await cache.get_or_load("user", 1, load)
+        await cache.backend.set("short", b"x", 0.05)
+        await asyncio.sleep(0.1)
+        return await cache.backend.get("short")
+
+    assert asyncio.run(scenario()) is None
+    assert len(loads) == 2 and cache.stats() == {"hits": {"user": 1}, "misses": {"user": 2}}
+
+
+def test_api_through_redis_backend(client, resp_server):
+    response_cache.use(RedisBackend(resp_server))
+    first = client.get("/adsweb/api/v1/users/1")
+    assert client.get("/adsweb/api/v1/users/1").json() == first.json()
+    assert response_cache.stats()["hits"] == {"user": 1}
+
+
+def test_unreachable_backend_falls_back_to_the_database(client):
+    response_cache.use(RedisBackend("redis://127.0.0.1:1/0", timeout=0.2))
+    assert client.get("/adsweb/api/v1/users/1").json()["email"] == "admin@ads.com"
@@ -0,0 +1,49 @@
+import asyncio
+import time
+
+from fastapi import HTTPException
+
+from app.core.security import PasswordHasher, hash_password, verify_password
+
+
+def test_long_passwords_verify_against_their_hash():
+    password = "x" * 100
+    assert verify_password(password, hash_password(password))
+
+
+def test_hasher_rejects_calls_beyond_workers_plus_queue():
+    hasher = PasswordHasher("thread", workers=1, queue_size=1)
+
+    async def storm():
+        return await asyncio.gather(*(hasher.run(time.sleep, 0.2) for _ in range(4)), return_exceptions=True)
+
+    try:
+        results = asyncio.run(storm())
+    finally:
+        hasher.shutdown()
+    rejected = [r for r in results if isinstance(r, HTTPException)]
+    assert len(rejected) == 2
+    assert all(r.status_code == 503 for r in rejected)
+
+
+def test_hashing_does_not_block_the_event_loop():
+    hasher = PasswordHasher("thread", workers=2, queue_size=0)
+
+    async def scenario():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        task = asyncio.create_task(ticker())
+        await asyncio.gather(hasher.run(hash_password, "secret"), hasher.run(hash_password, "secret"))
+        task.cancel()
+        return ticks
+
+    try:
+        assert asyncio.run(scenario()) > 0
+    finally:
+        hasher.shutdown()
@@ -0,0 +1,36 @@
+import asyncio
+
+from app.api import serialization
+from app.api.serialization import FastJSONResponse
+from app.core.principal import Principal
+from app.schemas.appointment_dto import AppointmentDTO
+from app.services.appointment_service import list_appointments_service
+
+ADMIN = Principal(id=1, email="admin@ads.com", roles=("ADMIN",))
+
+
+def test_trusted_dtos_match_validated_ones(session_factory):
+    async def page():
+        async with session_factory() as db:
+            return await list_appointments_service(db, ADMIN, 50, None)
+
+    items = asyncio.run(page())["items"]
+    for dto in items:
+        # Built without validation, yet identical to what validation produces
+        assert dto == AppointmentDTO.model_validate(dto.model_dump())
+        assert dto.model_dump_json() == AppointmentDTO.model_validate(dto.model_dump()).model_dump_json()
+
+
+def test_list_responses_keep_their_json_shape(client, auth_headers):
+    body = client.get("/adsweb/api/v1/appointments/", headers=auth_headers("admin@ads.com", "ADMIN")).json()
+    first = body["items"][0]
+    assert first["appointment_date"] == "2013-09-12T00:00:00" and first["status"] == "BOOKED"
+    assert [d["last_name"] for d in first["surgery"]["dentists"]] == ["Smith"]
+    assert body["next_cursor"] is None
+
+
+def test_json_fallback_without_orjson(monkeypatch):
+    content = {"name": "Zoë", "items": [1, 2.5, None, True]}
+    fast = FastJSONResponse(content).body
+    monkeypatch.setattr(serialization, "orjson", None)
+    assert FastJSONResponse(content).body == fast
@@ -0,0 +1,36 @@
+import json
+
+import pytest
+
+NDJSON = {"Accept": "application/x-ndjson"}
+
+
+@pytest.mark.parametrize(
+    "path, expected_rows",
+    [
+        ("/adsweb/api/v1/patients", 3),
+        ("/adsweb/api/v1/users/", 6),
+        ("/adsweb/api/v1/appointments/", 3),
+    ],
+)
+def test_ndjson_streams_one_dto_per_line(client, auth_headers, path, expected_rows):
+    headers = {**auth_headers("admin@ads.com", "ADMIN"), **NDJSON}
+    response = client.get(path, headers=headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert len(rows) == expected_rows
+    assert all("id" in row for row in rows)
+
+
+def test_streamed_appointments_respect_visibility(client, auth_headers):
+    headers = {**auth_headers("gwhite@mail.com", "PATIENT"), **NDJSON}
+    response = client.get("/adsweb/api/v1/appointments/", headers=headers)
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["patient"]["patient_no"] for row in rows] == ["P001"]
+
+
+def test_json_remains_the_default(client, auth_headers):
+    response = client.get("/adsweb/api/v1/patients", headers=auth_headers("admin@ads.com", "ADMIN"))
+    assert response.headers["content-type"].startswith("application/json")
+    assert "items" in response.json()
@@ -0,0 +1,87 @@
+import asyncio
+from datetime import date, datetime, timedelta
+
+import httpx
+from sqlalchemy import func, select
+
+from app.db.models import Appointment, DentistWeeklyBookings
+from app.main import app
+from app.services.appointment_service import delete_appointment_service
+
+URL = "/adsweb/api/v1/appointments/"
+
+
+def booking(dentist_id: int, surgery_id: int, at: datetime) -> dict:
+    return {"dentist_id": dentist_id, "surgery_id": surgery_id, "patient_id": 1, "appointment_date": at.isoformat()}
+
+
+def test_sixth_booking_in_a_week_is_rejected(client, auth_headers, session_factory):
+    headers = auth_headers("gwhite@mail.com", "PATIENT")
+    # Seed: dentist 1 already has two appointments in the week of Monday 2013-09-09
+    monday = datetime(2013, 9, 9, 14, 0)
+    statuses = [
+        client.post(URL, headers=headers, json=booking(1, 1, monday + timedelta(days=i))).status_code
+        for i in range(4)
+    ]
+    assert statuses == [200, 200, 200, 409]
+    # The following week is counted separately
+    assert client.post(URL, headers=headers, json=booking(1, 1, monday + timedelta(days=7))).status_code == 200
+
+    async def delete_one():
+        async with session_factory() as session:
+            appointment_id = (await session.execute(
+                select(Appointment.id).where(Appointment.appointment_date == date(2013, 9, 9))
+            )).scalar_one()
+            await delete_appointment_service(session, appointment_id)
+
+    asyncio.run(delete_one())
+    assert client.post(URL, headers=headers, json=booking(1, 1, monday + timedelta(hours=1))).status_code == 200
+
+
+def test_concurrent_bookings_admit_exactly_the_weekly_limit(client, auth_headers, session_factory):
+    headers = auth_headers("gwhite@mail.com", "PATIENT")
+    monday = datetime(2013, 9, 16, 8, 0)
+
+    async def storm():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test", timeout=60) as http:
+            responses = await asyncio.gather(*(
+                http.post(URL, headers=headers, json=booking(2, 2, monday + timedelta(minutes=i)))
+                for i in range(200)
+            ))
+        return [r.status_code for r in responses]
+
+    statuses = asyncio.run(storm())
+    assert statuses.count(200) == 5
+    assert statuses.count(409) == 195
+
+    async def stored():
+        async with session_factory() as session:
+            appointments = (await session.execute(
+                select(func.count()).select_from(Appointment).where(Appointment.appointment_date == date(2013, 9, 16))
+            )).scalar_one()
+            counter = (await session.execute(
+                select(DentistWeeklyBookings.booked).where(DentistWeeklyBookings.dentist_id == 2,
+                                                           DentistWeeklyBookings.week_start == date(2013, 9, 16))
+            )).scalar_one()
+            return appointments, counter
+
+    assert asyncio.run(stored()) == (5, 5)
+
+
+def test_deleting_a_patient_or_user_releases_their_places(client, auth_headers):
+    admin = auth_headers("admin@ads.com", "ADMIN")
+    gwhite = auth_headers("gwhite@mail.com", "PATIENT")
+    ianm = auth_headers("ianm@mail.com", "PATIENT")
+    monday = datetime(2013, 9, 9, 14, 0)
+    book = lambda headers, i: client.post(URL, headers=headers, json=booking(1, 1, monday + timedelta(hours=i))).status_code
+
+    # Seed: two places taken; patient 3 takes the other three
+    assert [book(ianm, i) for i in range(3)] == [200, 200, 200]
+    assert book(gwhite, 3) == 409
+    assert client.delete("/adsweb/api/v1/patient/3", headers=admin).status_code == 204
+    assert [book(gwhite, i) for i in range(3, 7)] == [200, 200, 200, 409]
+
+    # jbell (user 5, patient 2) holds one seeded place; the database cascades their patient away
+    assert client.delete("/adsweb/api/v1/users/5", headers=admin).status_code == 204
+    assert book(gwhite, 7) == 200
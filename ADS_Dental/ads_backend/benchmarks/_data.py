@@ -0,0 +1,87 @@
+# benchmarks/_data.py
+# Synthetic dataset shared by the benchmark scripts. Rows are bulk-inserted
+# through Core so generating 100k+ rows takes seconds, not minutes.
+import os
+import random
+import tempfile
+from datetime import date, time, timedelta
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite://")
+
+from sqlalchemy import create_engine, insert
+
+from app.db.models import Base, Address, Surgery, Dentist, Patient, Appointment, User, Role, user_roles
+from app.db.weekly_bookings import rebuild_weekly_bookings
+
+FIRST_NAMES = ["Gillian", "Jill", "Ian", "John", "Tony", "Helen", "Robin", "Ada", "Grace", "Alan"]
+LAST_NAMES = ["White", "Bell", "MacKay", "Walker", "Smith", "Pearson", "Plevin", "Lovelace", "Hopper", "Turing"]
+BATCH = 10_000
+
+
+def _batched(rows):
+    for i in range(0, len(rows), BATCH):
+        yield rows[i:i + BATCH]
+
+
+def build_database(patients: int, appointments: int = 0, surgeries: int = 10, dentists_per_surgery: int = 5,
+                   path: str | None = None, seed: int = 489) -> str:
+    """Create a SQLite file with the requested volume and return its async URL."""
+    rnd = random.Random(seed)
+    path = path or os.path.join(tempfile.mkdtemp(prefix="ads_bench_"), "bench.db")
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+
+    with engine.begin() as conn:
+        conn.execute(insert(Role), [{"name": "ADMIN"}, {"name": "DENTIST"}, {"name": "PATIENT"}])
+        conn.execute(insert(Address), [
+            {"street": f"{i} Main Street", "city": f"City{i % 500}", "state": "IA", "zip_code": f"{52000 + i % 1000}"}
+            for i in range(1, surgeries + patients + 1)
+        ])
+        conn.execute(insert(Surgery), [
+            {"surgery_no": f"S{i:03d}", "name": f"Surgery {i}", "phone": "641-555-0000", "address_id": i}
+            for i in range(1, surgeries + 1)
+        ])
+        dentist_count = surgeries * dentists_per_surgery
+        users = [
+            {"username": f"user{i}", "email": f"user{i}@ads.com", "password_hash": "x"}
+            for i in range(1, dentist_count + patients + 1)
+        ]
+        for chunk in _batched(users):
+            conn.execute(insert(User), chunk)
+        links = [{"user_id": i, "role_id": 2 if i <= dentist_count else 3} for i in range(1, len(users) + 1)]
+        for chunk in _batched(links):
+            conn.execute(insert(user_roles), chunk)
+        conn.execute(insert(Dentist), [
+            {"user_id": i, "first_name": rnd.choice(FIRST_NAMES), "last_name": rnd.choice(LAST_NAMES),
+             "phone": "641-555-1111", "email": f"user{i}@ads.com", "specialization": "General",
+             "surgery_id": (i - 1) // dentists_per_surgery + 1}
+            for i in range(1, dentist_count + 1)
+        ])
+        patient_rows = [
+            {"user_id": dentist_count + i, "patient_no": f"P{i:08d}", "first_name": rnd.choice(FIRST_NAMES),
+             "last_name": rnd.choice(LAST_NAMES), "phone": f"641-{i:07d}", "email": f"user{dentist_count + i}@ads.com",
+             "address_id": surgeries + i}
+            for i in range(1, patients + 1)
+        ]
+        for chunk in _batched(patient_rows):
+            conn.execute(insert(Patient), chunk)
+
+        start = date(2013, 1, 1)
+        appointment_rows = []
+        for i in range(appointments):
+            dentist_id = i % dentist_count + 1
+            slot = i // dentist_count
+            appointment_rows.append({
+                "appointment_date": start + timedelta(days=slot // 8),
+                "appointment_time": time(9 + slot % 8, 0),
+                "status": "COMPLETED",
+                "patient_id": rnd.randint(1, patients),
+                "dentist_id": dentist_id,
+                "surgery_id": (dentist_id - 1) // dentists_per_surgery + 1,
+            })
+        for chunk in _batched(appointment_rows):
+            conn.execute(insert(Appointment), chunk)
+        rebuild_weekly_bookings(conn)
+    engine.dispose()
+    return f"sqlite+aiosqlite:///{path}"
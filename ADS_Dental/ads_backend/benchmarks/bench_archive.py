@@ -0,0 +1,99 @@
+# benchmarks/bench_archive.py
+# Calendar and appointment-list latency over a large history, before and after
+# the finished appointments are moved to appointments_archive. The hot set is
+# two weeks of BOOKED appointments per dentist after the end of the history.
+#
+#   python -m benchmarks.bench_archive --appointments 10000000
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from datetime import time as time_of_day, timedelta
+
+from benchmarks._data import build_database
+
+from sqlalchemy import create_engine, func, insert, select
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+
+from app.core.principal import Principal
+from app.db.archival import archive_appointments
+from app.db.models import Appointment
+from app.services.appointment_service import list_appointments_service
+from app.services.calendar_service import dentist_calendar_service
+
+HOT_DAYS = 14
+
+
+def add_hot_set(path: str, dentists: int, dentists_per_surgery: int, patients: int, seed: int):
+    rnd = random.Random(seed)
+    engine = create_engine(f"sqlite:///{path}")
+    with engine.begin() as conn:
+        start = conn.execute(select(func.max(Appointment.appointment_date))).scalar() + timedelta(days=7)
+        conn.execute(insert(Appointment), [
+            {"appointment_date": start + timedelta(days=day), "appointment_time": time_of_day(9 + hour, 0),
+             "status": "BOOKED", "patient_id": rnd.randint(1, patients), "dentist_id": dentist_id,
+             "surgery_id": (dentist_id - 1) // dentists_per_surgery + 1}
+            for dentist_id in range(1, dentists + 1) for day in range(HOT_DAYS) for hour in range(2)
+        ])
+    engine.dispose()
+    return start
+
+
+async def measure(session_factory, dentists: int, patients: int, start, repeat: int, seed: int):
+    rnd = random.Random(seed)
+    samples = {"calendar": [], "dentist list": [], "patient list": []}
+
+    async def timed(name, call):
+        async with session_factory() as db:
+            started = time.perf_counter()
+            await call(db)
+            samples[name].append((time.perf_counter() - started) * 1000)
+
+    for _ in range(repeat):
+        dentist_id, patient_id = rnd.randint(1, dentists), rnd.randint(1, patients)
+        dentist = Principal(id=dentist_id, email="", roles=("DENTIST",), dentist_id=dentist_id)
+        patient = Principal(id=dentists + patient_id, email="", roles=("PATIENT",), patient_id=patient_id)
+        await timed("calendar", lambda db: dentist_calendar_service(db, dentist_id, 0, start, start + timedelta(days=6)))
+        await timed("dentist list", lambda db: list_appointments_service(db, dentist, 50))
+        await timed("patient list", lambda db: list_appointments_service(db, patient, 50))
+    return {name: statistics.median(values) for name, values in samples.items()}
+
+
+async def run(url: str, dentists: int, patients: int, start, repeat: int, batch_size: int, seed: int):
+    engine = create_async_engine(url)
+    session_factory = async_sessionmaker(bind=engine, expire_on_commit=False, class_=AsyncSession)
+
+    before = await measure(session_factory, dentists, patients, start, repeat, seed)
+    started = time.perf_counter()
+    moved = await archive_appointments(session_factory, before=start, batch_size=batch_size)
+    elapsed = time.perf_counter() - started
+    after = await measure(session_factory, dentists, patients, start, repeat, seed)
+    await engine.dispose()
+
+    print(f"archived {moved} rows in {elapsed:.1f}s ({moved / elapsed:.0f} rows/s, batch {batch_size})")
+    print(f"{'p50 ms':<14}{'before':>10}{'after':>10}")
+    for name in before:
+        print(f"{name:<14}{before[name]:>10.2f}{after[name]:>10.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hot-set latency before and after archiving history")
+    parser.add_argument("--appointments", type=int, default=1_000_000)
+    parser.add_argument("--patients", type=int, default=10_000)
+    parser.add_argument("--surgeries", type=int, default=10)
+    parser.add_argument("--dentists-per-surgery", type=int, default=5)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=489)
+    args = parser.parse_args()
+
+    url = build_database(patients=args.patients, appointments=args.appointments, surgeries=args.surgeries,
+                         dentists_per_surgery=args.dentists_per_surgery)
+    dentists = args.surgeries * args.dentists_per_surgery
+    start = add_hot_set(url.split(":///", 1)[1], dentists, args.dentists_per_surgery, args.patients, args.seed)
+    asyncio.run(run(url, dentists, args.patients, start, args.repeat, args.batch_size, args.seed))
+
+
+if __name__ == "__main__":
+    main()
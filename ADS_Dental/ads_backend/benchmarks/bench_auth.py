@@ -0,0 +1,82 @@
+# benchmarks/bench_auth.py
+# Per-request auth overhead. "legacy" reproduces the old dependency chain (one
+# jwt.decode in require_role and another in get_current_user); "cached" is the
+# shared get_claims dependency backed by the claims cache.
+#
+#   python -m benchmarks.bench_auth --requests 20000
+import argparse
+import asyncio
+import time
+
+import httpx
+from fastapi import Depends, FastAPI
+from jose import jwt
+
+from app.api.dependencies.rbac import require_role
+from app.core.config import ALGORITHM, SECRET_KEY
+from app.core.security import claims_cache, create_access_token, decode_token, get_claims
+
+ROLES = ["ADMIN", "DENTIST"]
+
+
+def legacy_auth(token: str) -> dict:
+    payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])  # require_role
+    assert payload.get("role") in ROLES
+    payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])  # get_current_user
+    assert payload.get("sub")
+    return payload
+
+
+def cached_auth(token: str) -> dict:
+    claims = decode_token(token)  # resolved once per request by FastAPI
+    assert claims.get("role") in ROLES
+    assert claims.get("sub")
+    return claims
+
+
+def per_call_us(fn, tokens, requests: int) -> float:
+    started = time.perf_counter()
+    for i in range(requests):
+        fn(tokens[i % len(tokens)])
+    return (time.perf_counter() - started) / requests * 1e6
+
+
+async def endpoint_us(requests: int, token: str) -> float:
+    # Full round trip through a route using require_role and get_claims, no database
+    app = FastAPI()
+
+    @app.get("/guarded", dependencies=[Depends(require_role(ROLES))])
+    async def guarded(claims: dict = Depends(get_claims)):
+        return {"sub": claims["sub"]}
+
+    headers = {"Authorization": f"Bearer {token}"}
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        started = time.perf_counter()
+        for _ in range(requests):
+            await client.get("/guarded", headers=headers)
+        return (time.perf_counter() - started) / requests * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="JWT verification cost per authenticated request")
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--users", type=int, default=100, help="distinct tokens in rotation")
+    args = parser.parse_args()
+
+    tokens = [create_access_token({"sub": f"user{i}@ads.com", "role": "ADMIN"}) for i in range(args.users)]
+
+    legacy = per_call_us(legacy_auth, tokens, args.requests)
+    claims_cache.clear()
+    cached = per_call_us(cached_auth, tokens, args.requests)
+
+    print(f"{'path':<24}{'us/request':>12}")
+    print(f"{'legacy (2 decodes)':<24}{legacy:>12.1f}")
+    print(f"{'cached claims':<24}{cached:>12.1f}")
+    print(f"{'speedup':<24}{legacy / cached:>11.1f}x")
+
+    claims_cache.clear()
+    print(f"{'ASGI round trip':<24}{asyncio.run(endpoint_us(args.requests // 10, tokens[0])):>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
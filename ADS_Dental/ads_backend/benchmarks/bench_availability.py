@@ -0,0 +1,61 @@
+# benchmarks/bench_availability.py
+# Latency of a four-week surgery availability lookup (every dentist of the
+# surgery): "cold" loads the bitmaps with one range query, "warm" is served
+# from the incrementally maintained bitmaps.
+#
+#   python -m benchmarks.bench_availability --appointments 500000
+import argparse
+import asyncio
+import statistics
+import time
+from datetime import date, timedelta
+
+from benchmarks._data import build_database
+
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+
+from app.db.availability import availability_cache
+from app.services.availability_service import surgery_availability_service
+
+START = date(2013, 3, 4)
+END = START + timedelta(days=27)
+
+
+async def run(url: str, surgeries: int, repeat: int):
+    engine = create_async_engine(url)
+    session_factory = async_sessionmaker(bind=engine, expire_on_commit=False, class_=AsyncSession)
+
+    async def timed(surgery_id: int) -> float:
+        async with session_factory() as db:
+            started = time.perf_counter()
+            await surgery_availability_service(db, surgery_id, START, END)
+            return (time.perf_counter() - started) * 1000
+
+    cold, warm = [], []
+    for i in range(repeat):
+        surgery_id = i % surgeries + 1
+        availability_cache.clear()
+        cold.append(await timed(surgery_id))
+        warm.append(await timed(surgery_id))
+    await engine.dispose()
+
+    print(f"{'mode':<8}{'p50 ms':>10}{'max ms':>10}")
+    print(f"{'cold':<8}{statistics.median(cold):>10.2f}{max(cold):>10.2f}")
+    print(f"{'warm':<8}{statistics.median(warm):>10.2f}{max(warm):>10.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Four-week surgery availability latency")
+    parser.add_argument("--appointments", type=int, default=200_000)
+    parser.add_argument("--surgeries", type=int, default=10)
+    parser.add_argument("--dentists-per-surgery", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    url = build_database(patients=1000, appointments=args.appointments, surgeries=args.surgeries,
+                         dentists_per_surgery=args.dentists_per_surgery)
+    asyncio.run(run(url, args.surgeries, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+# benchmarks/bench_booking_race.py
+# Load harness for the booking hot path: N patients race, all at once, for M
+# freshly opened slots through POST /appointments. Every slot should be booked
+# exactly once and every loser should get a 409, never a 500.
+#
+#   python -m benchmarks.bench_booking_race --patients 500 --slots 20
+import argparse
+import asyncio
+import random
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+
+from benchmarks._data import build_database
+
+import httpx
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+
+from app.main import app
+from app.core.security import create_access_token
+from app.db.session import get_database
+
+DENTISTS_PER_SURGERY = 5
+FIRST_MONDAY = datetime(2014, 1, 6, 9, 0)
+
+
+def percentile(samples, pct):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * pct / 100))]
+
+
+def open_slots(count: int, dentists: int):
+    # One slot per dentist and week, so the weekly limit never interferes
+    return [
+        {"dentist_id": j % dentists + 1, "surgery_id": (j % dentists) // DENTISTS_PER_SURGERY + 1,
+         "appointment_date": (FIRST_MONDAY + timedelta(weeks=j // dentists)).isoformat()}
+        for j in range(count)
+    ]
+
+
+async def run(url: str, patients: int, slots: int, dentists: int, seed: int):
+    engine = create_async_engine(url)
+    session_factory = async_sessionmaker(bind=engine, expire_on_commit=False, class_=AsyncSession)
+
+    async def override_get_database():
+        async with session_factory() as session:
+            yield session
+
+    app.dependency_overrides[get_database] = override_get_database
+    rnd = random.Random(seed)
+    targets = open_slots(slots, dentists)
+    requests = []
+    for i in range(1, patients + 1):
+        token = create_access_token({"sub": f"user{dentists + i}@ads.com", "role": "PATIENT"})
+        requests.append(({"Authorization": f"Bearer {token}"}, {**rnd.choice(targets), "patient_id": i}))
+
+    latencies, statuses = [], Counter()
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=120) as client:
+        async def book(headers, payload):
+            started = time.perf_counter()
+            response = await client.post("/adsweb/api/v1/appointments/", headers=headers, json=payload)
+            latencies.append((time.perf_counter() - started) * 1000)
+            statuses[response.status_code] += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(book(h, p) for h, p in requests))
+        elapsed = time.perf_counter() - started
+
+    app.dependency_overrides.clear()
+    await engine.dispose()
+
+    print(f"patients={patients} slots={slots} seed={seed}")
+    print(f"{'requests/s':<14}{patients / elapsed:>10.0f}")
+    print(f"{'p50 ms':<14}{percentile(latencies, 50):>10.1f}")
+    print(f"{'p95 ms':<14}{percentile(latencies, 95):>10.1f}")
+    print(f"{'p99 ms':<14}{percentile(latencies, 99):>10.1f}")
+    print(f"{'max ms':<14}{max(latencies):>10.1f}")
+    print(f"{'statuses':<14}{dict(sorted(statuses.items()))}")
+    contested = len({(p['dentist_id'], p['appointment_date']) for _, p in requests})
+    assert statuses[200] == contested, "every contested slot must be booked exactly once"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent patients racing for open slots")
+    parser.add_argument("--patients", type=int, default=500)
+    parser.add_argument("--slots", type=int, default=20)
+    parser.add_argument("--dentists", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=489)
+    args = parser.parse_args()
+
+    surgeries = -(-args.dentists // DENTISTS_PER_SURGERY)
+    url = build_database(patients=args.patients, surgeries=surgeries, dentists_per_surgery=DENTISTS_PER_SURGERY)
+    asyncio.run(run(url, args.patients, args.slots, surgeries * DENTISTS_PER_SURGERY, args.seed))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+# benchmarks/bench_bulk_booking.py
+# Booking a front-desk day sheet: one create_appointment_service call per row
+# (the old POST-per-row import) versus a single bulk_create_appointments_service.
+#
+#   python -m benchmarks.bench_bulk_booking --rows 500
+import argparse
+import asyncio
+import time
+from datetime import datetime, timedelta
+
+from benchmarks._data import build_database
+
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+
+from app.schemas.appointment_dto import AppointmentCreateDTO
+from app.services.appointment_service import bulk_create_appointments_service, create_appointment_service
+
+DENTISTS_PER_SURGERY = 5
+
+
+def day_sheet(rows: int, day: datetime):
+    dentists = -(-rows // 5)  # five appointments each, the weekly limit
+    return [
+        AppointmentCreateDTO(
+            dentist_id=i % dentists + 1,
+            surgery_id=(i % dentists) // DENTISTS_PER_SURGERY + 1,
+            patient_id=i + 1,
+            appointment_date=day + timedelta(hours=i // dentists),
+        )
+        for i in range(rows)
+    ]
+
+
+async def run(url: str, rows: int):
+    engine = create_async_engine(url)
+    session_factory = async_sessionmaker(bind=engine, expire_on_commit=False, class_=AsyncSession)
+
+    started = time.perf_counter()
+    async with session_factory() as db:
+        for payload in day_sheet(rows, datetime(2014, 1, 6, 9)):
+            await create_appointment_service(db, payload, payload.patient_id)
+    per_row = time.perf_counter() - started
+
+    started = time.perf_counter()
+    async with session_factory() as db:
+        result = await bulk_create_appointments_service(db, day_sheet(rows, datetime(2014, 1, 13, 9)))
+    bulk = time.perf_counter() - started
+    await engine.dispose()
+
+    print(f"{'mode':<10}{'rows':>8}{'created':>10}{'seconds':>10}{'rows/s':>10}")
+    print(f"{'per-row':<10}{rows:>8}{rows:>10}{per_row:>10.3f}{rows / per_row:>10.0f}")
+    print(f"{'bulk':<10}{rows:>8}{result['created']:>10}{bulk:>10.3f}{rows / bulk:>10.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Day-sheet booking: per-row versus bulk")
+    parser.add_argument("--rows", type=int, default=500)
+    args = parser.parse_args()
+
+    dentists = -(-args.rows // 5)
+    url = build_database(patients=args.rows, surgeries=-(-dentists // DENTISTS_PER_SURGERY),
+                         dentists_per_surgery=DENTISTS_PER_SURGERY)
+    asyncio.run(run(url, args.rows))
+
+
+if __name__ == "__main__":
+    main()
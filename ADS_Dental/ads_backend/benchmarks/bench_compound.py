@@ -0,0 +1,70 @@
+# benchmarks/bench_compound.py
+# Nested vs compound ("sideloaded") appointment pages: payload size (raw and
+# gzipped), serialization time and service time (queries + DTO building) for
+# one dentist's page of --limit appointments. Most of a nested page repeats
+# the same dentist and surgery (with its dentist list) on every row.
+#
+#   python -m benchmarks.bench_compound --appointments 200000 --limit 500
+import argparse
+import asyncio
+import gzip
+import statistics
+import time
+
+from benchmarks._data import build_database
+
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+
+from app.api.serialization import adapter
+from app.core.principal import Principal
+from app.schemas.appointment_dto import AppointmentCompoundPageDTO, AppointmentDTO
+from app.schemas.common import Page, trusted
+from app.services.appointment_service import list_appointments_compound_service, list_appointments_service
+
+
+async def nested_page(db, principal, limit):
+    page = await list_appointments_service(db, principal, limit)
+    return Page[AppointmentDTO], trusted(Page[AppointmentDTO], items=page["items"], next_cursor=page["next_cursor"])
+
+
+async def compound_page(db, principal, limit):
+    return AppointmentCompoundPageDTO, await list_appointments_compound_service(db, principal, limit)
+
+
+async def run(url: str, limit: int, repeat: int):
+    engine = create_async_engine(url)
+    session_factory = async_sessionmaker(bind=engine, expire_on_commit=False, class_=AsyncSession)
+    principal = Principal(id=1, email="user1@ads.com", roles=("DENTIST",), dentist_id=1)
+
+    print(f"{'format':<10}{'items':>7}{'bytes':>10}{'gzip':>9}{'service ms':>12}{'serialize ms':>14}")
+    sizes = {}
+    for name, build in (("nested", nested_page), ("compound", compound_page)):
+        service, serialize = [], []
+        for _ in range(repeat):
+            async with session_factory() as db:
+                started = time.perf_counter()
+                page_type, page = await build(db, principal, limit)
+                service.append((time.perf_counter() - started) * 1000)
+            started = time.perf_counter()
+            body = adapter(page_type).dump_json(page)
+            serialize.append((time.perf_counter() - started) * 1000)
+        sizes[name] = len(body)
+        print(f"{name:<10}{len(page.items):>7}{len(body):>10}{len(gzip.compress(body)):>9}"
+              f"{statistics.median(service):>12.1f}{statistics.median(serialize):>14.2f}")
+    print(f"compound payload is {sizes['compound'] / sizes['nested']:.0%} of nested")
+    await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Nested vs compound appointment pages")
+    parser.add_argument("--appointments", type=int, default=200_000)
+    parser.add_argument("--limit", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    url = build_database(patients=10_000, appointments=args.appointments)
+    asyncio.run(run(url, args.limit, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
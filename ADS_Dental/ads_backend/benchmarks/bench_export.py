@@ -0,0 +1,53 @@
+# benchmarks/bench_export.py
+# Export throughput (MB/s of response body, rows/s) and peak Python heap for
+# the appointment dump in each format. Peak memory should stay flat as
+# --appointments grows: only one batch is held at a time.
+#
+#   python -m benchmarks.bench_export --appointments 1000000
+import argparse
+import asyncio
+import time
+import tracemalloc
+
+from benchmarks._data import build_database
+
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+
+from app.services.export_service import EXPORT_FORMATS, appointment_export_query, export_chunks
+
+
+async def run(url: str, rows: int, batch_size: int):
+    engine = create_async_engine(url)
+    session_factory = async_sessionmaker(bind=engine, expire_on_commit=False, class_=AsyncSession)
+
+    print(f"{'format':<8}{'MB':>10}{'MB/s':>10}{'rows/s':>12}{'peak MB':>10}")
+    for fmt in EXPORT_FORMATS:
+        body = export_chunks(session_factory, appointment_export_query(), fmt, batch_size)
+        size = 0
+        started = time.perf_counter()
+        async for chunk in body():
+            size += len(chunk)
+        elapsed = time.perf_counter() - started
+        # Second pass for memory: tracemalloc slows allocation-heavy code a lot
+        tracemalloc.start()
+        async for _ in body():
+            pass
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        mb = size / 1e6
+        print(f"{fmt:<8}{mb:>10.1f}{mb / elapsed:>10.1f}{rows / elapsed:>12.0f}{peak / 1e6:>10.1f}")
+    await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Streaming export throughput and memory")
+    parser.add_argument("--appointments", type=int, default=200_000)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    args = parser.parse_args()
+
+    url = build_database(patients=10_000, appointments=args.appointments)
+    asyncio.run(run(url, args.appointments, args.batch_size))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+# benchmarks/bench_login_storm.py
+# Read latency while a burst of logins runs bcrypt. "inline" reproduces the old
+# behaviour (bcrypt on the event loop); "executor" uses the bounded hashing pool.
+#
+#   python -m benchmarks.bench_login_storm --logins 200 --readers 4
+import argparse
+import asyncio
+import statistics
+import time
+
+from benchmarks._data import build_database
+
+import httpx
+from sqlalchemy import create_engine, update
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+
+from app.main import app
+from app.core import security
+from app.core.security import create_access_token, hash_password, verify_password
+from app.db.models import User
+from app.db.session import get_database
+from app.services import auth_service
+
+PASSWORD = "patientpass"
+
+
+async def _inline_verify(plain, hashed):
+    return verify_password(plain, hashed)
+
+
+def percentile(samples, pct):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * pct / 100))]
+
+
+async def run(mode: str, logins: int, readers: int, url: str):
+    engine = create_async_engine(url)
+    session_factory = async_sessionmaker(bind=engine, expire_on_commit=False, class_=AsyncSession)
+
+    async def override_get_database():
+        async with session_factory() as session:
+            yield session
+
+    app.dependency_overrides[get_database] = override_get_database
+    auth_service.verify_password_async = _inline_verify if mode == "inline" else security.verify_password_async
+    admin = {"Authorization": f"Bearer {create_access_token({'sub': 'user1@ads.com', 'role': 'ADMIN'})}"}
+
+    latencies, rejected = [], 0
+    storm_done = asyncio.Event()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def reader():
+            while not storm_done.is_set():
+                started = time.perf_counter()
+                await client.get("/adsweb/api/v1/patient/1", headers=admin)
+                latencies.append((time.perf_counter() - started) * 1000)
+
+        async def login(i):
+            nonlocal rejected
+            response = await client.post("/api/v1/login", json={"email": f"user{i % 50 + 2}@ads.com", "password": PASSWORD})
+            rejected += response.status_code == 503
+
+        reader_tasks = [asyncio.create_task(reader()) for _ in range(readers)]
+        started = time.perf_counter()
+        await asyncio.gather(*(login(i) for i in range(logins)))
+        storm_seconds = time.perf_counter() - started
+        storm_done.set()
+        await asyncio.gather(*reader_tasks)
+
+    app.dependency_overrides.clear()
+    await engine.dispose()
+    print(f"{mode:<10}{storm_seconds:>10.2f}{len(latencies):>10}{statistics.median(latencies):>10.1f}"
+          f"{percentile(latencies, 99):>10.1f}{max(latencies):>10.1f}{rejected:>10}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Read latency during a concurrent login storm")
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--readers", type=int, default=4)
+    args = parser.parse_args()
+
+    url = build_database(patients=60, surgeries=1, dentists_per_surgery=1)
+    sync_engine = create_engine(url.replace("+aiosqlite", ""))
+    with sync_engine.begin() as conn:
+        conn.execute(update(User).values(password_hash=hash_password(PASSWORD)))
+    sync_engine.dispose()
+
+    print(f"{'mode':<10}{'storm s':>10}{'reads':>10}{'p50 ms':>10}{'p99 ms':>10}{'max ms':>10}{'503s':>10}")
+    for mode in ("inline", "executor"):
+        asyncio.run(run(mode, args.logins, args.readers, url))
+    security.password_hasher.shutdown()
+
+
+if __name__ == "__main__":
+    main()
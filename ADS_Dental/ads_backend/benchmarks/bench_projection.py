@@ -0,0 +1,94 @@
+# benchmarks/bench_projection.py
+# Rows/second for the ORM read path (load plan + model_validate) versus the
+# column projection path (Row tuples -> DTO) used by the list endpoints.
+#
+#   python -m benchmarks.bench_projection --sizes 10000 100000
+import argparse
+import asyncio
+import time
+
+from benchmarks._data import build_database
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+
+from app.db.load_plans import load_plan
+from app.db.models import Appointment, Patient, User
+from app.db.projections import (
+    appointment_projection, patient_projection, row_to_patient_dto, rows_to_appointment_dtos,
+    row_to_user_dto, user_projection,
+)
+from app.schemas.appointment_dto import AppointmentDTO
+from app.schemas.patient_dto import PatientDTO
+from app.services.user_service import user_to_dto
+
+
+async def orm_patients(db):
+    rows = (await db.execute(select(Patient).options(*load_plan("patient_summary")))).scalars().all()
+    return [PatientDTO.model_validate(p) for p in rows]
+
+
+async def projection_patients(db):
+    return [row_to_patient_dto(r) for r in (await db.execute(patient_projection())).all()]
+
+
+async def orm_users(db):
+    rows = (await db.execute(select(User).options(*load_plan("user_with_roles")))).scalars().all()
+    return [user_to_dto(u) for u in rows]
+
+
+async def projection_users(db):
+    return [row_to_user_dto(r) for r in (await db.execute(user_projection())).all()]
+
+
+async def orm_appointments(db):
+    rows = (await db.execute(select(Appointment).options(*load_plan("appointment_detail")))).scalars().unique().all()
+    return [AppointmentDTO.model_validate(a) for a in rows]
+
+
+async def projection_appointments(db):
+    return await rows_to_appointment_dtos(db, (await db.execute(appointment_projection())).all())
+
+
+CASES = [
+    ("patients", orm_patients, projection_patients),
+    ("users", orm_users, projection_users),
+    ("appointments", orm_appointments, projection_appointments),
+]
+
+
+async def measure(session_factory, fn, repeat):
+    best = float("inf")
+    count = 0
+    for _ in range(repeat):
+        async with session_factory() as db:
+            started = time.perf_counter()
+            count = len(await fn(db))
+            best = min(best, time.perf_counter() - started)
+    return count, best
+
+
+async def run(size: int, repeat: int):
+    url = build_database(patients=size, appointments=size)
+    engine = create_async_engine(url)
+    session_factory = async_sessionmaker(bind=engine, expire_on_commit=False, class_=AsyncSession)
+    print(f"\n== {size:,} rows ==")
+    print(f"{'entity':<14}{'orm rows/s':>14}{'projection rows/s':>20}{'speedup':>10}")
+    for name, orm_fn, projection_fn in CASES:
+        rows, orm_time = await measure(session_factory, orm_fn, repeat)
+        _, projection_time = await measure(session_factory, projection_fn, repeat)
+        print(f"{name:<14}{rows / orm_time:>14,.0f}{rows / projection_time:>20,.0f}{orm_time / projection_time:>9.1f}x")
+    await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ORM vs column projection read throughput")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    for size in args.sizes:
+        asyncio.run(run(size, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+# benchmarks/bench_registration.py
+# Patient registrations per second on one worker, and SQL statements per
+# registration: "legacy" is the previous ORM flow (role SELECT, a flush per
+# object, relationship assignment), "inserts" is the current service. bcrypt is
+# replaced by a constant hash so the numbers show the database path only.
+#
+#   python -m benchmarks.bench_registration --registrations 2000
+import argparse
+import asyncio
+import time
+
+from benchmarks._data import build_database
+
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+
+from app.db.models import Address, Patient, Role, User
+from app.db.role_ids import clear_role_ids, load_role_ids
+from app.schemas.address_dto import AddressCreateDTO
+from app.schemas.patient_dto import PatientCreateDTO
+from app.services import patient_service
+
+HASH = "$2b$12$" + "x" * 53
+
+
+async def _constant_hash(plain):
+    return HASH
+
+
+async def legacy_register(db: AsyncSession, payload: PatientCreateDTO, patient_no: str):
+    address = Address(**payload.address.model_dump())
+    db.add(address)
+    await db.flush()
+    patient = Patient(patient_no=patient_no, first_name=payload.first_name, last_name=payload.last_name,
+                      phone=payload.phone, email=payload.email, address=address)
+    db.add(patient)
+    await db.flush()
+    role = (await db.execute(select(Role).where(Role.name == "PATIENT"))).scalar_one_or_none()
+    user = User(email=payload.email, username=str(payload.email).split("@")[0], password_hash=HASH, roles=[role])
+    db.add(user)
+    await db.flush()
+    patient.user_id = user.id
+    await db.commit()
+    await db.refresh(patient)
+    await db.refresh(user)
+
+
+def payload(mode: str, i: int) -> PatientCreateDTO:
+    return PatientCreateDTO(
+        first_name="Ada", last_name=f"Lovelace{i}", phone="641-555-0199", email=f"{mode}{i}@mail.com",
+        password="pw", address=AddressCreateDTO(street=f"{i} Main Street", city="Fairfield", state="IA", zip_code="52556"),
+    )
+
+
+async def run(url: str, registrations: int):
+    engine = create_async_engine(url)
+    session_factory = async_sessionmaker(bind=engine, expire_on_commit=False, class_=AsyncSession)
+    statements = 0
+
+    def count(*args):
+        nonlocal statements
+        statements += 1
+
+    event.listen(engine.sync_engine, "before_cursor_execute", count)
+    patient_service.hash_password_async = _constant_hash
+    clear_role_ids()
+    async with session_factory() as db:
+        await load_role_ids(db)
+
+    print(f"{'mode':<10}{'reg/s':>10}{'stmts/reg':>12}")
+    for mode in ("legacy", "inserts"):
+        statements = 0
+        started = time.perf_counter()
+        for i in range(registrations):
+            async with session_factory() as db:
+                if mode == "legacy":
+                    await legacy_register(db, payload(mode, i), f"L{i:08d}")
+                else:
+                    await patient_service.register_patient_service(db, payload(mode, i))
+        elapsed = time.perf_counter() - started
+        print(f"{mode:<10}{registrations / elapsed:>10.0f}{statements / registrations:>12.1f}")
+    await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Patient registrations per second on one worker")
+    parser.add_argument("--registrations", type=int, default=2000)
+    args = parser.parse_args()
+
+    url = build_database(patients=100)
+    asyncio.run(run(url, args.registrations))
+
+
+if __name__ == "__main__":
+    main()
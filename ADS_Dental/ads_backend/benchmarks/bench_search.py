@@ -0,0 +1,81 @@
+# benchmarks/bench_search.py
+# Patient search latency: indexed search_patient_service versus the previous
+# five-column leading-wildcard ILIKE scan.
+#
+#   python -m benchmarks.bench_search --sizes 1000000
+import argparse
+import asyncio
+import statistics
+import time
+
+from benchmarks._data import build_database
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+
+from app.db.models import Patient
+from app.db.projections import patient_projection, row_to_patient_dto
+from app.db.search_index import rebuild_search_index
+from app.services.patient_service import search_patient_service
+
+QUERIES = {
+    "exact email": "user{n}@ads.com",
+    "exact patient_no": "P{n:08d}",
+    "name prefix": "lovel",
+    "name substring": "ppe",
+    "phone digits": "641-{n:07d}",
+}
+
+
+async def legacy_search(db, term: str, limit: int):
+    like = f"%{term.strip()}%"
+    stmt = patient_projection().where(
+        Patient.first_name.ilike(like) | Patient.last_name.ilike(like) | Patient.patient_no.ilike(like)
+        | Patient.email.ilike(like) | Patient.phone.ilike(like)
+    ).limit(limit)
+    return [row_to_patient_dto(r) for r in (await db.execute(stmt)).all()]
+
+
+async def timed(session_factory, fn, term, limit, repeat):
+    samples = []
+    for _ in range(repeat):
+        async with session_factory() as db:
+            started = time.perf_counter()
+            await fn(db, term, limit)
+            samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+async def run(size: int, repeat: int, limit: int, legacy: bool):
+    url = build_database(patients=size, surgeries=1, dentists_per_surgery=1)
+    sync_engine = create_engine(url.replace("+aiosqlite", ""))
+    started = time.perf_counter()
+    with sync_engine.begin() as conn:
+        rebuild_search_index(conn)
+    sync_engine.dispose()
+    print(f"\n== {size:,} patients (index built in {time.perf_counter() - started:.1f}s) ==")
+
+    engine = create_async_engine(url)
+    session_factory = async_sessionmaker(bind=engine, expire_on_commit=False, class_=AsyncSession)
+    print(f"{'query':<18}{'indexed ms':>12}{'legacy ms':>12}")
+    for label, template in QUERIES.items():
+        term = template.format(n=size // 2)
+        indexed_ms = await timed(session_factory, search_patient_service, term, limit, repeat)
+        legacy_ms = await timed(session_factory, legacy_search, term, limit, repeat) if legacy else float("nan")
+        print(f"{label:<18}{indexed_ms:>12.2f}{legacy_ms:>12.2f}")
+    await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Indexed vs ILIKE patient search latency")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--skip-legacy", action="store_true", help="don't time the full-scan ILIKE search")
+    args = parser.parse_args()
+    for size in args.sizes:
+        asyncio.run(run(size, args.repeat, args.limit, not args.skip_legacy))
+
+
+if __name__ == "__main__":
+    main()
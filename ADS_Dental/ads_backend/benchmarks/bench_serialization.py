@@ -0,0 +1,116 @@
+# benchmarks/bench_serialization.py
+# Cost of building and serializing each response DTO, per list size:
+#   build:     DTO(...) (validating), DTO.model_construct(...) and trusted(DTO, ...)
+#   serialize: FastAPI's response_model path (dump, validate, dump, JSONResponse)
+#              vs one precompiled TypeAdapter.dump_json (json_response)
+# No database: the DTOs are synthetic, shaped like the projection rows.
+#
+#   python -m benchmarks.bench_serialization --sizes 1000 10000
+import argparse
+import asyncio
+import time
+from datetime import datetime, time as time_of_day, timedelta
+from typing import List
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from app.api.serialization import FastJSONResponse, adapter, orjson
+from app.schemas.address_dto import AddressDTO
+from app.schemas.common import trusted
+from app.schemas.appointment_dto import AppointmentDTO, AppointmentStatus
+from app.schemas.dentist_dto import DentistResponseDTO
+from app.schemas.patient_dto import PatientDTO
+from app.schemas.surgery_dto import SurgeryDTO
+from app.schemas.user_dto import RoleEnum, UserDTO
+
+
+def address(i):
+    return {"id": i, "street": f"{i} Main Street", "city": "Fairfield", "state": "IA", "zip_code": "52556"}
+
+
+def dentist(i):
+    return {"id": i, "first_name": "Tony", "last_name": f"Smith{i}", "phone": "480-123-1111",
+            "email": f"d{i}@ads.com", "specialization": "General", "surgery_id": i % 10 + 1, "user_id": i}
+
+
+BUILDERS = {
+    "validate": lambda cls, kwargs: cls(**kwargs),
+    "construct": lambda cls, kwargs: cls.model_construct(**kwargs),
+    "trusted": lambda cls, kwargs: trusted(cls, **kwargs),
+}
+
+
+def build(cls, fields, nested, how: str):
+    kwargs = {**fields, **{k: build(*v, how) if isinstance(v, tuple) else v for k, v in nested.items()}}
+    return BUILDERS[how](cls, kwargs)
+
+
+def patient_spec(i):
+    return PatientDTO, {"id": i, "patient_no": f"P{i:010d}", "first_name": "Ada", "last_name": f"Lovelace{i}",
+                        "phone": "641-555-0199", "email": f"p{i}@mail.com"}, {"address": (AddressDTO, address(i), {})}
+
+
+def surgery_spec(i):
+    return SurgeryDTO, {"id": i, "surgery_no": f"S{i:03d}", "name": f"Surgery {i}", "phone": "602-555-1234"}, {
+        "address": (AddressDTO, address(i), {}),
+        "dentists": [],
+    }
+
+
+SPECS = {
+    "UserDTO": lambda i: (UserDTO, {"id": i, "email": f"u{i}@ads.com", "username": f"u{i}", "role": RoleEnum.PATIENT}, {}),
+    "DentistResponseDTO": lambda i: (DentistResponseDTO, dentist(i), {}),
+    "PatientDTO": patient_spec,
+    "SurgeryDTO": surgery_spec,
+    "AppointmentDTO": lambda i: (AppointmentDTO, {
+        "id": i, "appointment_date": datetime(2013, 1, 1) + timedelta(days=i % 365),
+        "appointment_time": time_of_day(9 + i % 8), "status": AppointmentStatus.BOOKED,
+    }, {"patient": patient_spec(i), "dentist": (DentistResponseDTO, dentist(i), {}), "surgery": surgery_spec(i % 10)}),
+}
+
+
+def timed(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def fastapi_path(field, items):
+    content = asyncio.run(serialize_response(field=field, response_content=items))
+    return JSONResponse(content).body
+
+
+def run(sizes: List[int], repeat: int):
+    print(f"JSON encoder for dict responses: {'orjson' if orjson is not None else 'json (orjson not installed)'}")
+    print(f"{'dto':<20}{'n':>7}{'validate ms':>13}{'construct ms':>14}{'trusted ms':>12}"
+          f"{'fastapi ms':>12}{'adapter ms':>12}{'speedup':>9}")
+    for name, spec in SPECS.items():
+        for n in sizes:
+            specs = [spec(i) for i in range(n)]
+            dto_type = specs[0][0]
+            built = {how: timed(lambda: [build(*s, how) for s in specs], repeat) for how in BUILDERS}
+            items = [build(*s, "trusted") for s in specs]
+            field = create_model_field(name="Response", type_=List[dto_type], mode="serialization")
+            slow = timed(lambda: fastapi_path(field, items), repeat)
+            fast = timed(lambda: adapter(List[dto_type]).dump_json(items), repeat)
+            assert FastJSONResponse(asyncio.run(serialize_response(field=field, response_content=items))).body \
+                == adapter(List[dto_type]).dump_json(items)
+            print(f"{name:<20}{n:>7}{built['validate']:>13.1f}{built['construct']:>14.1f}{built['trusted']:>12.1f}"
+                  f"{slow:>12.1f}{fast:>12.1f}{slow / fast:>8.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="DTO construction and serialization micro-benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    run(args.sizes, args.repeat)
+
+
+if __name__ == "__main__":
+    main()